@@ -0,0 +1,20 @@
+# Generated by Django 5.0.1 on 2026-10-19 10:36
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0002_initial'),
+        ('organizations', '0005_workspace_role_overrides'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+    
+    operations = [
+        migrations.AddIndex(
+            model_name='content',
+            index=models.Index(fields=['created_by', 'is_public', 'created_at'], name='contents_created_6fea4f_idx'),
+        ),
+    ]
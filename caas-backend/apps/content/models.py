@@ -77,6 +77,8 @@ class Content(models.Model):
         indexes = [
             models.Index(fields=['organization', 'status']),
             models.Index(fields=['created_by']),
+            # Public portfolio listing
+            models.Index(fields=['created_by', 'is_public', 'created_at']),
         ]
     
     def __str__(self):
@@ -13,20 +13,29 @@ from .serializers import (
     ContentRegenerateSerializer
 )
 from .ai_service import AIContentGenerator
-from apps.organizations.models import Organization, Workspace
-from apps.organizations.permissions import IsOrganizationMember
+from apps.organizations.access import get_access
+from apps.subscriptions.entitlements import get_entitlements
+from apps.organizations.permissions import HasOrganizationPermission
 
 
 class ContentViewSet(viewsets.ModelViewSet):
     """ViewSet for content CRUD operations and AI generation."""
     serializer_class = ContentSerializer
-    permission_classes = [IsAuthenticated, IsOrganizationMember]
+    permission_classes = [IsAuthenticated, HasOrganizationPermission]
+    permission_resource = 'content'
+    action_permissions = {'regenerate': 'content.edit'}
     
     def get_queryset(self):
         """Filter content by user's organizations."""
-        user = self.request.user
-        org_ids = user.organization_memberships.values_list('organization_id', flat=True)
-        return Content.objects.filter(organization_id__in=org_ids)
+        return Content.objects.filter(organization_id__in=get_access(self.request).org_ids())
+    
+    def perform_create(self, serializer):
+        workspace = serializer.validated_data.get('workspace')
+        get_access(self.request).require(
+            'content.create', serializer.validated_data['organization'].id,
+            workspace.id if workspace else None
+        )
+        serializer.save(created_by=self.request.user)
     
     @action(detail=False, methods=['post'])
     def generate(self, request):
@@ -40,21 +49,18 @@ class ContentViewSet(viewsets.ModelViewSet):
         data = serializer.validated_data
         
         # Verify organization access
-        try:
-            org = Organization.objects.get(id=data['organization_id'])
-            if not org.members.filter(user=request.user).exists():
-                return Response(
-                    {'error': 'Access denied to this organization'},
-                    status=status.HTTP_403_FORBIDDEN
-                )
-        except Organization.DoesNotExist:
+        if not get_access(request).has_perm('content.create', data['organization_id'], data.get('workspace_id')):
             return Response(
-                {'error': 'Organization not found'},
-                status=status.HTTP_404_NOT_FOUND
+                {'error': 'Access denied to this organization'},
+                status=status.HTTP_403_FORBIDDEN
             )
         
-        # Check token quota (simplified - should check subscription)
-        # TODO: Add subscription quota check
+        # Generation is paused while a subscription payment is overdue
+        if get_entitlements(data['organization_id'])['status'] == 'past_due':
+            return Response(
+                {'error': 'Subscription payment is past due'},
+                status=status.HTTP_402_PAYMENT_REQUIRED
+            )
         
         # Generate content with AI
         result = AIContentGenerator.generate(
@@ -74,7 +80,7 @@ class ContentViewSet(viewsets.ModelViewSet):
         # Create content record
         with transaction.atomic():
             content = Content.objects.create(
-                organization=org,
+                organization_id=data['organization_id'],
                 workspace_id=data.get('workspace_id'),
                 created_by=request.user,
                 platform=data['platform'],
@@ -0,0 +1,179 @@
+"""
+Role-based access control for organizations and workspaces.
+
+Roles map to permissions through a declarative matrix compiled to bitmasks
+at import. A user's roles are loaded once per request (organization
+memberships from the cache, or one query; one more query only if a workspace
+is checked) and every permission check after that is a dictionary lookup and
+a bit test.
+"""
+import uuid
+
+from rest_framework.exceptions import PermissionDenied
+
+from .cache import get_user_roles
+from .models import Organization, OrganizationMember, Workspace, WorkspaceRoleOverride
+
+RESOURCES = {
+    'organization': ['view', 'edit', 'delete'],
+    'members': ['view', 'invite', 'manage'],
+    'workspace': ['view', 'create', 'edit', 'delete'],
+    'content': ['view', 'create', 'edit', 'delete'],
+    'schedule': ['view', 'create', 'edit', 'delete'],
+    'subscription': ['view', 'manage'],
+}
+
+# `resource.*` grants every action on a resource
+ROLE_PERMISSIONS = {
+    'owner': ['organization.*', 'members.*', 'workspace.*', 'content.*', 'schedule.*', 'subscription.*'],
+    'admin': [
+        'organization.view', 'organization.edit', 'members.*', 'workspace.*',
+        'content.*', 'schedule.*', 'subscription.view',
+    ],
+    'member': [
+        'organization.view', 'members.view', 'workspace.view',
+        'content.*', 'schedule.*', 'subscription.view',
+    ],
+    'viewer': [
+        'organization.view', 'members.view', 'workspace.view',
+        'content.view', 'schedule.view', 'subscription.view',
+    ],
+}
+
+PERMISSION_BITS = {
+    f"{resource}.{verb}": 1 << index
+    for index, (resource, verb) in enumerate(
+        (resource, verb) for resource, verbs in RESOURCES.items() for verb in verbs
+    )
+}
+
+
+def _compile(grants):
+    mask = 0
+    for grant in grants:
+        resource, _, verb = grant.partition('.')
+        verbs = RESOURCES[resource] if verb == '*' else [verb]
+        for name in verbs:
+            mask |= PERMISSION_BITS[f"{resource}.{name}"]
+    return mask
+
+
+ROLE_MASKS = {role: _compile(ROLE_PERMISSIONS[role]) for role, _ in OrganizationMember.ROLE_CHOICES}
+
+# ModelViewSet actions to verbs; other actions are declared per view
+ACTION_VERBS = {
+    'list': 'view',
+    'retrieve': 'view',
+    'create': 'create',
+    'update': 'edit',
+    'partial_update': 'edit',
+    'destroy': 'delete',
+}
+
+
+def _as_uuid(value):
+    if value is None or isinstance(value, uuid.UUID):
+        return value
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+class OrganizationAccess:
+    """A user's roles, loaded lazily and evaluated against the role matrix."""
+    
+    def __init__(self, user):
+        self.user = user
+        self._roles = None
+        self._overrides = None
+    
+    @property
+    def roles(self):
+        """Organization id to role for every membership of the user."""
+        if self._roles is None:
+            self._roles = get_user_roles(self.user.pk, lambda: dict(
+                OrganizationMember.objects.filter(user=self.user).values_list('organization_id', 'role')
+            )) if self.user.is_authenticated else {}
+        return self._roles
+    
+    @property
+    def overrides(self):
+        """Workspace id to (organization id, role) for the user's workspace roles."""
+        if self._overrides is None:
+            self._overrides = {
+                workspace_id: (org_id, role)
+                for workspace_id, org_id, role in WorkspaceRoleOverride.objects.filter(
+                    user=self.user
+                ).values_list('workspace_id', 'workspace__organization_id', 'role')
+            } if self.user.is_authenticated and self.roles else {}
+        return self._overrides
+    
+    def role(self, org_id, workspace_id=None):
+        """
+        Effective role in an organization, or in one of its workspaces when
+        `workspace_id` is given. None if the user is not a member.
+        """
+        org_id = _as_uuid(org_id)
+        org_role = self.roles.get(org_id)
+        if org_role is None or workspace_id is None:
+            return org_role
+        
+        # Overrides only apply to members of the workspace's organization
+        override = self.overrides.get(_as_uuid(workspace_id))
+        if override is not None and override[0] == org_id:
+            return override[1]
+        return org_role
+    
+    def has_perm(self, permission, org_id, workspace_id=None):
+        role = self.role(org_id, workspace_id)
+        return role is not None and bool(ROLE_MASKS[role] & PERMISSION_BITS[permission])
+    
+    def require(self, permission, org_id, workspace_id=None):
+        """Raise PermissionDenied unless the user has `permission`."""
+        if not self.has_perm(permission, org_id, workspace_id):
+            raise PermissionDenied('Access denied to this organization')
+    
+    def org_ids(self, permission='organization.view'):
+        """Organizations where the user has `permission` at organization level."""
+        bit = PERMISSION_BITS[permission]
+        return [org_id for org_id, role in self.roles.items() if ROLE_MASKS[role] & bit]
+
+
+def get_access(request):
+    """The request's OrganizationAccess, created on first use."""
+    access = getattr(request, '_organization_access', None)
+    if access is None or access.user != request.user:
+        access = OrganizationAccess(request.user)
+        request._organization_access = access
+    return access
+
+
+def required_permission(view):
+    """
+    Permission needed for the view's current action: the view's
+    `action_permissions` entry, else the ModelViewSet verb on its
+    `permission_resource`. None means no organization permission applies.
+    """
+    action = getattr(view, 'action', None)
+    action_permissions = getattr(view, 'action_permissions', {})
+    if action in action_permissions:
+        return action_permissions[action]
+    verb = ACTION_VERBS.get(action)
+    resource = getattr(view, 'permission_resource', None)
+    if verb is None or resource is None:
+        return None
+    return f"{resource}.{verb}"
+
+
+def object_scope(obj):
+    """(organization id, workspace id) an object's permissions are checked in."""
+    if isinstance(obj, Organization):
+        return obj.id, None
+    if isinstance(obj, Workspace):
+        return obj.organization_id, obj.id
+    if hasattr(obj, 'workspace_id'):
+        return obj.organization_id, obj.workspace_id
+    # Scheduled posts and recurring schedules live in their content's workspace
+    content = getattr(obj, 'content', None)
+    return obj.organization_id, getattr(content, 'workspace_id', None)
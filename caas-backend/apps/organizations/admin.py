@@ -1,6 +1,6 @@
 """Admin for organizations."""
 from django.contrib import admin
-from .models import Organization, OrganizationMember, Workspace
+from .models import Organization, OrganizationMember, OrganizationInvitation, Workspace, WorkspaceRoleOverride
 
 
 @admin.register(Organization)
@@ -16,7 +16,22 @@ class OrganizationMemberAdmin(admin.ModelAdmin):
     list_filter = ['role']
 
 
+@admin.register(OrganizationInvitation)
+class OrganizationInvitationAdmin(admin.ModelAdmin):
+    list_display = ['email', 'organization', 'role', 'status', 'email_status', 'created_at']
+    list_filter = ['status', 'email_status']
+    search_fields = ['email', 'organization__name']
+    readonly_fields = ['token', 'created_at']
+
+
 @admin.register(Workspace)
 class WorkspaceAdmin(admin.ModelAdmin):
     list_display = ['name', 'organization', 'is_active', 'created_at']
     list_filter = ['is_active']
+
+
+@admin.register(WorkspaceRoleOverride)
+class WorkspaceRoleOverrideAdmin(admin.ModelAdmin):
+    list_display = ['workspace', 'user', 'role', 'created_at']
+    list_filter = ['role']
+    search_fields = ['user__email', 'workspace__name']
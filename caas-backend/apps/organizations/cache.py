@@ -0,0 +1,92 @@
+"""
+Versioned cache of serialized organization summaries, and of each user's
+organization roles.
+
+Any change to an organization, its workspaces or its members bumps the
+organization's version; summaries are cached under the version, so stale
+entries are never read again and simply expire. A user's roles are deleted
+whenever one of their memberships changes.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+VERSION_KEY = 'organizations:version:{org_id}'
+SUMMARY_KEY = 'organizations:summary:{org_id}:{version}'
+ROLES_KEY = 'organizations:roles:{user_id}'
+
+
+def get_org_versions(org_ids):
+    """Current versions for several organizations, seeding any that are missing."""
+    keys = {org_id: VERSION_KEY.format(org_id=org_id) for org_id in org_ids}
+    versions = cache.get_many(keys.values())
+    missing = {key: time.time_ns() for key in keys.values() if key not in versions}
+    if missing:
+        # Seed with a timestamp so an evicted counter never reuses an old version
+        for key, version in missing.items():
+            cache.add(key, version, timeout=None)
+        versions.update(cache.get_many(missing.keys()))
+    return {org_id: versions[key] for org_id, key in keys.items()}
+
+
+def _bump(org_ids):
+    for org_id in org_ids:
+        key = VERSION_KEY.format(org_id=org_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), timeout=None)
+
+
+def bump_org_versions(org_ids):
+    """
+    Invalidate cached summaries for the given organizations once the current
+    transaction commits.
+    """
+    org_ids = set(org_ids)
+    if org_ids:
+        transaction.on_commit(lambda: _bump(org_ids))
+
+
+def get_cached_summaries(org_ids):
+    """
+    Cached summaries keyed by organization id, plus the versions used.
+    Missing organizations are simply absent from the result.
+    """
+    versions = get_org_versions(org_ids)
+    keys = {
+        org_id: SUMMARY_KEY.format(org_id=org_id, version=version)
+        for org_id, version in versions.items()
+    }
+    cached = cache.get_many(keys.values())
+    summaries = {org_id: cached[key] for org_id, key in keys.items() if key in cached}
+    return summaries, versions
+
+
+def set_cached_summaries(summaries, versions, timeout):
+    cache.set_many(
+        {
+            SUMMARY_KEY.format(org_id=org_id, version=versions[org_id]): summary
+            for org_id, summary in summaries.items()
+        },
+        timeout=timeout
+    )
+
+
+def get_user_roles(user_id, load):
+    """A user's organization id to role mapping, from `load()` on a cache miss."""
+    key = ROLES_KEY.format(user_id=user_id)
+    roles = cache.get(key)
+    if roles is None:
+        roles = load()
+        cache.set(key, roles, timeout=settings.ORGANIZATION_ROLES_CACHE_SECONDS)
+    return roles
+
+
+def invalidate_user_roles(user_ids):
+    """Forget cached roles for the given users once the current transaction commits."""
+    keys = [ROLES_KEY.format(user_id=user_id) for user_id in set(user_ids)]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,357 @@
+"""
+Bulk member provisioning and invitation emails.
+
+A bulk invite costs a fixed number of queries however many rows it has:
+existing users are resolved in one lookup, memberships and invitations are
+written with `bulk_create`, and emails are left to `manage.py send_invitations`,
+which sends them in batches over a single mail connection.
+"""
+import csv
+import io
+import logging
+import secrets
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.mail import EmailMessage, get_connection
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models.functions import Upper
+from django.utils import timezone
+
+from .models import Organization, OrganizationInvitation, OrganizationMember
+from .cache import bump_org_versions, invalidate_user_roles
+from apps.subscriptions.entitlements import within_limit
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+# Ownership is transferred, never granted by invite
+INVITABLE_ROLES = ['admin', 'member', 'viewer']
+
+
+def parse_csv(text):
+    """
+    Rows of (email, role) from CSV text. A header row with an `email` column
+    is honoured; otherwise the first column is the email and the second, if
+    present, the role.
+    """
+    rows = [row for row in csv.reader(io.StringIO(text)) if any(cell.strip() for cell in row)]
+    if not rows:
+        return []
+    
+    header = [cell.strip().lower() for cell in rows[0]]
+    if 'email' in header:
+        email_col = header.index('email')
+        role_col = header.index('role') if 'role' in header else None
+        rows = rows[1:]
+    else:
+        email_col, role_col = 0, 1
+    
+    parsed = []
+    for row in rows:
+        email = row[email_col] if email_col < len(row) else ''
+        role = row[role_col] if role_col is not None and role_col < len(row) else ''
+        parsed.append((email, role))
+    return parsed
+
+
+def normalize_invites(rows, default_role='member'):
+    """
+    Validate and de-duplicate (email, role) rows; the last row for an email wins.
+    
+    Returns:
+        (dict of lowercased email to role, list of invalid row dicts)
+    """
+    invites = {}
+    invalid = []
+    for index, (email, role) in enumerate(rows):
+        email = (email or '').strip().lower()
+        role = (role or '').strip().lower() or default_role
+        try:
+            validate_email(email)
+        except ValidationError:
+            invalid.append({'row': index, 'email': email, 'error': 'Invalid email'})
+            continue
+        if role not in INVITABLE_ROLES:
+            invalid.append({'row': index, 'email': email, 'error': f"Invalid role: {role}"})
+            continue
+        invites[email] = role
+    return invites, invalid
+
+
+def _new_token():
+    return secrets.token_urlsafe(32)
+
+
+def bulk_invite(org_id, invites, invited_by, seat_limit=-1):
+    """
+    Add existing users as members and invite everyone else.
+    
+    Args:
+        org_id: organization id
+        invites: dict of lowercased email to role
+        invited_by: User sending the invites
+        seat_limit: plan's team member limit, -1 for unlimited
+    
+    Returns:
+        dict with success and either added, invited, already_members and
+        already_invited email lists, or error, limit and used
+    """
+    now = timezone.now()
+    expires_at = now + timedelta(days=settings.ORGANIZATION_INVITATION_EXPIRY_DAYS)
+    
+    # One lookup for every address; Upper() matches the users expression index
+    users = {
+        user.email.lower(): user
+        for user in User.objects.annotate(email_upper=Upper('email')).filter(
+            email_upper__in=[email.upper() for email in invites]
+        ).only('id', 'email')
+    }
+    
+    with transaction.atomic():
+        # Serializes invites to one organization, so concurrent requests
+        # cannot both pass the seat check below
+        Organization.objects.select_for_update().filter(id=org_id).values_list('id').first()
+        
+        member_user_ids = set(
+            OrganizationMember.objects.filter(
+                organization_id=org_id, user_id__in=[user.id for user in users.values()]
+            ).values_list('user_id', flat=True)
+        )
+        to_add = [
+            email for email, user in users.items() if user.id not in member_user_ids
+        ]
+        
+        to_invite = [email for email in invites if email not in users]
+        # Lapsed invitations no longer block the unique pending slot
+        OrganizationInvitation.objects.filter(
+            organization_id=org_id, email__in=to_invite, status='pending', expires_at__lte=now
+        ).update(status='expired')
+        already_invited = set(
+            OrganizationInvitation.objects.filter(
+                organization_id=org_id, email__in=to_invite, status='pending'
+            ).values_list('email', flat=True)
+        )
+        to_invite = [email for email in to_invite if email not in already_invited]
+        
+        # Pending invitations hold a seat until they are accepted or expire
+        seats_used = (
+            OrganizationMember.objects.filter(organization_id=org_id).count()
+            + OrganizationInvitation.objects.filter(organization_id=org_id, status='pending').count()
+        )
+        if not within_limit(seat_limit, seats_used, len(to_add) + len(to_invite)):
+            return {
+                'success': False,
+                'error': 'Team member limit reached for this plan',
+                'limit': seat_limit,
+                'used': seats_used,
+            }
+        
+        # ignore_conflicts covers members joining concurrently by accepting an invitation
+        OrganizationMember.objects.bulk_create(
+            [
+                OrganizationMember(organization_id=org_id, user=users[email], role=invites[email])
+                for email in to_add
+            ],
+            ignore_conflicts=True
+        )
+        
+        OrganizationInvitation.objects.bulk_create(
+            [
+                OrganizationInvitation(
+                    organization_id=org_id,
+                    email=email,
+                    role=invites[email],
+                    token=_new_token(),
+                    invited_by=invited_by,
+                    expires_at=expires_at
+                )
+                for email in to_invite
+            ] + [
+                # Notification only; the membership already exists
+                OrganizationInvitation(
+                    organization_id=org_id,
+                    email=users[email].email,
+                    role=invites[email],
+                    token=_new_token(),
+                    status='accepted',
+                    invited_by=invited_by,
+                    expires_at=expires_at,
+                    accepted_at=now
+                )
+                for email in to_add
+            ],
+            ignore_conflicts=True
+        )
+        # bulk_create skips the member signals
+        if to_add:
+            bump_org_versions([org_id])
+            invalidate_user_roles(users[email].pk for email in to_add)
+    
+    logger.info(
+        f"Bulk invite to {org_id}: {len(to_add)} added, {len(to_invite)} invited"
+    )
+    return {
+        'success': True,
+        'added': to_add,
+        'invited': to_invite,
+        'already_members': sorted(
+            email for email, user in users.items() if user.id in member_user_ids
+        ),
+        'already_invited': sorted(already_invited),
+    }
+
+
+def accept_invitation(token, user):
+    """
+    Accept a pending invitation for `user`.
+    
+    Returns:
+        dict with success and either membership or error
+    """
+    with transaction.atomic():
+        invitation = (
+            OrganizationInvitation.objects.select_for_update()
+            .filter(token=token, status='pending')
+            .first()
+        )
+        if invitation is None:
+            return {'success': False, 'error': 'Invitation not found'}
+        if invitation.expires_at <= timezone.now():
+            invitation.status = 'expired'
+            invitation.save(update_fields=['status'])
+            return {'success': False, 'error': 'Invitation has expired'}
+        if invitation.email.lower() != user.email.lower():
+            return {'success': False, 'error': 'Invitation was sent to a different email'}
+        
+        membership, _ = OrganizationMember.objects.get_or_create(
+            organization_id=invitation.organization_id,
+            user=user,
+            defaults={'role': invitation.role}
+        )
+        invitation.status = 'accepted'
+        invitation.accepted_at = timezone.now()
+        invitation.save(update_fields=['status', 'accepted_at'])
+    return {'success': True, 'membership': membership}
+
+
+class InvitationMailer:
+    """
+    Sends queued invitation emails in batches.
+    
+    Like the scheduling outbox dispatcher, a batch is leased in one short
+    transaction, sent with no rows locked, and the outcomes are written in a
+    second one. A sender that dies mid-batch leaves its rows to be retried
+    once the lease runs out.
+    """
+    
+    def __init__(self, batch_size=None, lease_seconds=None, max_attempts=None):
+        self.batch_size = batch_size or settings.ORGANIZATION_INVITATION_EMAIL_BATCH_SIZE
+        self.lease = timedelta(seconds=lease_seconds or settings.ORGANIZATION_INVITATION_EMAIL_LEASE_SECONDS)
+        self.max_attempts = max_attempts or settings.ORGANIZATION_INVITATION_EMAIL_MAX_ATTEMPTS
+    
+    def claim_batch(self):
+        """Lock and lease the next batch of due invitations."""
+        now = timezone.now()
+        with transaction.atomic():
+            invitations = list(
+                OrganizationInvitation.objects
+                .select_for_update(skip_locked=True, of=('self',))
+                .select_related('organization', 'invited_by')
+                .filter(email_status='pending', email_next_attempt_at__lte=now)
+                .order_by('email_next_attempt_at')[:self.batch_size]
+            )
+            for invitation in invitations:
+                invitation.email_attempts += 1
+                invitation.email_next_attempt_at = now + self.lease
+            OrganizationInvitation.objects.bulk_update(
+                invitations, ['email_attempts', 'email_next_attempt_at']
+            )
+        return invitations
+    
+    def send_batch(self):
+        """
+        Send one batch over a single mail connection.
+        
+        Returns:
+            dict with claimed, sent and failed counts
+        """
+        invitations = self.claim_batch()
+        if not invitations:
+            return {'claimed': 0, 'sent': 0, 'failed': 0}
+        
+        errors = {}
+        connection = get_connection()
+        try:
+            connection.open()
+            for invitation in invitations:
+                try:
+                    connection.send_messages([self._message(invitation, connection)])
+                except Exception as e:
+                    errors[invitation.id] = str(e)
+        except Exception as e:
+            # Could not connect; nothing left in the batch was sent
+            for invitation in invitations:
+                errors.setdefault(invitation.id, str(e))
+        finally:
+            connection.close()
+        
+        return self._record_outcomes(invitations, errors)
+    
+    def _record_outcomes(self, invitations, errors):
+        """Persist delivery results; failed sends are retried with backoff."""
+        now = timezone.now()
+        counts = {'claimed': len(invitations), 'sent': 0, 'failed': 0}
+        for invitation in invitations:
+            error = errors.get(invitation.id)
+            if error is None:
+                invitation.email_status = 'sent'
+                invitation.email_error = ''
+                invitation.sent_at = now
+                counts['sent'] += 1
+                continue
+            
+            invitation.email_error = error
+            if invitation.email_attempts >= self.max_attempts:
+                invitation.email_status = 'failed'
+                counts['failed'] += 1
+            else:
+                invitation.email_next_attempt_at = now + self._backoff(invitation.email_attempts)
+            logger.warning(
+                f"Invitation email to {invitation.email} failed "
+                f"(attempt {invitation.email_attempts}): {error}"
+            )
+        
+        with transaction.atomic():
+            OrganizationInvitation.objects.bulk_update(
+                invitations, ['email_status', 'email_error', 'email_next_attempt_at', 'sent_at']
+            )
+        return counts
+    
+    @staticmethod
+    def _backoff(attempts):
+        """Exponential retry delay, capped at one hour."""
+        return timedelta(seconds=min(3600, 5 * (2 ** attempts)))
+    
+    @staticmethod
+    def _message(invitation, connection):
+        organization = invitation.organization
+        inviter = invitation.invited_by.full_name if invitation.invited_by else 'A teammate'
+        if invitation.status == 'accepted':
+            subject = f"You've been added to {organization.name}"
+            body = (
+                f"{inviter} added you to {organization.name} as {invitation.role}.\n\n"
+                f"{settings.FRONTEND_EDITOR_URL}/"
+            )
+        else:
+            subject = f"You're invited to join {organization.name}"
+            body = (
+                f"{inviter} invited you to join {organization.name} as {invitation.role}.\n\n"
+                f"Accept the invitation: {settings.FRONTEND_EDITOR_URL}/invitations/{invitation.token}\n\n"
+                f"This invitation expires on {invitation.expires_at:%Y-%m-%d}."
+            )
+        return EmailMessage(subject, body, to=[invitation.email], connection=connection)
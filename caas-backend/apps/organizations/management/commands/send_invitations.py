@@ -0,0 +1,39 @@
+"""
+Send queued organization invitation emails.
+
+Usage:
+    python manage.py send_invitations            # send everything queued and exit
+    python manage.py send_invitations --loop     # run as a worker
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.organizations.invitations import InvitationMailer
+
+
+class Command(BaseCommand):
+    help = 'Send pending organization invitation emails in batches.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None, help='Emails per mail connection')
+        parser.add_argument('--loop', action='store_true', help='Keep polling instead of exiting when drained')
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds to sleep when idle (with --loop)')
+    
+    def handle(self, *args, **options):
+        mailer = InvitationMailer(batch_size=options['batch_size'])
+        
+        while True:
+            counts = mailer.send_batch()
+            if counts['claimed']:
+                self.stdout.write(
+                    f"Sent batch: {counts['sent']} sent, {counts['failed']} failed, "
+                    f"{counts['claimed'] - counts['sent'] - counts['failed']} retrying"
+                )
+                # Keep going while progressing; a failing batch waits for the interval
+                if counts['sent']:
+                    continue
+            
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.1 on 2026-10-19 10:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='organizationmember',
+            index=models.Index(fields=['organization', '-joined_at'], name='organizatio_organiz_6cba7e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='organizationmember',
+            index=models.Index(fields=['organization', 'role', '-joined_at'], name='organizatio_organiz_b27e06_idx'),
+        ),
+    ]
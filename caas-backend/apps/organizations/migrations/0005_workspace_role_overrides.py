@@ -0,0 +1,32 @@
+# Generated by Django 5.0.1 on 2026-10-19 10:21
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0004_organization_invitations'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+    
+    operations = [
+        migrations.CreateModel(
+            name='WorkspaceRoleOverride',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('role', models.CharField(choices=[('owner', 'Owner'), ('admin', 'Admin'), ('member', 'Member'), ('viewer', 'Viewer')], max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='workspace_role_overrides', to=settings.AUTH_USER_MODEL)),
+                ('workspace', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='role_overrides', to='organizations.workspace')),
+            ],
+            options={
+                'db_table': 'workspace_role_overrides',
+                'indexes': [models.Index(fields=['user'], name='workspace_r_user_id_845093_idx')],
+                'unique_together': {('workspace', 'user')},
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.1 on 2026-10-19 11:07
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0005_workspace_role_overrides'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+    
+    operations = [
+        migrations.RemoveIndex(
+            model_name='organizationinvitation',
+            name='organizatio_email_s_457c77_idx',
+        ),
+        migrations.AddField(
+            model_name='organizationinvitation',
+            name='email_next_attempt_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name='organizationinvitation',
+            index=models.Index(fields=['email_status', 'email_next_attempt_at'], name='organizatio_email_s_dc818a_idx'),
+        ),
+    ]
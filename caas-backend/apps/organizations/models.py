@@ -4,6 +4,7 @@ Organization and workspace models for multi-tenancy.
 import uuid
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from django.utils.text import slugify
 
 
@@ -80,6 +81,8 @@ class OrganizationMember(models.Model):
         ordering = ['-joined_at']
         indexes = [
             models.Index(fields=['organization', 'user']),
+            models.Index(fields=['organization', '-joined_at']),
+            models.Index(fields=['organization', 'role', '-joined_at']),
         ]
     
     def __str__(self):
@@ -128,3 +131,105 @@ class Workspace(models.Model):
         if not self.slug:
             self.slug = slugify(self.name)
         super().save(*args, **kwargs)
+
+
+class WorkspaceRoleOverride(models.Model):
+    """
+    A member's role within one workspace, replacing their organization role
+    there (e.g. a viewer who edits a single workspace).
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    workspace = models.ForeignKey(
+        Workspace,
+        on_delete=models.CASCADE,
+        related_name='role_overrides'
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='workspace_role_overrides'
+    )
+    role = models.CharField(max_length=20, choices=OrganizationMember.ROLE_CHOICES)
+    
+    # Tracking
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'workspace_role_overrides'
+        unique_together = ['workspace', 'user']
+        indexes = [
+            models.Index(fields=['user']),
+        ]
+    
+    def __str__(self):
+        return f"{self.user.email} - {self.workspace} ({self.role})"
+
+
+class OrganizationInvitation(models.Model):
+    """
+    Invitation to join an organization, and the queue of invite emails.
+    
+    Unknown emails get a pending invitation that is accepted with its token.
+    Existing users are added right away; their row is created accepted and
+    only carries the notification email.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('accepted', 'Accepted'),
+        ('expired', 'Expired'),
+        ('revoked', 'Revoked'),
+    ]
+    EMAIL_STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    organization = models.ForeignKey(
+        Organization,
+        on_delete=models.CASCADE,
+        related_name='invitations'
+    )
+    email = models.EmailField()
+    role = models.CharField(max_length=20, choices=OrganizationMember.ROLE_CHOICES, default='member')
+    token = models.CharField(max_length=64, unique=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    invited_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='sent_invitations'
+    )
+    
+    # Email delivery (drained by `manage.py send_invitations`)
+    email_status = models.CharField(max_length=20, choices=EMAIL_STATUS_CHOICES, default='pending')
+    email_attempts = models.PositiveIntegerField(default=0)
+    email_error = models.TextField(blank=True)
+    # Leased by a sender until then; failed sends are retried from then on
+    email_next_attempt_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    
+    # Tracking
+    expires_at = models.DateTimeField()
+    accepted_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'organization_invitations'
+        ordering = ['-created_at']
+        constraints = [
+            # One open invitation per address; bulk invites skip the rest
+            models.UniqueConstraint(
+                fields=['organization', 'email'],
+                condition=models.Q(status='pending'),
+                name='unique_pending_invitation'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['email_status', 'email_next_attempt_at']),
+            models.Index(fields=['organization', 'status']),
+        ]
+    
+    def __str__(self):
+        return f"{self.email} - {self.organization.name} ({self.status})"
@@ -1,8 +1,28 @@
 """
 Custom permissions for organization access control.
+
+All checks go through the request's OrganizationAccess (see access.py), so
+a user's roles are read once per request however many checks run.
 """
 from rest_framework import permissions
 
+from .access import get_access, required_permission, object_scope
+
+
+class HasOrganizationPermission(permissions.BasePermission):
+    """
+    Object-level check of the permission the view's action requires, in the
+    object's organization and workspace. Views declare `permission_resource`
+    and, for custom actions, `action_permissions`.
+    """
+    
+    def has_object_permission(self, request, view, obj):
+        permission = required_permission(view)
+        if permission is None:
+            return True
+        org_id, workspace_id = object_scope(obj)
+        return get_access(request).has_perm(permission, org_id, workspace_id)
+
 
 class IsOrganizationOwnerOrAdmin(permissions.BasePermission):
     """
@@ -10,13 +30,13 @@ class IsOrganizationOwnerOrAdmin(permissions.BasePermission):
     """
     
     def has_object_permission(self, request, view, obj):
+        org_id, _ = object_scope(obj)
         # Read permissions are allowed to any authenticated user in the organization
         if request.method in permissions.SAFE_METHODS:
-            return obj.members.filter(user=request.user).exists()
+            return get_access(request).has_perm('organization.view', org_id)
         
         # Write permissions are only allowed to owners and admins
-        membership = obj.members.filter(user=request.user).first()
-        return membership and membership.role in ['owner', 'admin']
+        return get_access(request).has_perm('organization.edit', org_id)
 
 
 class IsOrganizationMember(permissions.BasePermission):
@@ -25,8 +45,5 @@ class IsOrganizationMember(permissions.BasePermission):
     """
     
     def has_object_permission(self, request, view, obj):
-        # Check if obj is an Organization or has organization attribute
-        organization = obj if hasattr(obj, 'members') else getattr(obj, 'organization', None)
-        if organization:
-            return organization.members.filter(user=request.user).exists()
-        return False
+        org_id, _ = object_scope(obj)
+        return get_access(request).role(org_id) is not None
@@ -3,6 +3,7 @@ Serializers for organizations and workspaces.
 """
 from rest_framework import serializers
 from .models import Organization, OrganizationMember, Workspace
+from .invitations import INVITABLE_ROLES, parse_csv
 
 
 class OrganizationMemberSerializer(serializers.ModelSerializer):
@@ -23,6 +24,13 @@ class WorkspaceSerializer(serializers.ModelSerializer):
         model = Workspace
         fields = ['id', 'organization', 'name', 'slug', 'description', 'is_active', 'created_at']
         read_only_fields = ['id', 'slug', 'created_at']
+    
+    def get_fields(self):
+        # A workspace stays in the organization it was created in
+        fields = super().get_fields()
+        if self.instance is not None:
+            fields['organization'].read_only = True
+        return fields
 
 
 class OrganizationSerializer(serializers.ModelSerializer):
@@ -39,4 +47,44 @@ class OrganizationSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'slug', 'owner', 'created_at']
     
     def get_members_count(self, obj):
+        # Annotated by OrganizationViewSet; fall back to a query elsewhere
+        if hasattr(obj, 'members_count'):
+            return obj.members_count
         return obj.members.count()
+
+
+class InviteSerializer(serializers.Serializer):
+    """One row of a bulk invite."""
+    email = serializers.CharField()
+    role = serializers.CharField(required=False, allow_blank=True, default='')
+
+
+class BulkInviteSerializer(serializers.Serializer):
+    """
+    Bulk invite request: a list of {email, role}, CSV text, or an uploaded
+    CSV file. Rows are validated individually by the view so one bad row
+    does not reject the whole batch.
+    """
+    invites = InviteSerializer(many=True, required=False)
+    csv = serializers.CharField(required=False, allow_blank=True)
+    file = serializers.FileField(required=False)
+    default_role = serializers.ChoiceField(choices=INVITABLE_ROLES, default='member')
+    
+    def validate(self, attrs):
+        rows = [(item['email'], item['role']) for item in attrs.get('invites', [])]
+        if attrs.get('csv'):
+            rows.extend(parse_csv(attrs['csv']))
+        if attrs.get('file'):
+            try:
+                rows.extend(parse_csv(attrs['file'].read().decode('utf-8-sig')))
+            except UnicodeDecodeError:
+                raise serializers.ValidationError({'file': 'CSV must be UTF-8 encoded'})
+        
+        if not rows:
+            raise serializers.ValidationError('Provide invites, csv or file')
+        limit = self.context['max_rows']
+        if len(rows) > limit:
+            raise serializers.ValidationError(f"At most {limit} invites per request")
+        attrs['rows'] = rows
+        return attrs
+
@@ -0,0 +1,29 @@
+"""
+Signal handlers for organizations app.
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Organization, OrganizationMember, Workspace
+from .cache import bump_org_versions, invalidate_user_roles
+
+
+@receiver(post_save, sender=Organization)
+@receiver(post_delete, sender=Organization)
+def invalidate_organization_summary(sender, instance, **kwargs):
+    bump_org_versions([instance.id])
+
+
+@receiver(post_save, sender=OrganizationMember)
+@receiver(post_delete, sender=OrganizationMember)
+@receiver(post_save, sender=Workspace)
+@receiver(post_delete, sender=Workspace)
+def invalidate_parent_organization_summary(sender, instance, **kwargs):
+    """Member counts and workspaces are part of the summary."""
+    bump_org_versions([instance.organization_id])
+
+
+@receiver(post_save, sender=OrganizationMember)
+@receiver(post_delete, sender=OrganizationMember)
+def invalidate_member_roles(sender, instance, **kwargs):
+    invalidate_user_roles([instance.user_id])
@@ -0,0 +1,104 @@
+"""
+Query counts for the organization list and detail endpoints.
+"""
+import uuid
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+from apps.organizations.models import Organization, OrganizationMember, Workspace
+
+User = get_user_model()
+
+# Memberships, organizations with member counts, workspaces
+COLD_QUERIES = 3
+
+
+def make_user():
+    suffix = uuid.uuid4().hex[:12]
+    return User.objects.create_user(
+        email=f"{suffix}@example.com", username=suffix, password='x',
+        first_name='Test', last_name='User'
+    )
+
+
+def make_organizations(user, count):
+    """`count` organizations owned by `user`, each with `count` members and workspaces."""
+    organizations = []
+    for i in range(count):
+        organization = Organization.objects.create(name=f"Org {uuid.uuid4().hex[:8]}", owner=user)
+        OrganizationMember.objects.create(organization=organization, user=user, role='owner')
+        for j in range(count - 1):
+            OrganizationMember.objects.create(organization=organization, user=make_user(), role='member')
+        for j in range(count):
+            Workspace.objects.create(organization=organization, name=f"Workspace {j}", slug=f"workspace-{j}")
+        organizations.append(organization)
+    return organizations
+
+
+@pytest.fixture
+def member_client(api_client, django_capture_on_commit_callbacks):
+    """A client for a new user belonging to `count` organizations, with a cold cache."""
+    def make(count):
+        user = make_user()
+        with django_capture_on_commit_callbacks(execute=True):
+            organizations = make_organizations(user, count)
+        cache.clear()
+        api_client.force_authenticate(user)
+        return api_client, user, organizations
+    return make
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('count', [1, 5])
+def test_list_queries_do_not_grow_with_organizations(member_client, django_assert_num_queries, count):
+    client, user, organizations = member_client(count)
+    
+    with django_assert_num_queries(COLD_QUERIES):
+        response = client.get('/api/v1/organizations/')
+    
+    assert response.status_code == 200
+    assert response.data['count'] == count
+    assert all(len(summary['workspaces']) == count for summary in response.data['results'])
+    assert all(summary['members_count'] == count for summary in response.data['results'])
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('count', [1, 5])
+def test_retrieve_queries_do_not_grow_with_members(member_client, django_assert_num_queries, count):
+    client, user, organizations = member_client(count)
+    
+    with django_assert_num_queries(COLD_QUERIES):
+        response = client.get(f"/api/v1/organizations/{organizations[0].id}/")
+    
+    assert response.status_code == 200
+    assert response.data['members_count'] == count
+    assert len(response.data['workspaces']) == count
+
+
+@pytest.mark.django_db
+def test_warm_cache_needs_no_queries(member_client, django_assert_num_queries):
+    client, user, organizations = member_client(3)
+    client.get('/api/v1/organizations/')
+    
+    with django_assert_num_queries(0):
+        list_response = client.get('/api/v1/organizations/')
+        detail_response = client.get(f"/api/v1/organizations/{organizations[0].id}/")
+    
+    assert list_response.status_code == 200
+    assert detail_response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_membership_change_is_visible(member_client, django_capture_on_commit_callbacks):
+    client, user, organizations = member_client(1)
+    client.get('/api/v1/organizations/')
+    
+    other = make_user()
+    organization = Organization.objects.create(name='Other', owner=other)
+    with django_capture_on_commit_callbacks(execute=True):
+        OrganizationMember.objects.create(organization=organization, user=user, role='viewer')
+    
+    response = client.get('/api/v1/organizations/')
+    assert response.data['count'] == 2
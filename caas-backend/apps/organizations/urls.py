@@ -4,8 +4,9 @@ from rest_framework.routers import DefaultRouter
 from . import views
 
 router = DefaultRouter()
-router.register(r'', views.OrganizationViewSet, basename='organization')
+# Before the '' prefix, whose detail route would otherwise match 'workspaces/'
 router.register(r'workspaces', views.WorkspaceViewSet, basename='workspace')
+router.register(r'', views.OrganizationViewSet, basename='organization')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -1,25 +1,103 @@
 """
 Views for organization and workspace management.
 """
+import uuid
+
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from django.conf import settings
 from django.db import transaction
+from django.db.models import Count, Prefetch, Q
+from django.http import Http404
 
 from .models import Organization, OrganizationMember, Workspace
-from .serializers import OrganizationSerializer, WorkspaceSerializer, OrganizationMemberSerializer
-from .permissions import IsOrganizationOwnerOrAdmin
+from .serializers import (
+    OrganizationSerializer, WorkspaceSerializer, OrganizationMemberSerializer, BulkInviteSerializer
+)
+from .cache import get_cached_summaries, set_cached_summaries
+from .permissions import HasOrganizationPermission
+from .access import get_access
+from .invitations import normalize_invites, bulk_invite, accept_invitation
+from apps.subscriptions.entitlements import get_entitlements, within_limit
+
+WORKSPACE_SUMMARY_FIELDS = ['id', 'organization_id', 'name', 'slug', 'description', 'is_active', 'created_at']
+MEMBER_DIRECTORY_FIELDS = [
+    'id', 'user_id', 'role', 'joined_at',
+    'user__email', 'user__first_name', 'user__last_name',
+]
 
 
 class OrganizationViewSet(viewsets.ModelViewSet):
     """ViewSet for organization management."""
     serializer_class = OrganizationSerializer
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAuthenticated, HasOrganizationPermission]
+    permission_resource = 'organization'
+    action_permissions = {'destroy': 'organization.delete'}
     
     def get_queryset(self):
-        """Return organizations where user is a member."""
-        return Organization.objects.filter(members__user=self.request.user)
+        """
+        Return organizations where user is a member, with member counts
+        annotated and workspaces prefetched so serializing is query-constant.
+        """
+        return self._with_summary_data(Organization.objects.filter(id__in=self._member_org_ids()))
+    
+    def _member_org_ids(self):
+        # Filtering by id rather than joining members, so annotations are not multiplied
+        return get_access(self.request).org_ids()
+    
+    @staticmethod
+    def _with_summary_data(queryset):
+        return queryset.annotate(
+            members_count=Count('members')
+        ).prefetch_related(
+            Prefetch('workspaces', queryset=Workspace.objects.only(*WORKSPACE_SUMMARY_FIELDS))
+        )
+    
+    def _summaries(self, org_ids):
+        """Serialized organizations in `org_ids` order, cached per org version."""
+        summaries, versions = get_cached_summaries(org_ids)
+        missing = [org_id for org_id in org_ids if org_id not in summaries]
+        if missing:
+            organizations = self._with_summary_data(Organization.objects.filter(id__in=missing))
+            fresh = {org.id: OrganizationSerializer(org).data for org in organizations}
+            set_cached_summaries(fresh, versions, settings.ORGANIZATION_SUMMARY_CACHE_SECONDS)
+            summaries.update(fresh)
+        return [summaries[org_id] for org_id in org_ids if org_id in summaries]
+    
+    def list(self, request, *args, **kwargs):
+        # Ordered from the summaries, so a warm cache answers without queries
+        summaries = sorted(
+            self._summaries(self._member_org_ids()),
+            key=lambda summary: (summary['created_at'], summary['id']),
+            reverse=True
+        )
+        page = self.paginate_queryset(summaries)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(summaries)
+    
+    def _get_member_org_id(self, permission=None):
+        """
+        Id of the requested organization if the user belongs to it, else 404;
+        403 if `permission` is given and the user's role lacks it.
+        """
+        access = get_access(self.request)
+        lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        try:
+            org_id = uuid.UUID(str(lookup))
+        except ValueError:
+            raise Http404
+        if access.role(org_id) is None:
+            raise Http404
+        if permission is not None:
+            access.require(permission, org_id)
+        return org_id
+    
+    def retrieve(self, request, *args, **kwargs):
+        return Response(self._summaries([self._get_member_org_id()])[0])
     
     def perform_create(self, serializer):
         """Create organization and add creator as owner."""
@@ -33,33 +111,99 @@ class OrganizationViewSet(viewsets.ModelViewSet):
     
     @action(detail=True, methods=['get'])
     def members(self, request, pk=None):
-        """Get organization members."""
-        org = self.get_object()
-        members = org.members.all()
-        serializer = OrganizationMemberSerializer(members, many=True)
-        return Response(serializer.data)
+        """
+        Paginated organization members.
+        GET /api/v1/organizations/{id}/members/?role=admin,owner&search=jo
+        
+        `search` is a case-insensitive prefix match on email, first or last
+        name, served by the expression indexes on users.
+        """
+        org_id = self._get_member_org_id('members.view')
+        members = OrganizationMember.objects.filter(
+            organization_id=org_id
+        ).select_related('user').only(*MEMBER_DIRECTORY_FIELDS).order_by('-joined_at', 'id')
+        
+        roles = [role for role in request.query_params.get('role', '').split(',') if role]
+        if roles:
+            valid_roles = {choice for choice, _ in OrganizationMember.ROLE_CHOICES}
+            invalid = sorted(set(roles) - valid_roles)
+            if invalid:
+                return Response({'role': f"Unknown roles: {', '.join(invalid)}"},
+                                status=status.HTTP_400_BAD_REQUEST)
+            members = members.filter(role__in=roles)
+        
+        search = request.query_params.get('search', '').strip()
+        if search:
+            members = members.filter(
+                Q(user__email__istartswith=search)
+                | Q(user__first_name__istartswith=search)
+                | Q(user__last_name__istartswith=search)
+            )
+        
+        page = self.paginate_queryset(members)
+        if page is not None:
+            return self.get_paginated_response(OrganizationMemberSerializer(page, many=True).data)
+        return Response(OrganizationMemberSerializer(members, many=True).data)
     
     @action(detail=True, methods=['post'])
     def invite(self, request, pk=None):
-        """Invite user to organization (simplified - just add by email)."""
-        org = self.get_object()
-        # Check permission
-        if not org.members.filter(user=request.user, role__in=['owner', 'admin']).exists():
-            return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
+        """
+        Bulk invite members.
+        POST /api/v1/organizations/{id}/invite/
+        
+        Accepts `invites` ([{email, role}]), `csv` text or a `file` upload.
+        Existing users are added immediately; everyone else gets an
+        invitation. Emails go out via `manage.py send_invitations`.
+        """
+        org_id = self._get_member_org_id('members.invite')
+        
+        serializer = BulkInviteSerializer(
+            data=request.data, context={'max_rows': settings.ORGANIZATION_INVITE_MAX_ROWS}
+        )
+        serializer.is_valid(raise_exception=True)
+        invites, invalid = normalize_invites(
+            serializer.validated_data['rows'], serializer.validated_data['default_role']
+        )
+        
+        result = {'added': [], 'invited': [], 'already_members': [], 'already_invited': []}
+        if invites:
+            result = bulk_invite(
+                org_id, invites, request.user, seat_limit=get_entitlements(org_id)['team_members']
+            )
+            if not result.pop('success'):
+                return Response(result, status=status.HTTP_403_FORBIDDEN)
+        return Response({**result, 'invalid': invalid})
+    
+    @action(detail=False, methods=['post'], url_path='invitations/accept')
+    def accept_invitation(self, request):
+        """
+        Accept an invitation sent to the current user's email.
+        POST /api/v1/organizations/invitations/accept/ {"token": "..."}
+        """
+        token = request.data.get('token')
+        if not token:
+            return Response({'token': 'This field is required.'}, status=status.HTTP_400_BAD_REQUEST)
         
-        # TODO: Implement proper invitation system with email
-        return Response({'message': 'Invitation feature coming soon'})
+        result = accept_invitation(token, request.user)
+        if not result['success']:
+            return Response({'error': result['error']}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(OrganizationMemberSerializer(result['membership']).data)
 
 
 class WorkspaceViewSet(viewsets.ModelViewSet):
     """ViewSet for workspace management."""
     serializer_class = WorkspaceSerializer
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAuthenticated, HasOrganizationPermission]
+    permission_resource = 'workspace'
     
     def get_queryset(self):
         """Return workspaces from user's organizations."""
-        org_ids = self.request.user.organization_memberships.values_list('organization_id', flat=True)
-        return Workspace.objects.filter(organization_id__in=org_ids)
+        return Workspace.objects.filter(organization_id__in=get_access(self.request).org_ids())
     
     def perform_create(self, serializer):
+        org_id = serializer.validated_data['organization'].id
+        get_access(self.request).require('workspace.create', org_id)
+        limit = get_entitlements(org_id)['workspaces']
+        if not within_limit(limit, Workspace.objects.filter(organization_id=org_id).count()):
+            raise PermissionDenied(f"Workspace limit reached for this plan ({limit})")
         serializer.save(created_by=self.request.user)
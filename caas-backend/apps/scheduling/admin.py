@@ -1,6 +1,6 @@
 """Admin for scheduling."""
 from django.contrib import admin
-from .models import ScheduledPost
+from .models import ScheduledPost, ScheduleOutbox, RecurringSchedule
 
 
 @admin.register(ScheduledPost)
@@ -9,3 +9,17 @@ class ScheduledPostAdmin(admin.ModelAdmin):
     list_filter = ['status', 'platform']
     search_fields = ['content__id', 'job_id', 'platform_post_id']
     readonly_fields = ['id', 'job_id', 'published_at', 'created_at']
+
+
+@admin.register(ScheduleOutbox)
+class ScheduleOutboxAdmin(admin.ModelAdmin):
+    list_display = ['scheduled_post', 'operation', 'status', 'attempts', 'next_attempt_at', 'sent_at']
+    list_filter = ['status', 'operation']
+    readonly_fields = ['id', 'created_at', 'sent_at']
+
+
+@admin.register(RecurringSchedule)
+class RecurringScheduleAdmin(admin.ModelAdmin):
+    list_display = ['content', 'platform', 'rrule', 'timezone', 'is_active', 'expanded_until']
+    list_filter = ['is_active', 'platform']
+    readonly_fields = ['id', 'expanded_until', 'created_at', 'updated_at']
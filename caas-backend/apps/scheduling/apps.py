@@ -5,3 +5,6 @@ from django.apps import AppConfig
 class SchedulingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.scheduling'
+    
+    def ready(self):
+        import apps.scheduling.signals  # noqa
@@ -0,0 +1,44 @@
+"""
+Per-organization cache versioning for schedule read endpoints.
+
+Every change to an organization's scheduled posts bumps its version, which
+is part of the cache key of derived views (e.g. the calendar), so stale
+entries are simply never read again and expire on their own.
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+VERSION_KEY = 'scheduling:version:{org_id}'
+
+
+def get_schedule_version(org_id):
+    """Current schedule version for an organization."""
+    key = VERSION_KEY.format(org_id=org_id)
+    version = cache.get(key)
+    if version is None:
+        # Seed with a timestamp so an evicted counter never reuses an old version
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def _bump(org_ids):
+    for org_id in org_ids:
+        key = VERSION_KEY.format(org_id=org_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), timeout=None)
+
+
+def bump_schedule_versions(org_ids):
+    """
+    Invalidate cached schedule views for the given organizations.
+    Deferred until the current transaction commits, so readers never cache
+    pre-commit data under the new version.
+    """
+    org_ids = set(org_ids)
+    if org_ids:
+        transaction.on_commit(lambda: _bump(org_ids))
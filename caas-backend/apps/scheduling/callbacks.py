@@ -0,0 +1,95 @@
+"""
+Applying job status updates reported by the Node.js scheduler.
+"""
+import logging
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ScheduledPost
+from .cache import bump_schedule_versions
+from apps.content.models import Content
+
+logger = logging.getLogger(__name__)
+
+# A post only ever moves forward through these states; an update that does not
+# advance the current state is a duplicate or arrived out of order and is skipped.
+STATUS_RANK = {
+    'queued': 0,
+    'scheduled': 1,
+    'canceled': 2,
+    'failed': 3,
+    'published': 4,
+}
+
+
+def apply_status_updates(updates):
+    """
+    Apply a batch of status updates with one read and one bulk write.
+    
+    Args:
+        updates: iterable of dicts with job_id, status and optionally
+                 platform_post_id, error, published_at
+    
+    Returns:
+        dict with applied and ignored counts and the list of unknown job ids
+    """
+    # Keep only the most advanced update per job within the batch
+    latest = {}
+    for update in updates:
+        current = latest.get(update['job_id'])
+        if current is None or STATUS_RANK[update['status']] > STATUS_RANK[current['status']]:
+            latest[update['job_id']] = update
+    
+    now = timezone.now()
+    applied = []
+    ignored = 0
+    content_ids = {'published': set(), 'failed': set()}
+    
+    with transaction.atomic():
+        posts = ScheduledPost.objects.select_for_update().filter(job_id__in=list(latest)).only(
+            'id', 'content_id', 'organization_id', 'job_id', 'status',
+            'platform_post_id', 'published_at', 'error_message'
+        )
+        posts_by_job_id = {post.job_id: post for post in posts}
+        
+        for job_id, update in latest.items():
+            post = posts_by_job_id.get(job_id)
+            if post is None:
+                continue
+            if STATUS_RANK[update['status']] <= STATUS_RANK[post.status]:
+                ignored += 1
+                continue
+            
+            post.status = update['status']
+            if post.status == 'published':
+                post.platform_post_id = update.get('platform_post_id') or ''
+                post.published_at = update.get('published_at') or now
+            elif post.status == 'failed':
+                post.error_message = update.get('error') or ''
+            post.updated_at = now
+            applied.append(post)
+            
+            if post.status in content_ids:
+                content_ids[post.status].add(post.content_id)
+        
+        ScheduledPost.objects.bulk_update(
+            applied, ['status', 'platform_post_id', 'published_at', 'error_message', 'updated_at']
+        )
+        bump_schedule_versions(post.organization_id for post in applied)
+        
+        # Propagate the outcome to the content itself
+        if content_ids['published']:
+            Content.objects.filter(id__in=content_ids['published']).update(
+                status='published', updated_at=now
+            )
+        if content_ids['failed']:
+            Content.objects.filter(id__in=content_ids['failed']).exclude(status='published').update(
+                status='failed', updated_at=now
+            )
+    
+    not_found = [job_id for job_id in latest if job_id not in posts_by_job_id]
+    if not_found:
+        logger.warning(f"Scheduler callbacks for unknown jobs: {not_found}")
+    
+    return {'applied': len(applied), 'ignored': ignored, 'not_found': not_found}
@@ -0,0 +1,37 @@
+"""
+Drain the scheduling outbox into the Node.js scheduler service.
+
+Usage:
+    python manage.py dispatch_schedule_outbox            # drain once and exit
+    python manage.py dispatch_schedule_outbox --loop     # run as a worker
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.scheduling.outbox import OutboxDispatcher
+
+
+class Command(BaseCommand):
+    help = 'Deliver pending scheduling requests from the outbox to the scheduler service.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None, help='Entries per scheduler request')
+        parser.add_argument('--loop', action='store_true', help='Keep polling instead of exiting when drained')
+        parser.add_argument('--interval', type=float, default=2.0, help='Seconds to sleep when idle (with --loop)')
+    
+    def handle(self, *args, **options):
+        dispatcher = OutboxDispatcher(batch_size=options['batch_size'])
+        
+        while True:
+            counts = dispatcher.dispatch_once()
+            if counts['claimed']:
+                self.stdout.write(
+                    f"Dispatched batch: {counts['sent']} sent, {counts['failed']} failed, "
+                    f"{counts['claimed'] - counts['sent'] - counts['failed']} retrying"
+                )
+                continue
+            
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
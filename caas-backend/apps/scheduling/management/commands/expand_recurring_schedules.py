@@ -0,0 +1,37 @@
+"""
+Expand recurring schedules into scheduled posts up to the horizon.
+
+Usage:
+    python manage.py expand_recurring_schedules                  # one pass
+    python manage.py expand_recurring_schedules --loop --interval 900
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.scheduling.recurrence import RecurrenceExpander
+
+
+class Command(BaseCommand):
+    help = 'Materialize upcoming occurrences of recurring schedules.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--horizon-hours', type=int, default=None, help='How far ahead to create posts')
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument('--loop', action='store_true', help='Expand periodically instead of once')
+        parser.add_argument('--interval', type=float, default=900.0, help='Seconds between passes (with --loop)')
+    
+    def handle(self, *args, **options):
+        expander = RecurrenceExpander(
+            horizon_hours=options['horizon_hours'],
+            batch_size=options['batch_size'],
+        )
+        
+        while True:
+            totals = expander.run()
+            self.stdout.write(
+                f"Expanded {totals['schedules']} schedules into {totals['posts']} posts"
+            )
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,29 @@
+"""
+Overwrite cached scheduled-post quota counters with database counts.
+
+Usage:
+    python manage.py reconcile_schedule_quotas                  # once
+    python manage.py reconcile_schedule_quotas --loop --interval 3600
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.scheduling.quotas import reconcile_quotas
+
+
+class Command(BaseCommand):
+    help = 'Correct drift in cached scheduled-post quota counters.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--lookback-days', type=int, default=62, help='Only organizations that scheduled within this window')
+        parser.add_argument('--loop', action='store_true', help='Reconcile periodically instead of once')
+        parser.add_argument('--interval', type=float, default=3600.0, help='Seconds between runs (with --loop)')
+    
+    def handle(self, *args, **options):
+        while True:
+            reconciled = reconcile_quotas(lookback_days=options['lookback_days'])
+            self.stdout.write(f"Reconciled quotas for {reconciled} organizations")
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
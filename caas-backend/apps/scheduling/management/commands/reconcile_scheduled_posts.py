@@ -0,0 +1,41 @@
+"""
+Reconcile overdue scheduled posts with the scheduler service.
+
+Usage:
+    python manage.py reconcile_scheduled_posts                  # one sweep
+    python manage.py reconcile_scheduled_posts --loop --interval 300
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.scheduling.reconciliation import ReconciliationSweeper
+
+
+class Command(BaseCommand):
+    help = 'Query the scheduler for overdue scheduled posts and correct their status.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--grace-minutes', type=int, default=None, help='How long past scheduled_at before a post is checked')
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument('--concurrency', type=int, default=None, help='Concurrent status requests')
+        parser.add_argument('--loop', action='store_true', help='Sweep periodically instead of once')
+        parser.add_argument('--interval', type=float, default=300.0, help='Seconds between sweeps (with --loop)')
+    
+    def handle(self, *args, **options):
+        sweeper = ReconciliationSweeper(
+            grace_minutes=options['grace_minutes'],
+            batch_size=options['batch_size'],
+            concurrency=options['concurrency'],
+        )
+        
+        while True:
+            metrics = sweeper.run()
+            self.stdout.write(
+                f"Checked {metrics['checked']}: {metrics['drifted']} corrected "
+                f"({metrics['published']} published, {metrics['failed']} failed), "
+                f"{metrics['pending']} pending, {metrics['missing']} missing, {metrics['errors']} errors"
+            )
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
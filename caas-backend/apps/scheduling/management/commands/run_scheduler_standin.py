@@ -0,0 +1,60 @@
+"""
+Run an in-process stand-in for the Node.js scheduler service.
+
+Usage:
+    python manage.py run_scheduler_standin                          # on :3001
+    python manage.py run_scheduler_standin --time-scale 0 --batch-callbacks
+    python manage.py run_scheduler_standin --latency-ms 50 --error-rate 0.05
+
+Point SCHEDULER_SERVICE_URL at it; callbacks go to --django-url using
+SCHEDULER_SERVICE_TOKEN, as the real service does.
+"""
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.scheduling.standin import StandinScheduler, make_server
+
+
+class Command(BaseCommand):
+    help = 'Serve the scheduler API from memory, with injectable latency and failures.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=3001)
+        parser.add_argument('--django-url', default='http://localhost:8000', help='Where callbacks are sent')
+        parser.add_argument('--latency-ms', type=float, default=0.0, help='Added to every response')
+        parser.add_argument('--latency-jitter-ms', type=float, default=0.0)
+        parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with 503')
+        parser.add_argument('--publish-failure-rate', type=float, default=0.0, help='Fraction of jobs reported as failed')
+        parser.add_argument('--time-scale', type=float, default=1.0, help='Multiplier for job delays (0 fires immediately)')
+        parser.add_argument('--batch-callbacks', action='store_true', help='Use the batched callback endpoint')
+        parser.add_argument('--callback-batch-size', type=int, default=100)
+    
+    def handle(self, *args, **options):
+        scheduler = StandinScheduler(
+            django_url=options['django_url'],
+            service_token=settings.SCHEDULER_SERVICE_TOKEN,
+            time_scale=options['time_scale'],
+            publish_failure_rate=options['publish_failure_rate'],
+            batch_callbacks=options['batch_callbacks'],
+            callback_batch_size=options['callback_batch_size'],
+        )
+        server = make_server(
+            options['host'], options['port'], scheduler, settings.SCHEDULER_SERVICE_TOKEN,
+            latency_ms=options['latency_ms'],
+            latency_jitter_ms=options['latency_jitter_ms'],
+            error_rate=options['error_rate'],
+        )
+        scheduler.start()
+        self.stdout.write(f"Scheduler stand-in listening on http://{options['host']}:{options['port']}")
+        
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            scheduler.stop()
+            self.stdout.write(json.dumps(scheduler.health()['stats']))
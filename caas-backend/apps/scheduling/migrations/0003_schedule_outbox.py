@@ -0,0 +1,36 @@
+# Generated by Django 5.0.1 on 2026-10-19 10:02
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduling', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduleOutbox',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('operation', models.CharField(choices=[('schedule', 'Schedule'), ('cancel', 'Cancel')], default='schedule', max_length=20)),
+                ('payload', models.JSONField(blank=True, default=dict, help_text='Extra request fields, cleared once sent')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('sent', 'Sent'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('attempts', models.IntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('scheduled_post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='outbox_entries', to='scheduling.scheduledpost')),
+            ],
+            options={
+                'db_table': 'scheduling_outbox',
+                'ordering': ['next_attempt_at'],
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='scheduling__status_a67d2a_idx')],
+            },
+        ),
+    ]
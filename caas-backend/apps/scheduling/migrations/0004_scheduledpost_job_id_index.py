@@ -0,0 +1,18 @@
+# Generated by Django 5.0.1 on 2026-10-19 10:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduling', '0003_schedule_outbox'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='scheduledpost',
+            name='job_id',
+            field=models.CharField(blank=True, db_index=True, help_text='BullMQ job ID from Node.js', max_length=255),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.1 on 2026-10-19 10:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0002_initial'),
+        ('organizations', '0002_initial'),
+        ('scheduling', '0004_scheduledpost_job_id_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='scheduledpost',
+            index=models.Index(fields=['status', 'scheduled_at'], name='scheduled_p_status_d20fb6_idx'),
+        ),
+    ]
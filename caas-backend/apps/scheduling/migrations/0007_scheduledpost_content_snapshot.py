@@ -0,0 +1,33 @@
+# Generated by Django 5.0.1 on 2026-10-19 10:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduling', '0006_scheduledpost_organization_scheduled_at_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scheduledpost',
+            name='content_hash',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='scheduledpost',
+            name='content_text',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='scheduledpost',
+            name='content_version',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='scheduleoutbox',
+            name='operation',
+            field=models.CharField(choices=[('schedule', 'Schedule'), ('cancel', 'Cancel'), ('resync', 'Resync content')], default='schedule', max_length=20),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.0.1 on 2026-10-19 10:10
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0002_initial'),
+        ('organizations', '0002_initial'),
+        ('scheduling', '0007_scheduledpost_content_snapshot'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecurringSchedule',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('platform', models.CharField(max_length=20)),
+                ('rrule', models.TextField(help_text='RFC 5545 RRULE, e.g. FREQ=WEEKLY;BYDAY=MO')),
+                ('dtstart', models.DateTimeField(help_text='First occurrence; its wall-clock time is kept across DST')),
+                ('timezone', models.CharField(default='UTC', max_length=50)),
+                ('until', models.DateTimeField(blank=True, null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('expanded_until', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('content', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recurring_schedules', to='content.content')),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recurring_schedules', to=settings.AUTH_USER_MODEL)),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recurring_schedules', to='organizations.organization')),
+            ],
+            options={
+                'db_table': 'recurring_schedules',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='scheduledpost',
+            name='recurring_schedule',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='occurrences', to='scheduling.recurringschedule'),
+        ),
+        migrations.AddConstraint(
+            model_name='scheduledpost',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'canceled'), _negated=True), fields=('recurring_schedule', 'scheduled_at'), name='unique_recurring_occurrence'),
+        ),
+        migrations.AddIndex(
+            model_name='recurringschedule',
+            index=models.Index(fields=['is_active', 'expanded_until'], name='recurring_s_is_acti_b8bc6f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recurringschedule',
+            index=models.Index(fields=['organization', 'is_active'], name='recurring_s_organiz_a77eb9_idx'),
+        ),
+    ]
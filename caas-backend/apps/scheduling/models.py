@@ -2,6 +2,7 @@
 import uuid
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 
 
 class ScheduledPost(models.Model):
@@ -30,14 +31,26 @@ class ScheduledPost(models.Model):
         on_delete=models.CASCADE,
         related_name='scheduled_posts'
     )
+    recurring_schedule = models.ForeignKey(
+        'scheduling.RecurringSchedule',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='occurrences'
+    )
     
     # Scheduling
     platform = models.CharField(max_length=20)
     scheduled_at = models.DateTimeField()
     
+    # Content snapshot captured at schedule time and sent to the scheduler
+    content_text = models.TextField(blank=True)
+    content_version = models.IntegerField(null=True, blank=True)
+    content_hash = models.CharField(max_length=64, blank=True)
+    
     # Status
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
-    job_id = models.CharField(max_length=255, blank=True, help_text="BullMQ job ID from Node.js")
+    job_id = models.CharField(max_length=255, blank=True, db_index=True, help_text="BullMQ job ID from Node.js")
     
     # Publishing result
     platform_post_id = models.CharField(max_length=255, blank=True)
@@ -53,7 +66,114 @@ class ScheduledPost(models.Model):
         indexes = [
             models.Index(fields=['organization', 'status']),
             models.Index(fields=['scheduled_at']),
+            models.Index(fields=['status', 'scheduled_at']),
+            models.Index(fields=['organization', 'scheduled_at']),
+            models.Index(fields=['organization', 'created_at']),
+        ]
+        constraints = [
+            # One live occurrence per recurrence instant; canceled ones may be re-created
+            models.UniqueConstraint(
+                fields=['recurring_schedule', 'scheduled_at'],
+                condition=~models.Q(status='canceled'),
+                name='unique_recurring_occurrence'
+            ),
         ]
     
     def __str__(self):
         return f"{self.content.platform} - {self.scheduled_at}"
+
+
+class RecurringSchedule(models.Model):
+    """
+    Evergreen posting rule, e.g. every Monday at 9:00.
+    
+    The RFC 5545 recurrence rule is evaluated in `timezone` and expanded into
+    concrete ScheduledPost rows only a short horizon ahead.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    organization = models.ForeignKey(
+        'organizations.Organization',
+        on_delete=models.CASCADE,
+        related_name='recurring_schedules'
+    )
+    content = models.ForeignKey(
+        'content.Content',
+        on_delete=models.CASCADE,
+        related_name='recurring_schedules'
+    )
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='recurring_schedules'
+    )
+    platform = models.CharField(max_length=20)
+    
+    # Recurrence
+    rrule = models.TextField(help_text="RFC 5545 RRULE, e.g. FREQ=WEEKLY;BYDAY=MO")
+    dtstart = models.DateTimeField(help_text="First occurrence; its wall-clock time is kept across DST")
+    timezone = models.CharField(max_length=50, default='UTC')
+    until = models.DateTimeField(null=True, blank=True)
+    
+    # Expansion state
+    is_active = models.BooleanField(default=True)
+    expanded_until = models.DateTimeField(null=True, blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'recurring_schedules'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['is_active', 'expanded_until']),
+            models.Index(fields=['organization', 'is_active']),
+        ]
+    
+    def __str__(self):
+        return f"{self.platform} - {self.rrule}"
+
+
+class ScheduleOutbox(models.Model):
+    """
+    Pending request to the Node.js scheduler, written in the same transaction
+    as the ScheduledPost change it belongs to and drained by the dispatcher.
+    """
+    OPERATION_CHOICES = [
+        ('schedule', 'Schedule'),
+        ('cancel', 'Cancel'),
+        ('resync', 'Resync content'),
+    ]
+    
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    scheduled_post = models.ForeignKey(
+        ScheduledPost,
+        on_delete=models.CASCADE,
+        related_name='outbox_entries'
+    )
+    operation = models.CharField(max_length=20, choices=OPERATION_CHOICES, default='schedule')
+    payload = models.JSONField(default=dict, blank=True, help_text="Extra request fields, cleared once sent")
+    
+    # Delivery
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'scheduling_outbox'
+        ordering = ['next_attempt_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.operation} {self.scheduled_post_id} ({self.status})"
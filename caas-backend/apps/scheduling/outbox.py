@@ -0,0 +1,244 @@
+"""
+Outbox dispatcher - delivers queued scheduling requests to the Node.js service.
+
+Entries are claimed with a lease (next_attempt_at pushed into the future), so
+if a dispatcher dies mid-batch the entries become due again and are retried.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ScheduledPost, ScheduleOutbox
+from .scheduler_client import SchedulerClient
+from .cache import bump_schedule_versions
+from .snapshots import snapshot_payload
+
+logger = logging.getLogger(__name__)
+
+
+def dispatch_at(scheduled_at, now=None):
+    """
+    When a post should be handed to the scheduler: only once it is due within
+    the dispatch window. Until then it stays in Django, so the scheduler's
+    queue only holds near-term jobs and canceling is a local update.
+    """
+    window = timedelta(minutes=settings.SCHEDULER_DISPATCH_WINDOW_MINUTES)
+    return max(now or timezone.now(), scheduled_at - window)
+
+
+def enqueue_schedule(scheduled_posts, platform_tokens=None):
+    """
+    Create outbox entries for newly created posts, due at their dispatch time.
+    Must be called inside the transaction that created the posts.
+    """
+    platform_tokens = platform_tokens or {}
+    now = timezone.now()
+    entries = [
+        ScheduleOutbox(
+            scheduled_post=post,
+            operation='schedule',
+            payload={'access_token': platform_tokens.get(post.id, '')},
+            next_attempt_at=dispatch_at(post.scheduled_at, now)
+        )
+        for post in scheduled_posts
+    ]
+    return ScheduleOutbox.objects.bulk_create(entries)
+
+
+def job_key(entry):
+    """Scheduler job id for a schedule entry."""
+    return f"{entry.scheduled_post_id}-{entry.id}"
+
+
+class OutboxDispatcher:
+    """Drains due outbox entries in batches."""
+    
+    def __init__(self, batch_size=None, lease_seconds=None, max_attempts=None):
+        self.batch_size = batch_size or settings.SCHEDULER_OUTBOX_BATCH_SIZE
+        self.lease = timedelta(seconds=lease_seconds or settings.SCHEDULER_OUTBOX_LEASE_SECONDS)
+        self.max_attempts = max_attempts or settings.SCHEDULER_OUTBOX_MAX_ATTEMPTS
+    
+    def claim_batch(self):
+        """Lock and lease the next batch of due entries."""
+        now = timezone.now()
+        with transaction.atomic():
+            entries = list(
+                ScheduleOutbox.objects
+                .select_for_update(skip_locked=True, of=('self',))
+                .select_related('scheduled_post')
+                .filter(status='pending', next_attempt_at__lte=now)
+                .order_by('next_attempt_at')[:self.batch_size]
+            )
+            for entry in entries:
+                entry.attempts += 1
+                entry.next_attempt_at = now + self.lease
+            ScheduleOutbox.objects.bulk_update(entries, ['attempts', 'next_attempt_at'])
+        return entries
+    
+    def dispatch_once(self):
+        """
+        Send one batch.
+        
+        Returns:
+            dict with claimed, sent and failed counts
+        """
+        entries = self.claim_batch()
+        if not entries:
+            return {'claimed': 0, 'sent': 0, 'failed': 0}
+        
+        schedule_entries = [entry for entry in entries if entry.operation == 'schedule']
+        cancel_entries = [entry for entry in entries if entry.operation == 'cancel']
+        resync_entries = [entry for entry in entries if entry.operation == 'resync']
+        
+        outcomes = {}
+        # Cancels first, so a rescheduled post's old job is gone before its new one exists
+        for entry in cancel_entries:
+            outcomes[entry.id] = self._send_cancel(entry)
+        if schedule_entries:
+            outcomes.update(self._send_schedules(schedule_entries))
+        for entry in resync_entries:
+            outcomes[entry.id] = self._send_resync(entry)
+        
+        return self._record_outcomes(entries, outcomes)
+    
+    def _send_schedules(self, entries):
+        """Send all schedule entries in one bulk request."""
+        jobs = []
+        for entry in entries:
+            post = entry.scheduled_post
+            jobs.append({
+                'scheduled_post_id': str(post.id),
+                # One job per schedule entry: a reschedule never collides with the
+                # post's previous job, and retries of the entry stay idempotent
+                'job_key': job_key(entry),
+                'content_id': str(post.content_id),
+                'platform': post.platform,
+                'scheduled_at': post.scheduled_at.isoformat(),
+                'user_id': str(post.created_by_id),
+                'org_id': str(post.organization_id),
+                'access_token': entry.payload.get('access_token', ''),
+                **snapshot_payload(post)
+            })
+        
+        result = SchedulerClient.schedule_posts_bulk(jobs)
+        if not result['success']:
+            return {entry.id: (False, result['error']) for entry in entries}
+        
+        results_by_post_id = {
+            item.get('scheduled_post_id'): item for item in result['results']
+        }
+        outcomes = {}
+        for entry in entries:
+            item = results_by_post_id.get(str(entry.scheduled_post_id))
+            if item and item.get('status') == 'scheduled':
+                outcomes[entry.id] = (True, item['job_id'])
+            else:
+                outcomes[entry.id] = (False, (item or {}).get('error', 'Missing result from scheduler'))
+        return outcomes
+    
+    def _send_cancel(self, entry):
+        # Reschedules cancel the job the post had before it was re-queued
+        job_id = entry.payload.get('job_id') or entry.scheduled_post.job_id
+        result = SchedulerClient.cancel_job(job_id)
+        if result['success'] or result.get('status_code') == 404:
+            return (True, None)
+        return (False, result['error'])
+    
+    def _send_resync(self, entry):
+        """Push the post's current snapshot to its already-created job."""
+        post = entry.scheduled_post
+        if not post.job_id or post.status not in ('queued', 'scheduled'):
+            return (True, None)
+        result = SchedulerClient.update_job(post.job_id, snapshot_payload(post))
+        if result['success']:
+            return (True, None)
+        if result.get('status_code') in (400, 404, 409):
+            # Job already ran or is running; nothing left to update
+            logger.info(f"Skipping resync for post {post.id}: {result['error']}")
+            return (True, None)
+        return (False, result['error'])
+    
+    def _record_outcomes(self, entries, outcomes):
+        """Persist delivery results for entries and their posts."""
+        now = timezone.now()
+        counts = {'claimed': len(entries), 'sent': 0, 'failed': 0}
+        
+        with transaction.atomic():
+            # Re-read post state: a post may have been canceled while in flight
+            posts = ScheduledPost.objects.select_for_update().in_bulk(
+                [entry.scheduled_post_id for entry in entries]
+            )
+            # Entries deleted while in flight were superseded by a cancel or reschedule
+            live = set(
+                ScheduleOutbox.objects.filter(id__in=[entry.id for entry in entries]).values_list('id', flat=True)
+            )
+            updated_posts = {}
+            late_cancels = []
+            
+            superseded = [entry for entry in entries if entry.id not in live]
+            entries = [entry for entry in entries if entry.id in live]
+            for entry in superseded:
+                ok, detail = outcomes[entry.id]
+                if ok and entry.operation == 'schedule' and entry.scheduled_post_id in posts:
+                    # The job was created anyway; take it down again
+                    late_cancels.append(ScheduleOutbox(
+                        scheduled_post_id=entry.scheduled_post_id, operation='cancel', payload={'job_id': detail}
+                    ))
+            
+            for entry in entries:
+                ok, detail = outcomes[entry.id]
+                post = posts.get(entry.scheduled_post_id)
+                
+                if ok:
+                    counts['sent'] += 1
+                    entry.status = 'sent'
+                    entry.sent_at = now
+                    entry.payload = {}
+                    entry.last_error = ''
+                    if entry.operation == 'schedule' and post is not None:
+                        post.job_id = detail
+                        if post.status == 'canceled':
+                            late_cancels.append(ScheduleOutbox(
+                                scheduled_post=post, operation='cancel', payload={'job_id': detail}
+                            ))
+                        else:
+                            post.status = 'scheduled'
+                        updated_posts[post.id] = post
+                    continue
+                
+                entry.last_error = detail or 'Unknown error'
+                if entry.attempts >= self.max_attempts:
+                    counts['failed'] += 1
+                    entry.status = 'failed'
+                    entry.payload = {}
+                    if entry.operation == 'schedule' and post is not None and post.status == 'queued':
+                        post.status = 'failed'
+                        post.error_message = f"Scheduling failed: {entry.last_error}"
+                        updated_posts[post.id] = post
+                else:
+                    entry.next_attempt_at = now + self._backoff(entry.attempts)
+                logger.warning(
+                    f"Outbox {entry.operation} for post {entry.scheduled_post_id} failed "
+                    f"(attempt {entry.attempts}): {entry.last_error}"
+                )
+            
+            ScheduleOutbox.objects.bulk_update(
+                entries, ['status', 'sent_at', 'payload', 'last_error', 'next_attempt_at']
+            )
+            for post in updated_posts.values():
+                post.updated_at = now
+            ScheduledPost.objects.bulk_update(
+                updated_posts.values(), ['job_id', 'status', 'error_message', 'updated_at']
+            )
+            bump_schedule_versions(post.organization_id for post in updated_posts.values())
+            ScheduleOutbox.objects.bulk_create(late_cancels)
+        
+        return counts
+    
+    @staticmethod
+    def _backoff(attempts):
+        """Exponential retry delay, capped at one hour."""
+        return timedelta(seconds=min(3600, 5 * (2 ** attempts)))
@@ -0,0 +1,17 @@
+"""
+Permissions for scheduler service-to-service endpoints.
+"""
+import hmac
+
+from django.conf import settings
+from rest_framework import permissions
+
+
+class IsSchedulerService(permissions.BasePermission):
+    """
+    Allow requests carrying the shared scheduler service token.
+    """
+    
+    def has_permission(self, request, view):
+        token = request.headers.get('X-Service-Token', '')
+        return bool(token) and hmac.compare_digest(token, settings.SCHEDULER_SERVICE_TOKEN)
@@ -0,0 +1,170 @@
+"""
+Scheduled-post quota enforcement.
+
+Each organization has a counter of posts scheduled in its current billing
+period, kept in the cache and changed with atomic incr/decr so requests never
+need a COUNT(*). Counters are seeded from the database on a miss and
+periodically overwritten from it by `manage.py reconcile_schedule_quotas`.
+Units reserved for posts that end up not being created (the request fails
+before its transaction commits) are given back with cancel_reservation.
+"""
+import logging
+from datetime import timedelta
+from datetime import timezone as dt_timezone
+
+from django.core.cache import cache
+from django.db.models import Count
+from django.utils import timezone
+
+from apps.subscriptions.entitlements import get_entitlements, get_entitlements_many
+from .models import ScheduledPost
+
+logger = logging.getLogger(__name__)
+
+QUOTA_KEY = 'scheduling:quota:{org_id}:{period}'
+UNLIMITED = -1
+
+
+def _month_bounds(now):
+    start = now.astimezone(dt_timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    end = (start + timedelta(days=32)).replace(day=1)
+    return start, end
+
+
+def get_quota(org_id, now=None):
+    """
+    Scheduled-post limit and current period for an organization.
+    
+    The period is the subscription's billing period when it covers `now`,
+    otherwise the calendar month. The limit comes from the organization's
+    cached entitlements.
+    
+    Returns:
+        (limit, period_start, period_end); limit is -1 for unlimited
+    """
+    now = now or timezone.now()
+    return _quota_for(get_entitlements(org_id), now)
+
+
+def _quota_for(entitlements, now):
+    start, end = entitlements['period_start'], entitlements['period_end']
+    if start is None or end is None or not start <= now < end:
+        start, end = _month_bounds(now)
+    return entitlements['scheduled_posts'], start, end
+
+
+def _key(org_id, period_start):
+    return QUOTA_KEY.format(org_id=org_id, period=int(period_start.timestamp()))
+
+
+def _count_in_period(org_id, period_start):
+    return ScheduledPost.objects.filter(
+        organization_id=org_id, created_at__gte=period_start
+    ).exclude(status='canceled').count()
+
+
+def _ttl(period_end, now):
+    # Keep the counter a little past the period so late releases still land
+    return max(60, int((period_end - now).total_seconds()) + 3600)
+
+
+def reserve_scheduled_posts(org_id, count=1):
+    """
+    Take up to `count` units of the organization's quota.
+    
+    Returns:
+        dict with granted (how many of `count` fit), limit and used
+    """
+    now = timezone.now()
+    limit, period_start, period_end = get_quota(org_id, now)
+    if limit == UNLIMITED:
+        return {'granted': count, 'limit': limit, 'used': None}
+    
+    key = _key(org_id, period_start)
+    if cache.get(key) is None:
+        cache.add(key, _count_in_period(org_id, period_start), timeout=_ttl(period_end, now))
+    try:
+        used = cache.incr(key, count)
+    except ValueError:
+        # Evicted since the seed; fall back to the database count
+        cache.add(key, _count_in_period(org_id, period_start), timeout=_ttl(period_end, now))
+        used = cache.incr(key, count)
+    
+    over = max(0, min(count, used - limit))
+    if over:
+        used = cache.decr(key, over)
+    return {'granted': count - over, 'limit': limit, 'used': used}
+
+
+def release_scheduled_posts(org_id, created_ats):
+    """Give back quota for canceled posts created in the current period."""
+    now = timezone.now()
+    limit, period_start, _ = get_quota(org_id, now)
+    if limit == UNLIMITED:
+        return
+    
+    _give_back(_key(org_id, period_start), sum(1 for created_at in created_ats if created_at >= period_start))
+
+
+def cancel_reservation(org_id, count=1):
+    """Give back units taken by reserve_scheduled_posts for posts that were never created."""
+    if not count:
+        return
+    limit, period_start, _ = get_quota(org_id)
+    if limit != UNLIMITED:
+        _give_back(_key(org_id, period_start), count)
+
+
+def _give_back(key, count):
+    if not count:
+        return
+    try:
+        if cache.decr(key, count) < 0:
+            cache.delete(key)
+    except ValueError:
+        # Not cached; the next reservation seeds from the database
+        pass
+
+
+def reconcile_quotas(lookback_days=62):
+    """
+    Overwrite cached counters with database counts for every organization
+    that scheduled posts recently.
+    
+    Returns:
+        number of organizations reconciled
+    """
+    now = timezone.now()
+    org_ids = set(
+        ScheduledPost.objects
+        .filter(created_at__gte=now - timedelta(days=lookback_days))
+        .values_list('organization_id', flat=True)
+        .distinct()
+    )
+    
+    entitlements = get_entitlements_many(org_ids)
+    # Group organizations by period so each group is one aggregate query
+    periods = {}
+    for org_id in org_ids:
+        limit, period_start, period_end = _quota_for(entitlements[org_id], now)
+        if limit != UNLIMITED:
+            periods.setdefault((period_start, period_end), []).append(org_id)
+    
+    reconciled = 0
+    for (period_start, period_end), group in periods.items():
+        counts = dict(
+            ScheduledPost.objects
+            .filter(organization_id__in=group, created_at__gte=period_start)
+            .exclude(status='canceled')
+            .values_list('organization_id')
+            .annotate(count=Count('id'))
+            .order_by()
+        )
+        cache.set_many(
+            {_key(org_id, period_start): counts.get(org_id, 0) for org_id in group},
+            timeout=_ttl(period_end, now)
+        )
+        reconciled += len(group)
+    
+    logger.info(f"Reconciled scheduled-post quotas for {reconciled} organizations")
+    return reconciled
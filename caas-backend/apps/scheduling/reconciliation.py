@@ -0,0 +1,143 @@
+"""
+Reconciliation sweeper for scheduled posts whose callback never arrived.
+
+Overdue posts still marked `scheduled` are checked against the Node.js
+scheduler in batches, with a bounded pool of concurrent status requests, and
+corrections are applied through the same path as scheduler callbacks.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import ScheduledPost
+from .scheduler_client import SchedulerClient
+from .callbacks import apply_status_updates
+
+logger = logging.getLogger(__name__)
+
+METRICS_CACHE_KEY = 'scheduling:reconciliation:last_run'
+
+
+class JobNotFound(LookupError):
+    """The scheduler no longer knows the job, e.g. it was removed after completing."""
+
+
+def job_status_to_update(job_id, result):
+    """
+    Translate a scheduler job status response into a status update.
+    
+    Returns None when the job is still pending. Raises JobNotFound when the
+    scheduler has no such job, which says nothing about whether the post was
+    published, and LookupError when the scheduler could not be queried.
+    """
+    if not result['success']:
+        if result.get('status_code') == 404:
+            raise JobNotFound(result['error'])
+        raise LookupError(result['error'])
+    
+    data = result['data']
+    state = data.get('status')
+    return_value = data.get('return_value') or {}
+    
+    if state == 'completed' and return_value.get('success'):
+        published_at = return_value.get('published_at')
+        return {
+            'job_id': job_id,
+            'status': 'published',
+            'platform_post_id': return_value.get('platform_post_id', ''),
+            'published_at': parse_datetime(published_at) if published_at else None,
+        }
+    if state in ('completed', 'failed'):
+        return {
+            'job_id': job_id,
+            'status': 'failed',
+            'error': return_value.get('error') or 'Job failed in scheduler',
+        }
+    return None
+
+
+class ReconciliationSweeper:
+    """Finds overdue scheduled posts and reconciles them with the scheduler."""
+    
+    def __init__(self, grace_minutes=None, batch_size=None, concurrency=None):
+        self.grace = timedelta(minutes=grace_minutes or settings.SCHEDULER_RECONCILE_GRACE_MINUTES)
+        self.batch_size = batch_size or settings.SCHEDULER_RECONCILE_BATCH_SIZE
+        self.concurrency = concurrency or settings.SCHEDULER_RECONCILE_CONCURRENCY
+    
+    def _overdue_batches(self, cutoff):
+        """Yield overdue posts in (scheduled_at, id) keyset order."""
+        queryset = ScheduledPost.objects.filter(
+            status='scheduled', scheduled_at__lt=cutoff
+        ).exclude(job_id='').order_by('scheduled_at', 'id').only('id', 'job_id', 'scheduled_at')
+        
+        last = None
+        while True:
+            page = queryset
+            if last is not None:
+                page = page.filter(
+                    Q(scheduled_at__gt=last.scheduled_at) |
+                    Q(scheduled_at=last.scheduled_at, id__gt=last.id)
+                )
+            batch = list(page[:self.batch_size])
+            if not batch:
+                return
+            yield batch
+            last = batch[-1]
+    
+    def run(self):
+        """
+        Run one full sweep.
+        
+        Returns:
+            dict of metrics (checked, drifted, published, failed, pending, missing, errors)
+        """
+        started_at = timezone.now()
+        metrics = {'checked': 0, 'drifted': 0, 'published': 0, 'failed': 0, 'pending': 0, 'missing': 0, 'errors': 0}
+        
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            for batch in self._overdue_batches(started_at - self.grace):
+                job_ids = [post.job_id for post in batch]
+                results = pool.map(SchedulerClient.get_job_status, job_ids)
+                
+                updates = []
+                for job_id, result in zip(job_ids, results):
+                    metrics['checked'] += 1
+                    try:
+                        update = job_status_to_update(job_id, result)
+                    except JobNotFound:
+                        # Unreconcilable: leave the post as it is for someone to look at
+                        metrics['missing'] += 1
+                        logger.warning(f"Scheduler job {job_id} not found; leaving its post unchanged")
+                        continue
+                    except LookupError:
+                        metrics['errors'] += 1
+                        continue
+                    if update is None:
+                        metrics['pending'] += 1
+                    else:
+                        updates.append(update)
+                        metrics[update['status']] += 1
+                
+                if updates:
+                    metrics['drifted'] += apply_status_updates(updates)['applied']
+        
+        metrics['started_at'] = started_at.isoformat()
+        metrics['finished_at'] = timezone.now().isoformat()
+        cache.set(METRICS_CACHE_KEY, metrics, timeout=None)
+        
+        if metrics['drifted']:
+            logger.warning(f"Reconciliation corrected {metrics['drifted']} scheduled posts: {metrics}")
+        else:
+            logger.info(f"Reconciliation found no drift: {metrics}")
+        return metrics
+
+
+def get_last_run_metrics():
+    """Metrics from the most recent sweep, or None if none has run."""
+    return cache.get(METRICS_CACHE_KEY)
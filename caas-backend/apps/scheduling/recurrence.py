@@ -0,0 +1,286 @@
+"""
+Lazy expansion of recurring schedules into concrete scheduled posts.
+
+Only occurrences within a short horizon are materialized; the expander runs
+periodically and extends each schedule's `expanded_until` as time passes.
+Rules are evaluated on local wall-clock time, so "every Monday at 9" stays
+at 9:00 across DST changes.
+"""
+import logging
+import re
+import zoneinfo
+from collections import Counter
+from datetime import timedelta
+
+from dateutil import rrule as rrule_module
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.content.models import Content
+from .models import RecurringSchedule, ScheduledPost, ScheduleOutbox
+from .outbox import enqueue_schedule
+from .cache import bump_schedule_versions
+from .slots import SlotAllocator
+from .snapshots import apply_snapshot
+from .quotas import reserve_scheduled_posts, release_scheduled_posts, cancel_reservation
+
+logger = logging.getLogger(__name__)
+
+# Sub-hourly rules would materialize far too many rows per horizon
+DISALLOWED_FREQUENCY = re.compile(r'FREQ=(SECONDLY|MINUTELY)', re.IGNORECASE)
+
+
+def build_rule(rule, dtstart, tz_name):
+    """
+    Parse an RRULE anchored at `dtstart`'s local wall-clock time.
+    
+    Raises:
+        ValueError: if the rule or time zone is invalid
+    """
+    try:
+        tz = zoneinfo.ZoneInfo(tz_name)
+    except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown time zone: {tz_name}")
+    
+    if DISALLOWED_FREQUENCY.search(rule):
+        raise ValueError("Recurrence must be hourly or less frequent")
+    
+    local_start = dtstart.astimezone(tz).replace(tzinfo=None)
+    try:
+        parsed = rrule_module.rrulestr(rule, dtstart=local_start)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid recurrence rule: {e}")
+    if not isinstance(parsed, rrule_module.rrule):
+        raise ValueError("Only a single RRULE is supported")
+    return parsed, tz
+
+
+def occurrences(schedule, start, end):
+    """Occurrence instants of `schedule` in (start, end], as aware datetimes."""
+    parsed, tz = build_rule(schedule.rrule, schedule.dtstart, schedule.timezone)
+    if schedule.until is not None:
+        end = min(end, schedule.until)
+    if end <= start:
+        return []
+    
+    local_start = start.astimezone(tz).replace(tzinfo=None)
+    local_end = end.astimezone(tz).replace(tzinfo=None)
+    instants = (
+        local.replace(tzinfo=tz)
+        for local in parsed.between(local_start, local_end, inc=True)
+    )
+    return [instant for instant in instants if start < instant <= end]
+
+
+def has_occurrences_after(schedule, moment):
+    """Whether the rule produces anything after `moment`."""
+    if schedule.until is not None and schedule.until <= moment:
+        return False
+    parsed, tz = build_rule(schedule.rrule, schedule.dtstart, schedule.timezone)
+    return parsed.after(moment.astimezone(tz).replace(tzinfo=None)) is not None
+
+
+def cancel_future_occurrences(schedule):
+    """
+    Cancel a schedule's upcoming occurrences that have not been published,
+    queueing scheduler cancellations for those already handed over.
+    Must be called inside a transaction.
+    """
+    posts = list(
+        ScheduledPost.objects.select_for_update()
+        .filter(
+            recurring_schedule=schedule,
+            status__in=['queued', 'scheduled'],
+            scheduled_at__gt=timezone.now()
+        )
+        .only('id', 'organization_id', 'platform', 'scheduled_at', 'job_id', 'status', 'created_at')
+    )
+    if not posts:
+        return 0
+    
+    ScheduleOutbox.objects.filter(
+        scheduled_post__in=posts, operation='schedule', status='pending'
+    ).delete()
+    ScheduleOutbox.objects.bulk_create([
+        ScheduleOutbox(scheduled_post=post, operation='cancel', payload={'job_id': post.job_id})
+        for post in posts if post.job_id
+    ])
+    ScheduledPost.objects.filter(id__in=[post.id for post in posts]).update(
+        status='canceled', updated_at=timezone.now()
+    )
+    bump_schedule_versions([schedule.organization_id])
+    
+    def _release():
+        allocator = SlotAllocator()
+        for post in posts:
+            allocator.release(post.platform, post.organization_id, post.scheduled_at)
+        release_scheduled_posts(schedule.organization_id, [post.created_at for post in posts])
+    transaction.on_commit(_release)
+    return len(posts)
+
+
+class RecurrenceExpander:
+    """Materializes due occurrences of active recurring schedules."""
+    
+    def __init__(self, horizon_hours=None, batch_size=None):
+        self.horizon = timedelta(
+            hours=horizon_hours or settings.SCHEDULING_RECURRENCE_HORIZON_HOURS
+        )
+        self.batch_size = batch_size or settings.SCHEDULING_RECURRENCE_BATCH_SIZE
+        self.allocator = SlotAllocator()
+    
+    def run(self):
+        """
+        Expand every schedule whose horizon has fallen behind.
+        
+        Returns:
+            dict with schedules and posts counts
+        """
+        totals = {'schedules': 0, 'posts': 0}
+        started = timezone.now()
+        while True:
+            schedules, posts = self.expand_batch(started)
+            totals['schedules'] += schedules
+            totals['posts'] += posts
+            if schedules < self.batch_size:
+                return totals
+    
+    def expand_batch(self, started=None):
+        """
+        Lock and expand one batch of due schedules. A schedule is due once
+        less than half of its horizon is left, so runs don't touch every row.
+        With `started`, schedules already expanded since then are skipped, so
+        a run visits schedules held back by quota only once.
+        """
+        now = timezone.now()
+        horizon_end = now + self.horizon
+        refill_before = now + self.horizon / 2
+        
+        with transaction.atomic():
+            schedules = list(
+                RecurringSchedule.objects
+                .select_for_update(skip_locked=True)
+                .filter(is_active=True)
+                .filter(Q(expanded_until__isnull=True) | Q(expanded_until__lt=refill_before))
+                .filter(updated_at__lt=started or now)
+                .order_by('expanded_until')[:self.batch_size]
+            )
+            if not schedules:
+                return 0, 0
+            
+            contents = Content.objects.only(
+                'id', 'platform', 'generated_text', 'version'
+            ).in_bulk({schedule.content_id for schedule in schedules})
+            
+            existing = self._existing_occurrences(schedules, now)
+            
+            new_posts = []
+            try:
+                for schedule in schedules:
+                    new_posts.extend(self._expand(
+                        schedule, contents[schedule.content_id], now, horizon_end, existing
+                    ))
+                
+                ScheduledPost.objects.bulk_create(new_posts)
+                enqueue_schedule(new_posts)
+                RecurringSchedule.objects.bulk_update(
+                    schedules, ['expanded_until', 'is_active', 'updated_at']
+                )
+                bump_schedule_versions(post.organization_id for post in new_posts)
+            except Exception:
+                # The transaction rolls back; quota and slots live in the cache
+                self._give_back(new_posts)
+                raise
+        
+        return len(schedules), len(new_posts)
+    
+    def expand(self, schedule):
+        """Expand a single schedule right away, e.g. after it is created."""
+        with transaction.atomic():
+            schedule = RecurringSchedule.objects.select_for_update().get(pk=schedule.pk)
+            if not schedule.is_active:
+                return []
+            content = Content.objects.only(
+                'id', 'platform', 'generated_text', 'version'
+            ).get(pk=schedule.content_id)
+            now = timezone.now()
+            new_posts = self._expand(
+                schedule, content, now, now + self.horizon,
+                self._existing_occurrences([schedule], now)
+            )
+            try:
+                ScheduledPost.objects.bulk_create(new_posts)
+                enqueue_schedule(new_posts)
+                schedule.save(update_fields=['expanded_until', 'is_active', 'updated_at'])
+                bump_schedule_versions(post.organization_id for post in new_posts)
+            except Exception:
+                self._give_back(new_posts)
+                raise
+        return new_posts
+    
+    @staticmethod
+    def _existing_occurrences(schedules, now):
+        """Live upcoming occurrences, so re-expanding a window never duplicates."""
+        return set(
+            ScheduledPost.objects
+            .filter(recurring_schedule__in=schedules, scheduled_at__gt=now)
+            .exclude(status='canceled')
+            .values_list('recurring_schedule_id', 'scheduled_at')
+        )
+    
+    def _expand(self, schedule, content, now, horizon_end, existing):
+        """Build unsaved posts for occurrences up to the horizon."""
+        start = max(schedule.expanded_until or now, now)
+        try:
+            instants = occurrences(schedule, start, horizon_end)
+            more = has_occurrences_after(schedule, horizon_end)
+        except ValueError as e:
+            logger.error(f"Deactivating recurring schedule {schedule.id}: {e}")
+            schedule.is_active = False
+            schedule.updated_at = now
+            return []
+        
+        instants = [instant for instant in instants if (schedule.id, instant) not in existing]
+        granted = reserve_scheduled_posts(schedule.organization_id, len(instants))['granted'] if instants else 0
+        
+        posts = []
+        try:
+            for instant in instants[:granted]:
+                posts.append(apply_snapshot(ScheduledPost(
+                    content_id=content.id,
+                    organization_id=schedule.organization_id,
+                    created_by_id=schedule.created_by_id,
+                    recurring_schedule=schedule,
+                    platform=content.platform,
+                    scheduled_at=self.allocator.assign(
+                        content.platform, schedule.organization_id, instant, allow_shift=False
+                    ),
+                    status='queued'
+                ), content))
+        except Exception:
+            self._give_back(posts)
+            cancel_reservation(schedule.organization_id, granted - len(posts))
+            raise
+        
+        if granted < len(instants):
+            # Stop before the first skipped occurrence so it is retried once quota frees up
+            logger.warning(
+                f"Recurring schedule {schedule.id}: scheduled post quota reached, "
+                f"deferring {len(instants) - granted} occurrences"
+            )
+            schedule.expanded_until = instants[granted - 1] if granted else start
+            schedule.is_active = True
+        else:
+            schedule.expanded_until = horizon_end
+            schedule.is_active = more
+        schedule.updated_at = now
+        return posts
+    
+    def _give_back(self, posts):
+        """Return the quota and slots taken for posts that were never created."""
+        for post in posts:
+            self.allocator.release(post.platform, post.organization_id, post.scheduled_at)
+        for org_id, count in Counter(post.organization_id for post in posts).items():
+            cancel_reservation(org_id, count)
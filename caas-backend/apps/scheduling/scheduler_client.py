@@ -3,8 +3,10 @@ Client for communicating with Node.js scheduler service.
 """
 import requests
 import logging
+from asgiref.sync import sync_to_async
 from django.conf import settings
-from rest_framework_simplejwt.tokens import AccessToken
+
+from .transport import get_transport, ServiceTokenCache
 
 logger = logging.getLogger(__name__)
 
@@ -12,19 +14,25 @@ logger = logging.getLogger(__name__)
 class SchedulerClient:
     """HTTP client for Node.js scheduler service."""
     
-    BASE_URL = settings.SCHEDULER_SERVICE_URL
     SERVICE_TOKEN = settings.SCHEDULER_SERVICE_TOKEN
     
+    _token_cache = ServiceTokenCache(refresh_margin=settings.SCHEDULER_TOKEN_REFRESH_MARGIN_SECONDS)
+    
     @staticmethod
-    def _get_headers(user):
-        """Generate headers with service authentication."""
-        # Create JWT for service-to-service communication
-        token = AccessToken.for_user(user)
-        return {
-            'Authorization': f'Bearer {str(token)}',
+    def _get_headers(user=None):
+        """
+        Generate headers with service authentication.
+        
+        The user JWT is cached per user until shortly before it expires.
+        Without a user only the shared service token is sent.
+        """
+        headers = {
             'Content-Type': 'application/json',
             'X-Service-Token': SchedulerClient.SERVICE_TOKEN
         }
+        if user is not None:
+            headers['Authorization'] = f'Bearer {SchedulerClient._token_cache.get(user)}'
+        return headers
     
     @staticmethod
     def schedule_post(content_id, platform, scheduled_at, user, org_id, access_token=None):
@@ -42,7 +50,6 @@ class SchedulerClient:
         Returns:
             dict with success, job_id
         """
-        url = f"{SchedulerClient.BASE_URL}/api/v1/schedule"
         headers = SchedulerClient._get_headers(user)
         
         payload = {
@@ -55,8 +62,7 @@ class SchedulerClient:
         }
         
         try:
-            response = requests.post(url, json=payload, headers=headers, timeout=10)
-            response.raise_for_status()
+            response = get_transport().request('POST', '/api/v1/schedule', json=payload, headers=headers)
             data = response.json()
             
             return {
@@ -73,31 +79,92 @@ class SchedulerClient:
             }
     
     @staticmethod
-    def cancel_job(job_id, user):
+    def schedule_posts_bulk(jobs, user=None):
+        """
+        Schedule many posts via Node.js scheduler in a single request.
+        
+        Args:
+            jobs: list of payload dicts (same shape as schedule_post, plus
+                  scheduled_post_id used to correlate results)
+            user: User object, or None to authenticate with the service token only
+        
+        Returns:
+            dict with success and results (one entry per job, in order)
+        """
+        headers = SchedulerClient._get_headers(user)
+        
+        try:
+            response = get_transport().request(
+                'POST', '/api/v1/schedule/bulk', json={'jobs': jobs}, headers=headers, timeout=30
+            )
+            return {'success': True, 'results': response.json().get('results', [])}
+        
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Scheduler bulk request error: {e}")
+            return {'success': False, 'error': str(e)}
+    
+    @staticmethod
+    def cancel_job(job_id, user=None):
         """Cancel a scheduled job."""
-        url = f"{SchedulerClient.BASE_URL}/api/v1/schedule/{job_id}"
         headers = SchedulerClient._get_headers(user)
         
         try:
-            response = requests.delete(url, headers=headers, timeout=10)
-            response.raise_for_status()
+            get_transport().request('DELETE', f'/api/v1/schedule/{job_id}', headers=headers)
             return {'success': True}
         
         except requests.exceptions.RequestException as e:
             logger.error(f"Job cancellation error: {e}")
-            return {'success': False, 'error': str(e)}
+            return {
+                'success': False,
+                'error': str(e),
+                'status_code': getattr(e.response, 'status_code', None)
+            }
     
     @staticmethod
-    def get_job_status(job_id, user):
+    def update_job(job_id, data, user=None):
+        """Replace the content snapshot of a job that has not run yet."""
+        headers = SchedulerClient._get_headers(user)
+        
+        try:
+            get_transport().request('PUT', f'/api/v1/schedule/{job_id}', json=data, headers=headers)
+            return {'success': True}
+        
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Job update error: {e}")
+            return {
+                'success': False,
+                'error': str(e),
+                'status_code': getattr(e.response, 'status_code', None)
+            }
+    
+    @staticmethod
+    def get_job_status(job_id, user=None):
         """Get status of a scheduled job."""
-        url = f"{SchedulerClient.BASE_URL}/api/v1/schedule/{job_id}"
         headers = SchedulerClient._get_headers(user)
         
         try:
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
+            response = get_transport().request('GET', f'/api/v1/schedule/{job_id}', headers=headers)
             return {'success': True, 'data': response.json()}
         
         except requests.exceptions.RequestException as e:
             logger.error(f"Job status fetch error: {e}")
-            return {'success': False, 'error': str(e)}
+            return {
+                'success': False,
+                'error': str(e),
+                'status_code': getattr(e.response, 'status_code', None)
+            }
+
+
+class AsyncSchedulerClient:
+    """
+    Async variant of SchedulerClient for async views.
+    
+    Calls run on a worker thread and share the same pooled transport,
+    circuit breaker and token cache as the sync client.
+    """
+    
+    schedule_post = staticmethod(sync_to_async(SchedulerClient.schedule_post, thread_sensitive=False))
+    schedule_posts_bulk = staticmethod(sync_to_async(SchedulerClient.schedule_posts_bulk, thread_sensitive=False))
+    cancel_job = staticmethod(sync_to_async(SchedulerClient.cancel_job, thread_sensitive=False))
+    update_job = staticmethod(sync_to_async(SchedulerClient.update_job, thread_sensitive=False))
+    get_job_status = staticmethod(sync_to_async(SchedulerClient.get_job_status, thread_sensitive=False))
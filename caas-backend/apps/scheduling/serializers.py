@@ -1,18 +1,31 @@
 """Serializers for scheduling."""
+import zoneinfo
+from datetime import timedelta
+
 from rest_framework import serializers
-from .models import ScheduledPost
+from .models import ScheduledPost, RecurringSchedule
+from .recurrence import build_rule
+from apps.content.models import Content
+from apps.organizations.access import get_access
 
 
 class ScheduledPostSerializer(serializers.ModelSerializer):
-    """Serializer for scheduled posts."""
+    """
+    Serializer for scheduled posts. Posts are created through the schedule
+    actions; updates may only move scheduled_at (and pass a platform token
+    when the post has to be handed to the scheduler again).
+    """
+    platform_access_token = serializers.CharField(write_only=True, required=False, allow_blank=True)
     
     class Meta:
         model = ScheduledPost
         fields = ['id', 'content', 'organization', 'created_by', 'platform',
                   'scheduled_at', 'status', 'job_id', 'platform_post_id',
-                  'published_at', 'error_message', 'created_at']
-        read_only_fields = ['id', 'created_by', 'status', 'job_id', 
-                           'platform_post_id', 'published_at', 'created_at']
+                  'published_at', 'error_message', 'content_version',
+                  'content_hash', 'created_at', 'platform_access_token']
+        read_only_fields = ['id', 'content', 'organization', 'created_by', 'platform',
+                           'status', 'job_id', 'platform_post_id', 'published_at',
+                           'error_message', 'content_version', 'content_hash', 'created_at']
 
 
 class SchedulePostRequestSerializer(serializers.Serializer):
@@ -20,3 +33,132 @@ class SchedulePostRequestSerializer(serializers.Serializer):
     content_id = serializers.UUIDField()
     scheduled_at = serializers.DateTimeField()
     platform_access_token = serializers.CharField(required=False, allow_blank=True)
+    # Off keeps the exact requested time even when its bucket is full
+    allow_slot_shift = serializers.BooleanField(default=True)
+
+
+class BulkSchedulePostRequestSerializer(serializers.Serializer):
+    """Serializer for bulk scheduling requests."""
+    MAX_POSTS = 500
+    
+    posts = SchedulePostRequestSerializer(many=True, allow_empty=False)
+    
+    def validate_posts(self, value):
+        if len(value) > self.MAX_POSTS:
+            raise serializers.ValidationError(f"At most {self.MAX_POSTS} posts per request.")
+        return value
+
+
+class SchedulerCallbackSerializer(serializers.Serializer):
+    """Serializer for a job status update sent by the Node.js scheduler."""
+    job_id = serializers.CharField(max_length=255)
+    content_id = serializers.UUIDField(required=False)
+    status = serializers.ChoiceField(choices=['scheduled', 'published', 'failed'])
+    platform_post_id = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    error = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    published_at = serializers.DateTimeField(required=False, allow_null=True)
+
+
+class SchedulerCallbackBatchSerializer(serializers.Serializer):
+    """Serializer for batched job status updates."""
+    MAX_UPDATES = 1000
+    
+    updates = SchedulerCallbackSerializer(many=True, allow_empty=False)
+    
+    def validate_updates(self, value):
+        if len(value) > self.MAX_UPDATES:
+            raise serializers.ValidationError(f"At most {self.MAX_UPDATES} updates per request.")
+        return value
+
+
+class CalendarPostSerializer(serializers.ModelSerializer):
+    """Compact scheduled post representation for calendar buckets."""
+    
+    class Meta:
+        model = ScheduledPost
+        fields = ['id', 'content', 'platform', 'scheduled_at', 'status']
+
+
+class CalendarQuerySerializer(serializers.Serializer):
+    """Query parameters for the scheduling calendar."""
+    MAX_RANGE = {
+        'day': timedelta(days=92),
+        'hour': timedelta(days=14),
+    }
+    DATETIME_FORMATS = ['iso-8601', '%Y-%m-%d']
+    
+    organization = serializers.UUIDField()
+    from_ = serializers.DateTimeField(input_formats=DATETIME_FORMATS)
+    to = serializers.DateTimeField(input_formats=DATETIME_FORMATS)
+    bucket = serializers.ChoiceField(choices=['day', 'hour'], default='day')
+    tz = serializers.CharField(required=False)
+    platform = serializers.ChoiceField(choices=Content.PLATFORM_CHOICES, required=False)
+    workspace = serializers.UUIDField(required=False)
+    status = serializers.ChoiceField(choices=ScheduledPost.STATUS_CHOICES, required=False)
+    posts_per_bucket = serializers.IntegerField(min_value=0, max_value=100, default=20)
+    
+    def get_fields(self):
+        # "from" is a Python keyword, so the field is declared as from_
+        fields = super().get_fields()
+        fields['from'] = fields.pop('from_')
+        return fields
+    
+    def validate_tz(self, value):
+        try:
+            return zoneinfo.ZoneInfo(value)
+        except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+            raise serializers.ValidationError(f"Unknown time zone: {value}")
+    
+    def validate(self, attrs):
+        if attrs['to'] <= attrs['from']:
+            raise serializers.ValidationError({'to': "Must be after 'from'."})
+        max_range = self.MAX_RANGE[attrs['bucket']]
+        if attrs['to'] - attrs['from'] > max_range:
+            raise serializers.ValidationError(
+                f"Range too large for {attrs['bucket']} buckets (max {max_range.days} days)."
+            )
+        return attrs
+
+
+class SlotSuggestionQuerySerializer(serializers.Serializer):
+    """Query parameters for publish slot suggestions."""
+    organization = serializers.UUIDField()
+    platform = serializers.ChoiceField(choices=Content.PLATFORM_CHOICES)
+    scheduled_at = serializers.DateTimeField()
+    count = serializers.IntegerField(min_value=1, max_value=20, default=5)
+
+
+class RecurringScheduleSerializer(serializers.ModelSerializer):
+    """Serializer for recurring schedules."""
+    
+    class Meta:
+        model = RecurringSchedule
+        fields = ['id', 'content', 'organization', 'platform', 'rrule', 'dtstart',
+                  'timezone', 'until', 'is_active', 'expanded_until', 'created_by',
+                  'created_at', 'updated_at']
+        read_only_fields = ['id', 'organization', 'platform', 'expanded_until',
+                            'created_by', 'created_at', 'updated_at']
+    
+    def get_fields(self):
+        # Only content from organizations the user can schedule in can recur
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if request is not None:
+            fields['content'].queryset = Content.objects.filter(
+                organization_id__in=get_access(request).org_ids('schedule.create')
+            )
+        return fields
+    
+    def validate(self, attrs):
+        rule = attrs.get('rrule', getattr(self.instance, 'rrule', None))
+        dtstart = attrs.get('dtstart', getattr(self.instance, 'dtstart', None))
+        tz_name = attrs.get('timezone', getattr(self.instance, 'timezone', 'UTC'))
+        try:
+            build_rule(rule, dtstart, tz_name)
+        except ValueError as e:
+            raise serializers.ValidationError({'rrule': str(e)})
+        
+        until = attrs.get('until', getattr(self.instance, 'until', None))
+        if until is not None and until <= dtstart:
+            raise serializers.ValidationError({'until': "Must be after 'dtstart'."})
+        return attrs
@@ -0,0 +1,58 @@
+"""
+Signal handlers for scheduling app.
+"""
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.content.models import Content
+from .models import ScheduledPost, ScheduleOutbox
+from .cache import bump_schedule_versions
+from .snapshots import SNAPSHOT_FIELDS, apply_snapshot, compute_content_hash
+
+
+@receiver(post_save, sender=ScheduledPost)
+@receiver(post_delete, sender=ScheduledPost)
+def invalidate_schedule_cache(sender, instance, **kwargs):
+    """
+    Bump the organization's schedule version on any single-row change.
+    Bulk operations bypass signals and bump explicitly.
+    """
+    bump_schedule_versions([instance.organization_id])
+
+
+@receiver(post_save, sender=Content)
+def resync_content_snapshots(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Refresh the snapshot on pending posts when their content is edited and
+    queue a resync so already-created jobs publish the new text.
+    """
+    if created:
+        return
+    if update_fields is not None and not {'generated_text', 'platform', 'version'} & set(update_fields):
+        return
+    
+    content_hash = compute_content_hash(instance.platform, instance.generated_text)
+    posts = list(
+        ScheduledPost.objects
+        .filter(
+            content_id=instance.id,
+            status__in=['queued', 'scheduled'],
+            scheduled_at__gt=timezone.now()
+        )
+        .exclude(content_hash=content_hash)
+        .only('id', 'organization_id', 'job_id', *SNAPSHOT_FIELDS)
+    )
+    if not posts:
+        return
+    
+    with transaction.atomic():
+        for post in posts:
+            apply_snapshot(post, instance)
+        ScheduledPost.objects.bulk_update(posts, SNAPSHOT_FIELDS)
+        ScheduleOutbox.objects.bulk_create([
+            ScheduleOutbox(scheduled_post=post, operation='resync')
+            for post in posts if post.job_id
+        ])
+    bump_schedule_versions({post.organization_id for post in posts})
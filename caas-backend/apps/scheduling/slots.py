@@ -0,0 +1,172 @@
+"""
+Rate-limit-aware publish slot allocation.
+
+Publish times are grouped into one-minute buckets per platform. Each bucket
+has an occupancy counter across all organizations and one per organization,
+kept in the cache and seeded from the database on a miss. Posts are placed
+in the nearest bucket under both platform limits and spread over a jitter
+window inside it, so posts scheduled for the same minute do not all fire in
+the same second.
+"""
+import random
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import ScheduledPost
+
+ACTIVE_STATUSES = ['queued', 'scheduled']
+BUCKET = timedelta(minutes=1)
+
+PLATFORM_KEY = 'scheduling:slots:{platform}:{bucket}'
+ACCOUNT_KEY = 'scheduling:slots:{platform}:{org_id}:{bucket}'
+
+# Counters only need to outlive in-flight requests; they are re-seeded from
+# the database once expired, so drift from lost releases is bounded.
+COUNTER_TTL = 15 * 60
+
+
+def bucket_start(value):
+    """Start of the one-minute bucket containing `value`."""
+    return value.replace(second=0, microsecond=0)
+
+
+class SlotAllocator:
+    """Finds and reserves publish slots under per-platform rate limits."""
+    
+    def __init__(self, rate_limits=None, jitter_seconds=None, search_minutes=None):
+        self.rate_limits = rate_limits or settings.SCHEDULING_PLATFORM_RATE_LIMITS
+        self.jitter_seconds = (
+            settings.SCHEDULING_SLOT_JITTER_SECONDS if jitter_seconds is None else jitter_seconds
+        )
+        self.search_minutes = search_minutes or settings.SCHEDULING_SLOT_SEARCH_MINUTES
+    
+    def _limits(self, platform):
+        limits = self.rate_limits.get(platform, {})
+        return limits.get('per_minute'), limits.get('per_account_per_minute')
+    
+    def _keys(self, platform, org_id, bucket):
+        stamp = int(bucket.timestamp())
+        return (
+            PLATFORM_KEY.format(platform=platform, bucket=stamp),
+            ACCOUNT_KEY.format(platform=platform, org_id=org_id, bucket=stamp),
+        )
+    
+    def _seed(self, key, platform, bucket, org_id=None):
+        """Load a bucket's occupancy from the database if it is not cached."""
+        queryset = ScheduledPost.objects.filter(
+            platform=platform,
+            status__in=ACTIVE_STATUSES,
+            scheduled_at__gte=bucket,
+            scheduled_at__lt=bucket + BUCKET
+        )
+        if org_id is not None:
+            queryset = queryset.filter(organization_id=org_id)
+        cache.add(key, queryset.count(), timeout=COUNTER_TTL)
+    
+    def _occupancy(self, platform, org_id, bucket):
+        platform_key, account_key = self._keys(platform, org_id, bucket)
+        counts = cache.get_many([platform_key, account_key])
+        if platform_key not in counts:
+            self._seed(platform_key, platform, bucket)
+        if account_key not in counts:
+            self._seed(account_key, platform, bucket, org_id)
+        if len(counts) < 2:
+            counts = cache.get_many([platform_key, account_key])
+        return counts.get(platform_key, 0), counts.get(account_key, 0)
+    
+    def _incr(self, key, delta, seed):
+        try:
+            return cache.incr(key, delta)
+        except ValueError:
+            # Expired between read and write
+            seed()
+            return cache.incr(key, delta)
+    
+    def _try_reserve(self, platform, org_id, bucket, force=False):
+        """Atomically take one unit in both counters, backing out if over a limit."""
+        platform_limit, account_limit = self._limits(platform)
+        platform_key, account_key = self._keys(platform, org_id, bucket)
+        self._occupancy(platform, org_id, bucket)
+        
+        platform_count = self._incr(
+            platform_key, 1, lambda: self._seed(platform_key, platform, bucket)
+        )
+        account_count = self._incr(
+            account_key, 1, lambda: self._seed(account_key, platform, bucket, org_id)
+        )
+        if force or (
+            (platform_limit is None or platform_count <= platform_limit)
+            and (account_limit is None or account_count <= account_limit)
+        ):
+            return True
+        
+        cache.decr(platform_key)
+        cache.decr(account_key)
+        return False
+    
+    def _place(self, desired, bucket):
+        """Jittered time inside `bucket`, never earlier than `desired`."""
+        start = max(desired, bucket)
+        remaining = (bucket + BUCKET - start).total_seconds()
+        offset = random.uniform(0, max(0.0, min(self.jitter_seconds, remaining - 1)))
+        return (start + timedelta(seconds=offset)).replace(microsecond=0)
+    
+    def _buckets(self, desired):
+        first = bucket_start(desired)
+        return (first + BUCKET * i for i in range(self.search_minutes + 1))
+    
+    def assign(self, platform, org_id, desired, allow_shift=True):
+        """
+        Reserve a slot for one post and return its publish time.
+        
+        With `allow_shift` the post moves to the nearest bucket with room and
+        is jittered inside it. Otherwise the requested time is kept and only
+        counted, even if its bucket is already full.
+        """
+        if not allow_shift:
+            self._try_reserve(platform, org_id, bucket_start(desired), force=True)
+            return desired
+        
+        for bucket in self._buckets(desired):
+            if self._try_reserve(platform, org_id, bucket):
+                return self._place(desired, bucket)
+        
+        # Nothing free within the search window; keep the requested minute
+        self._try_reserve(platform, org_id, bucket_start(desired), force=True)
+        return self._place(desired, bucket_start(desired))
+    
+    def suggest(self, platform, org_id, desired, count=5):
+        """
+        Nearest free slots at or after `desired`, without reserving them.
+        
+        Returns:
+            list of dicts with scheduled_at, platform_load and account_load
+        """
+        platform_limit, account_limit = self._limits(platform)
+        suggestions = []
+        for bucket in self._buckets(desired):
+            platform_count, account_count = self._occupancy(platform, org_id, bucket)
+            if platform_limit is not None and platform_count >= platform_limit:
+                continue
+            if account_limit is not None and account_count >= account_limit:
+                continue
+            suggestions.append({
+                'scheduled_at': self._place(desired, bucket),
+                'platform_load': platform_count,
+                'account_load': account_count,
+            })
+            if len(suggestions) >= count:
+                break
+        return suggestions
+    
+    def release(self, platform, org_id, scheduled_at):
+        """Give back the slot held by a canceled post."""
+        for key in self._keys(platform, org_id, bucket_start(scheduled_at)):
+            try:
+                if cache.decr(key) < 0:
+                    cache.delete(key)
+            except ValueError:
+                # Not cached; the next read re-seeds from the database
+                pass
@@ -0,0 +1,31 @@
+"""
+Immutable content snapshots shipped to the scheduler with each job.
+
+The scheduler publishes exactly the text captured here, so it never has to
+call back into Django at publish time.
+"""
+import hashlib
+
+SNAPSHOT_FIELDS = ['content_text', 'content_version', 'content_hash']
+
+
+def compute_content_hash(platform, text):
+    """SHA-256 over platform and text, used to detect edits."""
+    return hashlib.sha256(f"{platform}\n{text}".encode('utf-8')).hexdigest()
+
+
+def apply_snapshot(scheduled_post, content):
+    """Copy the current content state onto a scheduled post."""
+    scheduled_post.content_text = content.generated_text
+    scheduled_post.content_version = content.version
+    scheduled_post.content_hash = compute_content_hash(content.platform, content.generated_text)
+    return scheduled_post
+
+
+def snapshot_payload(scheduled_post):
+    """Snapshot fields as sent to the scheduler."""
+    return {
+        'content_text': scheduled_post.content_text,
+        'content_version': scheduled_post.content_version,
+        'content_hash': scheduled_post.content_hash,
+    }
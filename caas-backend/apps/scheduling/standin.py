@@ -0,0 +1,354 @@
+"""
+In-process stand-in for the Node.js scheduler service.
+
+Implements the scheduler's HTTP contract (create, bulk create, get, update,
+cancel) with jobs held in memory, and fires status callbacks to Django when
+jobs come due. Latency and failures can be injected, so SchedulerClient, the
+outbox dispatcher and the callback endpoints can be exercised and benchmarked
+on one machine without Redis/BullMQ. Not for production use.
+"""
+import heapq
+import json
+import logging
+import queue
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+JOB_PATH = re.compile(r'^/api/v1/schedule/(?P<job_id>[^/]+)/?$')
+PENDING_STATES = ('waiting', 'delayed')
+CALLBACK_RETRIES = 3
+
+
+class StandinScheduler:
+    """In-memory job store, due-time runner and callback sender."""
+    
+    def __init__(self, django_url, service_token, time_scale=1.0,
+                 publish_failure_rate=0.0, batch_callbacks=False,
+                 callback_batch_size=100, callback_flush_interval=0.05):
+        self.django_url = django_url.rstrip('/')
+        self.service_token = service_token
+        self.time_scale = time_scale
+        self.publish_failure_rate = publish_failure_rate
+        self.batch_callbacks = batch_callbacks
+        self.callback_batch_size = callback_batch_size
+        self.callback_flush_interval = callback_flush_interval
+        
+        self.jobs = {}
+        self._due = []
+        self._due_at = {}
+        self._lock = threading.Condition()
+        self._callbacks = queue.Queue()
+        self._session = requests.Session()
+        self._stopped = threading.Event()
+        self.stats = {
+            'created': 0, 'canceled': 0, 'updated': 0, 'published': 0, 'failed': 0,
+            'callbacks_sent': 0, 'callback_errors': 0,
+        }
+    
+    def start(self):
+        threading.Thread(target=self._run_due_jobs, daemon=True).start()
+        threading.Thread(target=self._send_callbacks, daemon=True).start()
+    
+    def stop(self):
+        self._stopped.set()
+        with self._lock:
+            self._lock.notify_all()
+    
+    # Job store
+    
+    def add(self, data):
+        """Add a job, or return the existing one with the same id (like BullMQ)."""
+        scheduled_ms = int(datetime.fromisoformat(
+            data['scheduled_at'].replace('Z', '+00:00')
+        ).timestamp() * 1000)
+        job_id = data.get('job_key') or data.get('scheduled_post_id') or f"{data['content_id']}-{scheduled_ms}"
+        now = time.time()
+        delay = max(0.0, scheduled_ms / 1000 - now) * self.time_scale
+        
+        with self._lock:
+            if job_id in self.jobs:
+                return self.jobs[job_id]
+            job = {
+                'job_id': job_id,
+                'status': 'delayed' if delay > 0 else 'waiting',
+                'progress': 0,
+                'data': data,
+                'created_at': int(now * 1000),
+                'processed_on': None,
+                'finished_on': None,
+                'return_value': None,
+            }
+            self.jobs[job_id] = job
+            self._due_at[job_id] = now + delay
+            heapq.heappush(self._due, (now + delay, job_id))
+            self.stats['created'] += 1
+            self._lock.notify()
+        return job
+    
+    def get(self, job_id):
+        with self._lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job else None
+    
+    def update(self, job_id, snapshot):
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return 404, {'error': 'Job not found'}
+            if job['status'] not in PENDING_STATES:
+                return 409, {'error': f"Cannot update job in state: {job['status']}",
+                             'current_state': job['status']}
+            job['data'] = {**job['data'], **{
+                key: snapshot.get(key) for key in ('content_text', 'content_version', 'content_hash')
+            }}
+            self.stats['updated'] += 1
+        return 200, {'message': 'Job updated successfully', 'job_id': job_id,
+                     'content_version': snapshot.get('content_version')}
+    
+    def cancel(self, job_id):
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return 404, {'error': 'Job not found'}
+            if job['status'] not in PENDING_STATES:
+                return 400, {'error': f"Cannot cancel job in state: {job['status']}",
+                             'current_state': job['status']}
+            # Its heap entry is skipped by the runner
+            del self.jobs[job_id]
+            del self._due_at[job_id]
+            self.stats['canceled'] += 1
+        return 200, {'message': 'Job canceled successfully', 'job_id': job_id}
+    
+    def health(self):
+        with self._lock:
+            counts = {}
+            for job in self.jobs.values():
+                counts[job['status']] = counts.get(job['status'], 0) + 1
+            return {'status': 'healthy', 'service': 'scheduler-standin',
+                    'queue': counts, 'stats': dict(self.stats),
+                    'timestamp': datetime.now(timezone.utc).isoformat()}
+    
+    # Runner
+    
+    def _run_due_jobs(self):
+        while not self._stopped.is_set():
+            with self._lock:
+                while not self._stopped.is_set():
+                    wait = self._due[0][0] - time.time() if self._due else None
+                    if wait is not None and wait <= 0:
+                        break
+                    self._lock.wait(timeout=wait)
+                if self._stopped.is_set():
+                    return
+                due, job_id = heapq.heappop(self._due)
+                job = self.jobs.get(job_id)
+                # Skip heap entries left behind by canceled (or re-added) jobs
+                if job is None or job['status'] not in PENDING_STATES or self._due_at.get(job_id) != due:
+                    continue
+                del self._due_at[job_id]
+                job['status'] = 'active'
+                job['processed_on'] = int(time.time() * 1000)
+            self._publish(job)
+    
+    def _publish(self, job):
+        now = datetime.now(timezone.utc)
+        if not job['data'].get('content_text'):
+            result = {'success': False, 'error': 'Job has no content snapshot'}
+        elif random.random() < self.publish_failure_rate:
+            result = {'success': False, 'error': 'Injected publish failure'}
+        else:
+            result = {'success': True, 'platform_post_id': f"standin-{job['job_id']}",
+                      'published_at': now.isoformat()}
+        
+        with self._lock:
+            job['status'] = 'completed'
+            job['progress'] = 100
+            job['finished_on'] = int(time.time() * 1000)
+            job['return_value'] = result
+            self.stats['published' if result['success'] else 'failed'] += 1
+        
+        self._callbacks.put(({
+            'job_id': job['job_id'],
+            'content_id': job['data'].get('content_id'),
+            'status': 'published' if result['success'] else 'failed',
+            'platform_post_id': result.get('platform_post_id'),
+            'error': result.get('error'),
+            'published_at': result.get('published_at'),
+        }, 0))
+    
+    # Callbacks
+    
+    def _send_callbacks(self):
+        while not self._stopped.is_set():
+            try:
+                items = [self._callbacks.get(timeout=0.5)]
+            except queue.Empty:
+                continue
+            
+            if not self.batch_callbacks:
+                self._post('/api/v1/scheduling/callback/', items[0][0], items)
+                continue
+            
+            deadline = time.monotonic() + self.callback_flush_interval
+            while len(items) < self.callback_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    items.append(self._callbacks.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._post('/api/v1/scheduling/callback/batch/', {'updates': [update for update, _ in items]}, items)
+    
+    def _post(self, path, payload, items):
+        """Send one callback request, retrying updates Django could not match yet."""
+        headers = {'Content-Type': 'application/json', 'X-Service-Token': self.service_token}
+        try:
+            response = self._session.post(f"{self.django_url}{path}", json=payload, headers=headers, timeout=10)
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            # A job due immediately can finish before Django has recorded its job_id (404)
+            logger.warning(f"Stand-in callback failed: {e}")
+            self.stats['callback_errors'] += 1
+            self._retry(items)
+            return
+        
+        not_found = set(response.json().get('not_found', [])) if 'updates' in payload else set()
+        self.stats['callbacks_sent'] += len(items) - len(not_found)
+        self._retry([item for item in items if item[0]['job_id'] in not_found])
+    
+    def _retry(self, items):
+        for update, attempt in items:
+            if attempt < CALLBACK_RETRIES:
+                timer = threading.Timer(0.5 * 2 ** attempt, self._callbacks.put, [(update, attempt + 1)])
+                timer.daemon = True
+                timer.start()
+
+
+def make_handler(scheduler, service_token, latency_ms=0, latency_jitter_ms=0, error_rate=0.0):
+    """Build a request handler bound to `scheduler` with the injected faults."""
+    
+    class StandinHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+        
+        def _respond(self, status_code, body):
+            payload = json.dumps(body).encode()
+            self.send_response(status_code)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        
+        def _body(self):
+            return json.loads(self.raw_body or b'{}')
+        
+        def _prepare(self):
+            """Apply injected latency/errors and auth; False if already answered."""
+            # Always consume the body: on a kept-alive connection an unread
+            # body would be parsed as the next request
+            length = int(self.headers.get('Content-Length') or 0)
+            self.raw_body = self.rfile.read(length) if length else b''
+            if latency_ms or latency_jitter_ms:
+                time.sleep(max(0, latency_ms + random.uniform(-latency_jitter_ms, latency_jitter_ms)) / 1000)
+            if self.path.rstrip('/') == '/api/v1/health':
+                return True
+            if random.random() < error_rate:
+                self._respond(503, {'error': 'Injected failure'})
+                return False
+            # JWTs are not verified; any bearer token or the service token is accepted
+            if (self.headers.get('X-Service-Token') != service_token
+                    and not (self.headers.get('Authorization') or '').startswith('Bearer ')):
+                self._respond(401, {'error': 'Missing or invalid authorization header'})
+                return False
+            return True
+        
+        def do_GET(self):
+            if not self._prepare():
+                return
+            if self.path.rstrip('/') == '/api/v1/health':
+                return self._respond(200, scheduler.health())
+            match = JOB_PATH.match(self.path)
+            job = scheduler.get(match['job_id']) if match else None
+            if job is None:
+                return self._respond(404, {'error': 'Job not found'})
+            self._respond(200, job)
+        
+        def do_POST(self):
+            if not self._prepare():
+                return
+            try:
+                body = self._body()
+            except ValueError:
+                return self._respond(400, {'error': 'Invalid JSON'})
+            
+            path = self.path.rstrip('/')
+            if path == '/api/v1/schedule':
+                if not all(body.get(key) for key in ('content_id', 'platform', 'scheduled_at')):
+                    return self._respond(400, {'error': 'Missing required fields'})
+                try:
+                    job = scheduler.add(body)
+                except ValueError:
+                    return self._respond(400, {'error': 'Invalid scheduled_at'})
+                return self._respond(201, {'job_id': job['job_id'], 'status': 'scheduled',
+                                           'scheduled_at': body['scheduled_at']})
+            
+            if path == '/api/v1/schedule/bulk':
+                jobs = body.get('jobs')
+                if not isinstance(jobs, list) or not jobs:
+                    return self._respond(400, {'error': 'jobs must be a non-empty array'})
+                results = []
+                for data in jobs:
+                    try:
+                        if not all(data.get(key) for key in ('content_id', 'platform')):
+                            raise ValueError('Missing required fields')
+                        job = scheduler.add(data)
+                    except (ValueError, KeyError, TypeError, AttributeError):
+                        results.append({'scheduled_post_id': (data or {}).get('scheduled_post_id'),
+                                        'status': 'failed', 'error': 'Missing required fields'})
+                        continue
+                    results.append({'scheduled_post_id': data.get('scheduled_post_id'),
+                                    'job_id': job['job_id'], 'status': 'scheduled'})
+                return self._respond(201, {'results': results})
+            
+            self._respond(404, {'error': 'Not found'})
+        
+        def do_PUT(self):
+            if not self._prepare():
+                return
+            match = JOB_PATH.match(self.path)
+            if not match:
+                return self._respond(404, {'error': 'Not found'})
+            try:
+                body = self._body()
+            except ValueError:
+                return self._respond(400, {'error': 'Invalid JSON'})
+            if not isinstance(body.get('content_text'), str):
+                return self._respond(400, {'error': 'content_text is required'})
+            self._respond(*scheduler.update(match['job_id'], body))
+        
+        def do_DELETE(self):
+            if not self._prepare():
+                return
+            match = JOB_PATH.match(self.path)
+            if not match:
+                return self._respond(404, {'error': 'Not found'})
+            self._respond(*scheduler.cancel(match['job_id']))
+    
+    return StandinHandler
+
+
+def make_server(host, port, scheduler, service_token, **faults):
+    server = ThreadingHTTPServer((host, port), make_handler(scheduler, service_token, **faults))
+    server.daemon_threads = True
+    return server
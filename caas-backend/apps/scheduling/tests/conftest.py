@@ -0,0 +1,29 @@
+"""
+Fixtures shared by the scheduling tests.
+"""
+import uuid
+
+import pytest
+from django.contrib.auth import get_user_model
+
+from apps.content.models import Content
+from apps.organizations.models import Organization, OrganizationMember
+
+User = get_user_model()
+
+
+@pytest.fixture
+def owner_client(api_client):
+    """A client for the owner of a new free-plan organization, and a piece of its content."""
+    suffix = uuid.uuid4().hex[:12]
+    user = User.objects.create_user(
+        email=f"{suffix}@example.com", username=suffix, password='x', first_name='Test', last_name='User'
+    )
+    organization = Organization.objects.create(name=f"Org {suffix}", owner=user)
+    OrganizationMember.objects.create(organization=organization, user=user, role='owner')
+    content = Content.objects.create(
+        organization=organization, created_by=user, platform='twitter',
+        prompt='prompt', generated_text='text', tone='casual'
+    )
+    api_client.force_authenticate(user)
+    return api_client, content
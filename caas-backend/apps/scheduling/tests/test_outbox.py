@@ -0,0 +1,102 @@
+"""
+Outbox delivery of rescheduled posts, against the in-process scheduler stand-in.
+"""
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from apps.scheduling.models import ScheduledPost, ScheduleOutbox
+from apps.scheduling.outbox import OutboxDispatcher
+from apps.scheduling.scheduler_client import SchedulerClient
+from apps.scheduling.standin import StandinScheduler
+
+
+
+@pytest.fixture
+def standin(monkeypatch):
+    """Scheduler stand-in wired into SchedulerClient, with jobs never run."""
+    scheduler = StandinScheduler('http://django.invalid', 'token')
+    
+    def schedule_posts_bulk(jobs, user=None):
+        return {'success': True, 'results': [
+            {'scheduled_post_id': job['scheduled_post_id'], 'job_id': scheduler.add(job)['job_id'],
+             'status': 'scheduled'}
+            for job in jobs
+        ]}
+    
+    def cancel_job(job_id, user=None):
+        status_code, body = scheduler.cancel(job_id)
+        if status_code == 200:
+            return {'success': True}
+        return {'success': False, 'status_code': status_code, 'error': body['error']}
+    
+    monkeypatch.setattr(SchedulerClient, 'schedule_posts_bulk', staticmethod(schedule_posts_bulk))
+    monkeypatch.setattr(SchedulerClient, 'cancel_job', staticmethod(cancel_job))
+    return scheduler
+
+
+def schedule(client, content, minutes):
+    response = client.post('/api/v1/scheduling/schedule/', {
+        'content_id': str(content.id),
+        'scheduled_at': (timezone.now() + timedelta(minutes=minutes)).isoformat(),
+        'allow_slot_shift': False,
+    }, format='json')
+    assert response.status_code == 202
+    return ScheduledPost.objects.get(id=response.data['id'])
+
+
+def reschedule(client, post, minutes):
+    response = client.patch(f"/api/v1/scheduling/{post.id}/", {
+        'scheduled_at': (timezone.now() + timedelta(minutes=minutes)).isoformat(),
+    }, format='json')
+    assert response.status_code == 200
+    post.refresh_from_db()
+    return post
+
+
+def drain(dispatcher):
+    while dispatcher.dispatch_once()['claimed']:
+        pass
+
+
+def assert_single_job_for(standin, post):
+    assert list(standin.jobs) == [post.job_id]
+    job = standin.jobs[post.job_id]
+    assert job['data']['scheduled_at'] == post.scheduled_at.isoformat()
+    assert post.status == 'scheduled'
+
+
+@pytest.mark.django_db
+def test_reschedule_of_dispatched_post_replaces_its_job(standin, owner_client):
+    client, content = owner_client
+    dispatcher = OutboxDispatcher()
+    post = schedule(client, content, minutes=5)
+    drain(dispatcher)
+    post.refresh_from_db()
+    old_job_id = post.job_id
+    
+    # Still inside the dispatch window, so cancel and schedule share a batch
+    post = reschedule(client, post, minutes=10)
+    drain(dispatcher)
+    post.refresh_from_db()
+    
+    assert post.job_id != old_job_id
+    assert_single_job_for(standin, post)
+
+
+@pytest.mark.django_db
+def test_reschedule_while_schedule_is_in_flight(standin, owner_client):
+    client, content = owner_client
+    dispatcher = OutboxDispatcher()
+    post = schedule(client, content, minutes=5)
+    
+    # The dispatcher has claimed the entry but not recorded the outcome yet
+    entries = dispatcher.claim_batch()
+    post = reschedule(client, post, minutes=10)
+    dispatcher._record_outcomes(entries, dispatcher._send_schedules(entries))
+    drain(dispatcher)
+    post.refresh_from_db()
+    
+    assert_single_job_for(standin, post)
+    assert not ScheduleOutbox.objects.filter(status='pending').exists()
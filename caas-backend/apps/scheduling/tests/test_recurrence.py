@@ -0,0 +1,83 @@
+"""
+Recurring schedule expansion against the scheduled-post quota.
+"""
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.scheduling import quotas
+from apps.scheduling.models import RecurringSchedule, ScheduledPost
+from apps.scheduling.recurrence import RecurrenceExpander
+
+# The free plan's scheduled_posts limit
+FREE_LIMIT = 5
+
+
+@pytest.fixture
+def hourly_schedule(owner_client):
+    client, content = owner_client
+    schedule = RecurringSchedule.objects.create(
+        organization_id=content.organization_id, content=content, created_by=content.created_by,
+        platform=content.platform, rrule='FREQ=HOURLY',
+        dtstart=timezone.now().replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    )
+    return client, schedule
+
+
+def occurrence_times(schedule):
+    return list(
+        ScheduledPost.objects.filter(recurring_schedule=schedule)
+        .exclude(status='canceled').order_by('scheduled_at').values_list('scheduled_at', flat=True)
+    )
+
+
+def quota_used(schedule):
+    _, period_start, _ = quotas.get_quota(schedule.organization_id)
+    return cache.get(quotas._key(schedule.organization_id, period_start))
+
+
+@pytest.mark.django_db
+def test_occurrences_skipped_for_quota_are_expanded_later(hourly_schedule, django_capture_on_commit_callbacks):
+    client, schedule = hourly_schedule
+    expander = RecurrenceExpander(horizon_hours=24)
+    
+    expander.expand(schedule)
+    first = occurrence_times(schedule)
+    schedule.refresh_from_db()
+    assert len(first) == FREE_LIMIT
+    assert schedule.expanded_until == first[-1]
+    assert schedule.is_active
+    
+    # Free two units of quota, then expand again
+    for post in ScheduledPost.objects.filter(scheduled_at__in=first[:2]):
+        with django_capture_on_commit_callbacks(execute=True):
+            assert client.post(f"/api/v1/scheduling/{post.id}/cancel/").status_code == 200
+    expander.expand(schedule)
+    
+    assert occurrence_times(schedule) == first[2:] + [first[-1] + timedelta(hours=i) for i in (1, 2)]
+
+
+@pytest.mark.django_db
+def test_run_visits_schedules_held_back_by_quota_once(hourly_schedule):
+    client, schedule = hourly_schedule
+    
+    totals = RecurrenceExpander(horizon_hours=24, batch_size=1).run()
+    
+    assert totals == {'schedules': 1, 'posts': FREE_LIMIT}
+
+
+@pytest.mark.django_db
+def test_failed_expansion_returns_quota(hourly_schedule, monkeypatch):
+    client, schedule = hourly_schedule
+    
+    def fail(posts, platform_tokens=None):
+        raise RuntimeError('outbox unavailable')
+    monkeypatch.setattr('apps.scheduling.recurrence.enqueue_schedule', fail)
+    
+    with pytest.raises(RuntimeError):
+        RecurrenceExpander(horizon_hours=24).expand(schedule)
+    
+    assert quota_used(schedule) == 0
+    assert not ScheduledPost.objects.filter(recurring_schedule=schedule).exists()
@@ -0,0 +1,179 @@
+"""
+Shared HTTP transport for the Node.js scheduler service.
+
+Keeps a pooled keep-alive session, retries idempotent calls with jittered
+exponential backoff and short-circuits calls while the scheduler is down.
+"""
+import logging
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS'})
+RETRYABLE_STATUS_CODES = frozenset({502, 503, 504})
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised instead of calling the scheduler while the circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+    
+    After `failure_threshold` consecutive failures the circuit opens and
+    calls fail fast. Once `reset_timeout` seconds have passed a single probe
+    call is let through; its outcome closes or re-opens the circuit.
+    """
+    
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._lock = threading.Lock()
+    
+    @property
+    def is_open(self):
+        return self._opened_at is not None
+    
+    def allow_request(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                # Half-open: re-arm the timer so only this caller probes
+                self._opened_at = time.monotonic()
+                return True
+            return False
+    
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+    
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logger.warning(f"Scheduler circuit opened after {self._failures} failures")
+                self._opened_at = time.monotonic()
+
+
+class SchedulerTransport:
+    """Pooled, retrying HTTP transport bound to the scheduler base URL."""
+    
+    def __init__(self, base_url, timeout=10, max_retries=3, backoff_base=0.2,
+                 backoff_max=2.0, pool_size=20, breaker=None):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker(failure_threshold=5, reset_timeout=30)
+        
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+    
+    def _backoff(self, attempt):
+        """Full-jitter exponential backoff."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+    
+    def request(self, method, path, **kwargs):
+        """
+        Send a request and return the response, raising for HTTP errors.
+        
+        Only idempotent methods are retried; all failures surface as
+        `requests.exceptions.RequestException` subclasses.
+        """
+        method = method.upper()
+        url = f"{self.base_url}{path}"
+        kwargs.setdefault('timeout', self.timeout)
+        attempts = 1 + (self.max_retries if method in IDEMPOTENT_METHODS else 0)
+        
+        for attempt in range(attempts):
+            is_last_attempt = attempt == attempts - 1
+            if not self.breaker.allow_request():
+                raise CircuitOpenError(f"Scheduler service unavailable (circuit open): {method} {path}")
+            
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                self.breaker.record_failure()
+                if is_last_attempt:
+                    raise
+            else:
+                if response.status_code >= 500:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+                
+                if response.status_code not in RETRYABLE_STATUS_CODES or is_last_attempt:
+                    response.raise_for_status()
+                    return response
+            
+            time.sleep(self._backoff(attempt))
+
+
+class ServiceTokenCache:
+    """Per-user cache of service JWTs, reused until close to expiry."""
+    
+    MAX_ENTRIES = 10000
+    
+    def __init__(self, refresh_margin=60):
+        self.refresh_margin = refresh_margin
+        self._tokens = {}
+        self._lock = threading.Lock()
+    
+    def get(self, user):
+        now = time.time()
+        with self._lock:
+            entry = self._tokens.get(user.id)
+            if entry and entry[1] - self.refresh_margin > now:
+                return entry[0]
+        
+        token = AccessToken.for_user(user)
+        entry = (str(token), token['exp'])
+        with self._lock:
+            if len(self._tokens) >= self.MAX_ENTRIES:
+                self._tokens = {
+                    key: value for key, value in self._tokens.items()
+                    if value[1] - self.refresh_margin > now
+                }
+            self._tokens[user.id] = entry
+        return entry[0]
+
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def get_transport():
+    """Lazy-load the process-wide scheduler transport."""
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = SchedulerTransport(
+                    base_url=settings.SCHEDULER_SERVICE_URL,
+                    timeout=settings.SCHEDULER_HTTP_TIMEOUT,
+                    max_retries=settings.SCHEDULER_HTTP_MAX_RETRIES,
+                    backoff_base=settings.SCHEDULER_HTTP_BACKOFF_BASE,
+                    backoff_max=settings.SCHEDULER_HTTP_BACKOFF_MAX,
+                    pool_size=settings.SCHEDULER_HTTP_POOL_SIZE,
+                    breaker=CircuitBreaker(
+                        failure_threshold=settings.SCHEDULER_CIRCUIT_FAILURE_THRESHOLD,
+                        reset_timeout=settings.SCHEDULER_CIRCUIT_RESET_SECONDS,
+                    ),
+                )
+    return _transport
@@ -4,9 +4,13 @@ from rest_framework.routers import DefaultRouter
 from . import views
 
 router = DefaultRouter()
+# Must precede the empty prefix, whose detail route would otherwise match
+router.register(r'recurring', views.RecurringScheduleViewSet, basename='recurring-schedule')
 router.register(r'', views.ScheduledPostViewSet, basename='scheduled-post')
 
 urlpatterns = [
     path('callback/', views.callback, name='scheduling-callback'),
+    path('callback/batch/', views.callback_batch, name='scheduling-callback-batch'),
+    path('reconciliation/', views.reconciliation_status, name='scheduling-reconciliation'),
     path('', include(router.urls)),
 ]
@@ -1,28 +1,126 @@
 """Views for scheduling."""
+import hashlib
+import zoneinfo
+from collections import Counter
+
 from rest_framework import viewsets, status
-from rest_framework.decorators import action, api_view
+from rest_framework.decorators import action, api_view, authentication_classes, permission_classes
+from rest_framework.exceptions import MethodNotAllowed, ValidationError
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
-from django.utils import timezone
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Window
+from django.db.models.functions import RowNumber, TruncDay, TruncHour
 
-from .models import ScheduledPost
-from .serializers import ScheduledPostSerializer, SchedulePostRequestSerializer
-from .scheduler_client import SchedulerClient
+from .models import ScheduledPost, ScheduleOutbox, RecurringSchedule
+from .serializers import (
+    ScheduledPostSerializer, SchedulePostRequestSerializer,
+    BulkSchedulePostRequestSerializer, SchedulerCallbackSerializer,
+    SchedulerCallbackBatchSerializer, CalendarQuerySerializer, CalendarPostSerializer,
+    SlotSuggestionQuerySerializer, RecurringScheduleSerializer
+)
+from .outbox import enqueue_schedule
+from .callbacks import apply_status_updates
+from .permissions import IsSchedulerService
+from .reconciliation import get_last_run_metrics
+from .cache import bump_schedule_versions, get_schedule_version
+from .snapshots import apply_snapshot
+from .slots import SlotAllocator
+from .recurrence import RecurrenceExpander, cancel_future_occurrences
+from .quotas import reserve_scheduled_posts, release_scheduled_posts, cancel_reservation
 from apps.content.models import Content
+from apps.organizations.access import get_access
+from apps.organizations.permissions import HasOrganizationPermission
+
+QUOTA_EXCEEDED_MESSAGE = 'Scheduled post limit reached for this billing period'
 
 
 class ScheduledPostViewSet(viewsets.ModelViewSet):
     """ViewSet for scheduled posts."""
     serializer_class = ScheduledPostSerializer
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAuthenticated, HasOrganizationPermission]
+    permission_resource = 'schedule'
+    action_permissions = {'cancel': 'schedule.delete'}
     
     def get_queryset(self):
-        org_ids = self.request.user.organization_memberships.values_list('organization_id', flat=True)
-        return ScheduledPost.objects.filter(organization_id__in=org_ids)
+        return ScheduledPost.objects.filter(organization_id__in=get_access(self.request).org_ids())
+    
+    def create(self, request, *args, **kwargs):
+        # Creation must go through the quota, slot allocation and the outbox
+        raise MethodNotAllowed(
+            request.method, detail='Create scheduled posts with POST /api/v1/scheduling/schedule/'
+        )
+    
+    def destroy(self, request, *args, **kwargs):
+        # Deleting would skip the scheduler cancel and the quota and slot release
+        raise MethodNotAllowed(
+            request.method, detail='Cancel scheduled posts with POST /api/v1/scheduling/{id}/cancel/'
+        )
+    
+    def perform_update(self, serializer):
+        """
+        Move a post to a new time. Its pending schedule request is replaced
+        by a fresh one (the dispatcher cancels any job a replaced request
+        still creates in flight), and a post already handed to the scheduler
+        also gets its job canceled. The publish slot moves with the post.
+        """
+        scheduled_post = serializer.instance
+        get_access(self.request).require(
+            'schedule.edit', scheduled_post.organization_id, scheduled_post.content.workspace_id
+        )
+        platform_token = serializer.validated_data.pop('platform_access_token', '')
+        
+        with transaction.atomic():
+            scheduled_post = ScheduledPost.objects.select_for_update().get(pk=scheduled_post.pk)
+            if scheduled_post.status not in ('queued', 'scheduled'):
+                raise ValidationError({'error': 'Only queued or scheduled posts can be changed'})
+            
+            previous_at = scheduled_post.scheduled_at
+            requested_at = serializer.validated_data.get('scheduled_at', previous_at)
+            if requested_at == previous_at:
+                serializer.instance = scheduled_post
+                serializer.save()
+                return
+            
+            allocator = SlotAllocator()
+            scheduled_at = allocator.assign(
+                scheduled_post.platform, scheduled_post.organization_id, requested_at
+            )
+            transaction.on_commit(lambda: allocator.release(
+                scheduled_post.platform, scheduled_post.organization_id, previous_at
+            ))
+            
+            scheduled_post.scheduled_at = scheduled_at
+            pending = scheduled_post.outbox_entries.filter(operation='schedule', status='pending')
+            if not platform_token:
+                payload = pending.values_list('payload', flat=True).first() or {}
+                platform_token = payload.get('access_token', '')
+            # Including entries leased by a dispatcher right now
+            pending.delete()
+            if scheduled_post.job_id:
+                ScheduleOutbox.objects.create(
+                    scheduled_post=scheduled_post, operation='cancel',
+                    payload={'job_id': scheduled_post.job_id}
+                )
+                scheduled_post.job_id = ''
+            scheduled_post.status = 'queued'
+            apply_snapshot(scheduled_post, scheduled_post.content)
+            enqueue_schedule([scheduled_post], {scheduled_post.id: platform_token})
+            scheduled_post.save(update_fields=[
+                'scheduled_at', 'job_id', 'status', 'content_text', 'content_version',
+                'content_hash', 'updated_at'
+            ])
+            bump_schedule_versions([scheduled_post.organization_id])
+        serializer.instance = scheduled_post
     
     @action(detail=False, methods=['post'])
     def schedule(self, request):
-        """Schedule a post via Node.js service."""
+        """
+        Schedule a post. The request to the Node.js service is written to the
+        outbox in the same transaction and delivered by the dispatcher.
+        """
         serializer = SchedulePostRequestSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
@@ -32,94 +130,379 @@ class ScheduledPostViewSet(viewsets.ModelViewSet):
         
         # Get content
         try:
-            content = Content.objects.get(id=content_id)
+            content = Content.objects.only(
+                'id', 'organization_id', 'workspace_id', 'platform', 'generated_text', 'version'
+            ).get(id=content_id, organization_id__in=get_access(request).org_ids())
         except Content.DoesNotExist:
             return Response({'error': 'Content not found'}, status=status.HTTP_404_NOT_FOUND)
+        get_access(request).require('schedule.create', content.organization_id, content.workspace_id)
         
-        # Create scheduled post record
-        scheduled_post = ScheduledPost.objects.create(
-            content=content,
-            organization=content.organization,
-            created_by=request.user,
-            platform=content.platform,
-            scheduled_at=scheduled_at,
-            status='queued'
-        )
+        quota = reserve_scheduled_posts(content.organization_id)
+        if not quota['granted']:
+            return Response(
+                {'error': QUOTA_EXCEEDED_MESSAGE, 'limit': quota['limit']},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        allocator = SlotAllocator()
+        slot_at = None
+        try:
+            # Reserve a publish slot under the platform rate limits
+            slot_at = allocator.assign(
+                content.platform, content.organization_id, scheduled_at,
+                allow_shift=serializer.validated_data['allow_slot_shift']
+            )
+            
+            # Create scheduled post record and its outbox entry atomically
+            scheduled_post = apply_snapshot(ScheduledPost(
+                content=content,
+                organization_id=content.organization_id,
+                created_by=request.user,
+                platform=content.platform,
+                scheduled_at=slot_at,
+                status='queued'
+            ), content)
+            
+            with transaction.atomic():
+                scheduled_post.save(force_insert=True)
+                enqueue_schedule([scheduled_post], {scheduled_post.id: platform_token})
+        except Exception:
+            # Nothing was created, so the reserved unit and the slot go back
+            cancel_reservation(content.organization_id)
+            if slot_at is not None:
+                allocator.release(content.platform, content.organization_id, slot_at)
+            raise
         
-        # Send to Node.js scheduler
-        result = SchedulerClient.schedule_post(
-            content_id=content_id,
-            platform=content.platform,
-            scheduled_at=scheduled_at.isoformat(),
-            user=request.user,
-            org_id=content.organization.id,
-            access_token=platform_token
+        return Response(ScheduledPostSerializer(scheduled_post).data,
+                        status=status.HTTP_202_ACCEPTED)
+    
+    @action(detail=False, methods=['post'], url_path='schedule/bulk')
+    def bulk_schedule(self, request):
+        """
+        Schedule many posts at once; delivery to the Node.js service is batched
+        by the outbox dispatcher.
+        POST /api/v1/scheduling/schedule/bulk/
+        """
+        serializer = BulkSchedulePostRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data['posts']
+        
+        # Resolve all content in one query, restricted to the user's organizations
+        access = get_access(request)
+        contents = Content.objects.filter(
+            id__in={item['content_id'] for item in items},
+            organization_id__in=access.org_ids()
+        ).only('id', 'organization_id', 'workspace_id', 'platform', 'generated_text', 'version')
+        contents_by_id = {
+            content.id: content for content in contents
+            if access.has_perm('schedule.create', content.organization_id, content.workspace_id)
+        }
+        
+        # Reserve quota once per organization for all of its posts
+        wanted = Counter(
+            contents_by_id[item['content_id']].organization_id
+            for item in items if item['content_id'] in contents_by_id
         )
+        reserved = {
+            org_id: reserve_scheduled_posts(org_id, count)['granted']
+            for org_id, count in wanted.items()
+        }
+        quota_left = dict(reserved)
         
-        if result['success']:
-            scheduled_post.job_id = result['job_id']
-            scheduled_post.status = 'scheduled'
-            scheduled_post.save()
-            
-            return Response(ScheduledPostSerializer(scheduled_post).data, 
-                          status=status.HTTP_201_CREATED)
-        else:
-            scheduled_post.status = 'failed'
-            scheduled_post.error_message = result.get('error', 'Unknown error')
-            scheduled_post.save()
+        allocator = SlotAllocator()
+        errors = []
+        scheduled_posts = []
+        platform_tokens = {}
+        try:
+            for index, item in enumerate(items):
+                content = contents_by_id.get(item['content_id'])
+                if content is None:
+                    errors.append({
+                        'index': index,
+                        'content_id': str(item['content_id']),
+                        'error': 'Content not found'
+                    })
+                    continue
+                if not quota_left[content.organization_id]:
+                    errors.append({
+                        'index': index,
+                        'content_id': str(item['content_id']),
+                        'error': QUOTA_EXCEEDED_MESSAGE
+                    })
+                    continue
+                quota_left[content.organization_id] -= 1
+                
+                scheduled_post = apply_snapshot(ScheduledPost(
+                    content=content,
+                    organization_id=content.organization_id,
+                    created_by=request.user,
+                    platform=content.platform,
+                    scheduled_at=allocator.assign(
+                        content.platform, content.organization_id, item['scheduled_at'],
+                        allow_shift=item['allow_slot_shift']
+                    ),
+                    status='queued'
+                ), content)
+                scheduled_posts.append(scheduled_post)
+                platform_tokens[scheduled_post.id] = item.get('platform_access_token', '')
             
-            return Response(
-                {'error': f"Scheduling failed: {result.get('error')}"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+            if scheduled_posts:
+                with transaction.atomic():
+                    ScheduledPost.objects.bulk_create(scheduled_posts)
+                    enqueue_schedule(scheduled_posts, platform_tokens)
+                    bump_schedule_versions(post.organization_id for post in scheduled_posts)
+        except Exception:
+            # Nothing was created, so every reserved unit and assigned slot goes back
+            for org_id, count in reserved.items():
+                cancel_reservation(org_id, count)
+            for post in scheduled_posts:
+                allocator.release(post.platform, post.organization_id, post.scheduled_at)
+            raise
+        
+        return Response(
+            {
+                'scheduled': ScheduledPostSerializer(scheduled_posts, many=True).data,
+                'errors': errors
+            },
+            status=status.HTTP_207_MULTI_STATUS if errors else status.HTTP_202_ACCEPTED
+        )
+    
+    @action(detail=False, methods=['get'])
+    def slots(self, request):
+        """
+        Nearest publish slots with room under the platform rate limits.
+        GET /api/v1/scheduling/slots/?organization=&platform=&scheduled_at=&count=5
+        
+        Suggestions are not reserved; scheduling assigns a slot atomically
+        unless allow_slot_shift is false.
+        """
+        serializer = SlotSuggestionQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        
+        if not get_access(request).has_perm('schedule.view', params['organization']):
+            return Response({'error': 'Access denied to this organization'},
+                            status=status.HTTP_403_FORBIDDEN)
+        
+        suggestions = SlotAllocator().suggest(
+            params['platform'], params['organization'], params['scheduled_at'], count=params['count']
+        )
+        return Response({
+            'platform': params['platform'],
+            'requested_at': params['scheduled_at'].isoformat(),
+            'slots': [
+                {**suggestion, 'scheduled_at': suggestion['scheduled_at'].isoformat()}
+                for suggestion in suggestions
+            ]
+        })
+    
+    @action(detail=False, methods=['get'])
+    def calendar(self, request):
+        """
+        Scheduled posts over a date range, grouped into day or hour buckets.
+        GET /api/v1/scheduling/calendar/?organization=&from=&to=&bucket=day
+        
+        Each bucket has the full count, a per-status breakdown and up to
+        posts_per_bucket posts. Responses are cached per organization until
+        its schedule next changes.
+        """
+        serializer = CalendarQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        org_id = params['organization']
+        
+        if not get_access(request).has_perm('schedule.view', org_id):
+            return Response({'error': 'Access denied to this organization'},
+                            status=status.HTTP_403_FORBIDDEN)
+        
+        tz = params.get('tz') or self._user_timezone(request.user)
+        params_key = '|'.join(
+            f"{name}={params.get(name)}"
+            for name in ['from', 'to', 'bucket', 'platform', 'workspace', 'status', 'posts_per_bucket']
+        ) + f"|tz={tz.key}"
+        cache_key = 'scheduling:calendar:{}:{}:{}'.format(
+            org_id, get_schedule_version(org_id), hashlib.md5(params_key.encode()).hexdigest()
+        )
+        data = cache.get(cache_key)
+        if data is None:
+            data = self._build_calendar(org_id, params, tz)
+            cache.set(cache_key, data, timeout=settings.SCHEDULING_CALENDAR_CACHE_SECONDS)
+        return Response(data)
+    
+    @staticmethod
+    def _user_timezone(user):
+        try:
+            return zoneinfo.ZoneInfo(user.timezone)
+        except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+            return zoneinfo.ZoneInfo('UTC')
+    
+    @staticmethod
+    def _build_calendar(org_id, params, tz):
+        queryset = ScheduledPost.objects.filter(
+            organization_id=org_id,
+            scheduled_at__gte=params['from'],
+            scheduled_at__lt=params['to']
+        )
+        if params.get('platform'):
+            queryset = queryset.filter(platform=params['platform'])
+        if params.get('workspace'):
+            queryset = queryset.filter(content__workspace_id=params['workspace'])
+        if params.get('status'):
+            queryset = queryset.filter(status=params['status'])
+        
+        trunc = (TruncHour if params['bucket'] == 'hour' else TruncDay)('scheduled_at', tzinfo=tz)
+        
+        buckets = {}
+        counts = queryset.annotate(bucket=trunc).values('bucket', 'status').annotate(
+            count=Count('id')
+        ).order_by('bucket')
+        for row in counts:
+            bucket = buckets.setdefault(row['bucket'], {
+                'start': row['bucket'].isoformat(),
+                'count': 0,
+                'by_status': {},
+                'posts': []
+            })
+            bucket['count'] += row['count']
+            bucket['by_status'][row['status']] = row['count']
+        
+        if params['posts_per_bucket']:
+            posts = queryset.only(
+                'id', 'content_id', 'platform', 'scheduled_at', 'status'
+            ).annotate(
+                bucket=trunc,
+                bucket_rank=Window(
+                    RowNumber(), partition_by=[trunc],
+                    order_by=[F('scheduled_at').asc(), F('id').asc()]
+                )
+            ).filter(bucket_rank__lte=params['posts_per_bucket']).order_by('scheduled_at', 'id')
+            for post in posts:
+                buckets[post.bucket]['posts'].append(CalendarPostSerializer(post).data)
+        
+        return {
+            'organization': str(org_id),
+            'from': params['from'].isoformat(),
+            'to': params['to'].isoformat(),
+            'bucket': params['bucket'],
+            'timezone': tz.key,
+            'total': sum(bucket['count'] for bucket in buckets.values()),
+            'buckets': list(buckets.values())
+        }
     
     @action(detail=True, methods=['post'])
     def cancel(self, request, pk=None):
-        """Cancel a scheduled post."""
+        """
+        Cancel a scheduled post. Posts not yet handed to the Node.js service are
+        canceled locally; otherwise a cancel request is queued in the outbox.
+        """
         scheduled_post = self.get_object()
         
-        if scheduled_post.status in ['published', 'canceled']:
-            return Response(
-                {'error': 'Cannot cancel already published or canceled post'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        result = SchedulerClient.cancel_job(scheduled_post.job_id, request.user)
-        
-        if result['success']:
+        with transaction.atomic():
+            scheduled_post = ScheduledPost.objects.select_for_update().get(pk=scheduled_post.pk)
+            
+            if scheduled_post.status in ['published', 'canceled']:
+                return Response(
+                    {'error': 'Cannot cancel already published or canceled post'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            scheduled_post.outbox_entries.filter(operation='schedule', status='pending').delete()
+            if scheduled_post.job_id:
+                ScheduleOutbox.objects.create(
+                    scheduled_post=scheduled_post, operation='cancel',
+                    payload={'job_id': scheduled_post.job_id}
+                )
+            
             scheduled_post.status = 'canceled'
-            scheduled_post.save()
-            return Response({'message': 'Post canceled successfully'})
-        else:
-            return Response({'error': result.get('error')}, 
-                          status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            scheduled_post.save(update_fields=['status', 'updated_at'])
+            transaction.on_commit(lambda: SlotAllocator().release(
+                scheduled_post.platform, scheduled_post.organization_id, scheduled_post.scheduled_at
+            ))
+            transaction.on_commit(lambda: release_scheduled_posts(
+                scheduled_post.organization_id, [scheduled_post.created_at]
+            ))
+        
+        return Response({'message': 'Post canceled successfully'})
+
+
+class RecurringScheduleViewSet(viewsets.ModelViewSet):
+    """
+    ViewSet for recurring schedules. Occurrences are created only a short
+    horizon ahead; see RecurrenceExpander.
+    """
+    serializer_class = RecurringScheduleSerializer
+    permission_classes = [IsAuthenticated, HasOrganizationPermission]
+    permission_resource = 'schedule'
+    
+    def get_queryset(self):
+        return RecurringSchedule.objects.filter(organization_id__in=get_access(self.request).org_ids())
+    
+    def perform_create(self, serializer):
+        content = serializer.validated_data['content']
+        schedule = serializer.save(
+            created_by=self.request.user,
+            organization_id=content.organization_id,
+            platform=content.platform
+        )
+        RecurrenceExpander().expand(schedule)
+        schedule.refresh_from_db()
+    
+    def perform_update(self, serializer):
+        # Changing the rule or content replaces all upcoming occurrences
+        with transaction.atomic():
+            schedule = serializer.save()
+            cancel_future_occurrences(schedule)
+            schedule.platform = schedule.content.platform
+            schedule.organization_id = schedule.content.organization_id
+            schedule.expanded_until = None
+            schedule.save(update_fields=['platform', 'organization', 'expanded_until', 'updated_at'])
+        RecurrenceExpander().expand(schedule)
+        schedule.refresh_from_db()
+    
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            cancel_future_occurrences(instance)
+            instance.delete()
 
 
 @api_view(['POST'])
+@authentication_classes([])
+@permission_classes([IsSchedulerService])
 def callback(request):
     """
     Callback endpoint for Node.js scheduler to update job status.
     POST /api/v1/scheduling/callback/
     """
-    job_id = request.data.get('job_id')
-    content_id = request.data.get('content_id')
-    job_status = request.data.get('status')
-    platform_post_id = request.data.get('platform_post_id')
-    error = request.data.get('error')
+    serializer = SchedulerCallbackSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
     
-    try:
-        scheduled_post = ScheduledPost.objects.get(job_id=job_id)
-        scheduled_post.status = job_status
-        
-        if job_status == 'published':
-            scheduled_post.platform_post_id = platform_post_id
-            scheduled_post.published_at = timezone.now()
-        elif job_status == 'failed':
-            scheduled_post.error_message = error
-        
-        scheduled_post.save()
-        
-        return Response({'message': 'Callback processed'}, status=status.HTTP_200_OK)
-    
-    except ScheduledPost.DoesNotExist:
+    result = apply_status_updates([serializer.validated_data])
+    if result['not_found']:
         return Response({'error': 'Scheduled post not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    return Response({'message': 'Callback processed'}, status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+@authentication_classes([])
+@permission_classes([IsSchedulerService])
+def callback_batch(request):
+    """
+    Batched callback endpoint; duplicate and out-of-order updates are ignored.
+    POST /api/v1/scheduling/callback/batch/
+    """
+    serializer = SchedulerCallbackBatchSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    
+    result = apply_status_updates(serializer.validated_data['updates'])
+    return Response(result, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def reconciliation_status(request):
+    """
+    Metrics from the last reconciliation sweep.
+    GET /api/v1/scheduling/reconciliation/
+    """
+    return Response({'last_run': get_last_run_metrics()})
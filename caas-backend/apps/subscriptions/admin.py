@@ -1,6 +1,6 @@
 """Admin for subscriptions."""
 from django.contrib import admin
-from .models import Plan, Subscription
+from .models import Plan, Subscription, StripeEvent, StripeCustomer
 
 
 @admin.register(Plan)
@@ -14,3 +14,18 @@ class SubscriptionAdmin(admin.ModelAdmin):
     list_display = ['organization', 'plan', 'status', 'tokens_remaining', 'current_period_end']
     list_filter = ['status', 'plan']
     search_fields = ['organization__name', 'stripe_subscription_id']
+
+
+@admin.register(StripeEvent)
+class StripeEventAdmin(admin.ModelAdmin):
+    list_display = ['stripe_event_id', 'event_type', 'status', 'attempts', 'stripe_created_at', 'processed_at']
+    list_filter = ['status', 'event_type']
+    search_fields = ['stripe_event_id', 'ordering_key']
+    readonly_fields = ['payload', 'received_at']
+
+
+@admin.register(StripeCustomer)
+class StripeCustomerAdmin(admin.ModelAdmin):
+    list_display = ['organization', 'stripe_customer_id', 'status', 'attempts', 'updated_at']
+    list_filter = ['status']
+    search_fields = ['organization__name', 'stripe_customer_id']
@@ -5,3 +5,6 @@ from django.apps import AppConfig
 class SubscriptionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.subscriptions'
+    
+    def ready(self):
+        import apps.subscriptions.signals  # noqa
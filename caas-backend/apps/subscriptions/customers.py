@@ -0,0 +1,169 @@
+"""
+Stripe customer provisioning.
+
+Every organization gets a StripeCustomer row when it is created; the
+provisioner creates the Stripe customer in the background, so checkout
+normally finds an id ready and makes a single Stripe call. Rows are claimed
+with a lease, as in the scheduling outbox, and creation is idempotent per
+organization, so a retried or concurrent request never makes a duplicate.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.organizations.models import Organization
+from .models import StripeCustomer, Subscription
+from .stripe_service import StripeService
+
+logger = logging.getLogger(__name__)
+
+
+def queue_missing_customers():
+    """
+    Create pending rows for organizations that have none, e.g. ones created
+    before provisioning existed. Existing Stripe customer ids on
+    subscriptions are reused instead of creating new customers.
+    
+    Returns:
+        number of rows created
+    """
+    missing = Organization.objects.filter(stripe_customer__isnull=True)
+    existing_ids = dict(
+        Subscription.objects.filter(
+            organization__in=missing, stripe_customer_id__isnull=False
+        ).exclude(stripe_customer_id='').values_list('organization_id', 'stripe_customer_id')
+    )
+    rows = [
+        StripeCustomer(
+            organization_id=org_id,
+            stripe_customer_id=existing_ids.get(org_id),
+            status='created' if org_id in existing_ids else 'pending'
+        )
+        for org_id in missing.values_list('id', flat=True)
+    ]
+    return len(StripeCustomer.objects.bulk_create(rows, ignore_conflicts=True))
+
+
+def get_customer_id(organization):
+    """
+    Stripe customer id for an organization, creating the customer now if
+    the background job has not yet.
+    
+    Returns:
+        dict with success and customer_id or error
+    """
+    customer = StripeCustomer.objects.filter(organization=organization).first()
+    if customer is not None and customer.stripe_customer_id:
+        return {'success': True, 'customer_id': customer.stripe_customer_id}
+    
+    # Customers created by checkout before provisioning existed
+    existing_id = Subscription.objects.filter(
+        organization=organization, stripe_customer_id__isnull=False
+    ).exclude(stripe_customer_id='').values_list('stripe_customer_id', flat=True).first()
+    if existing_id:
+        result = {'success': True, 'customer_id': existing_id}
+    else:
+        result = StripeService.create_customer(
+            email=organization.owner.email,
+            name=organization.name,
+            organization_id=organization.id
+        )
+        if not result['success']:
+            return result
+    
+    StripeCustomer.objects.update_or_create(
+        organization=organization,
+        defaults={
+            'stripe_customer_id': result['customer_id'],
+            'status': 'created',
+            'last_error': '',
+        }
+    )
+    return result
+
+
+class StripeCustomerProvisioner:
+    """Creates pending Stripe customers in batches."""
+    
+    def __init__(self, batch_size=None, lease_seconds=None, max_attempts=None):
+        self.batch_size = batch_size or settings.STRIPE_CUSTOMERS_BATCH_SIZE
+        self.lease = timedelta(seconds=lease_seconds or settings.STRIPE_CUSTOMERS_LEASE_SECONDS)
+        self.max_attempts = max_attempts or settings.STRIPE_CUSTOMERS_MAX_ATTEMPTS
+    
+    def claim_batch(self):
+        """Lock and lease the next batch of due rows."""
+        now = timezone.now()
+        with transaction.atomic():
+            customers = list(
+                StripeCustomer.objects
+                .select_for_update(skip_locked=True, of=('self',))
+                .select_related('organization__owner')
+                .filter(status='pending', next_attempt_at__lte=now)
+                .order_by('next_attempt_at')[:self.batch_size]
+            )
+            for customer in customers:
+                customer.attempts += 1
+                customer.next_attempt_at = now + self.lease
+            StripeCustomer.objects.bulk_update(customers, ['attempts', 'next_attempt_at'])
+        return customers
+    
+    def provision_once(self):
+        """
+        Create one batch of customers.
+        
+        Returns:
+            dict with claimed, created and failed counts
+        """
+        customers = self.claim_batch()
+        counts = {'claimed': len(customers), 'created': 0, 'failed': 0}
+        if not customers:
+            return counts
+        
+        now = timezone.now()
+        for customer in customers:
+            organization = customer.organization
+            result = StripeService.create_customer(
+                email=organization.owner.email,
+                name=organization.name,
+                organization_id=organization.id
+            )
+            if result['success']:
+                counts['created'] += 1
+                customer.stripe_customer_id = result['customer_id']
+                customer.status = 'created'
+                customer.last_error = ''
+                continue
+            
+            customer.last_error = result['error']
+            if customer.attempts >= self.max_attempts:
+                counts['failed'] += 1
+                customer.status = 'failed'
+            else:
+                customer.next_attempt_at = now + self._backoff(customer.attempts)
+            logger.warning(
+                f"Stripe customer for organization {organization.id} failed "
+                f"(attempt {customer.attempts}): {customer.last_error}"
+            )
+        
+        for customer in customers:
+            customer.updated_at = now
+        # Only fill ids still missing, in case checkout created one meanwhile
+        with transaction.atomic():
+            current = StripeCustomer.objects.select_for_update().in_bulk([customer.id for customer in customers])
+            customers = [
+                customer for customer in customers
+                if customer.id in current and not current[customer.id].stripe_customer_id
+            ]
+            StripeCustomer.objects.bulk_update(
+                customers,
+                ['stripe_customer_id', 'status', 'last_error', 'next_attempt_at', 'updated_at']
+            )
+        return counts
+    
+    @staticmethod
+    def _backoff(attempts):
+        """Exponential retry delay, capped at one hour."""
+        return timedelta(seconds=min(3600, 5 * (2 ** attempts)))
@@ -0,0 +1,197 @@
+"""
+Plan catalog and per-organization entitlements.
+
+Entitlements are a small dict (tier, status, limits, features, billing
+period) resolved from the organization's subscription and the plan catalog.
+Both are cached in Redis and, for a few seconds, in process memory, so the
+hot path of a request is a dictionary lookup. Subscription and plan changes
+delete the Redis entries on commit (see signals.py); other processes pick
+the change up once their short in-process entries expire.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Plan, Subscription
+
+CATALOG_KEY = 'subscriptions:plan_catalog'
+SUBSCRIPTION_KEY = 'subscriptions:entitlements:{org_id}'
+UNLIMITED = -1
+
+# Subscriptions in these states keep their plan; canceled ones fall back to free
+PAID_STATUSES = ['active', 'trialing', 'past_due']
+
+# Least recently used entries are evicted past ENTITLEMENTS_LOCAL_MAX_ENTRIES
+_local = OrderedDict()
+_local_lock = threading.Lock()
+
+
+def _local_get(key):
+    with _local_lock:
+        entry = _local.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del _local[key]
+            return None
+        _local.move_to_end(key)
+        return entry[1]
+
+
+def _local_set(key, value):
+    with _local_lock:
+        _local[key] = (time.monotonic() + settings.ENTITLEMENTS_LOCAL_CACHE_SECONDS, value)
+        _local.move_to_end(key)
+        while len(_local) > settings.ENTITLEMENTS_LOCAL_MAX_ENTRIES:
+            _local.popitem(last=False)
+
+
+def _plan_data(plan):
+    return {
+        'id': str(plan.id),
+        'name': plan.name,
+        'tier': plan.tier,
+        'price_monthly': str(plan.price_monthly),
+        'tokens_per_month': plan.tokens_per_month,
+        'scheduled_posts': plan.scheduled_posts,
+        'workspaces': plan.workspaces,
+        'team_members': plan.team_members,
+        'features': plan.features,
+        'is_active': plan.is_active,
+    }
+
+
+def _load_catalog():
+    catalog = {str(plan.id): _plan_data(plan) for plan in Plan.objects.all()}
+    cache.set(CATALOG_KEY, catalog, timeout=settings.ENTITLEMENTS_CACHE_SECONDS)
+    return catalog
+
+
+def get_plan_catalog():
+    """All plans keyed by id (as a string), in the shape PlanSerializer returns."""
+    catalog = _local_get(CATALOG_KEY)
+    if catalog is None:
+        catalog = cache.get(CATALOG_KEY)
+        if catalog is None:
+            catalog = _load_catalog()
+        _local_set(CATALOG_KEY, catalog)
+    return catalog
+
+
+def _subscription_data(subscription):
+    if subscription is None:
+        return {}
+    return {
+        'plan_id': str(subscription.plan_id),
+        'status': subscription.status,
+        'period_start': subscription.current_period_start,
+        'period_end': subscription.current_period_end,
+    }
+
+
+def _free_plan():
+    return {'tier': 'free', **settings.SUBSCRIPTION_PLANS['free']}
+
+
+def _compose(org_id, subscription, catalog):
+    plan = None
+    if subscription.get('status') in PAID_STATUSES:
+        plan = catalog.get(subscription['plan_id'])
+    plan = plan or _free_plan()
+    return {
+        'organization_id': str(org_id),
+        'tier': plan['tier'],
+        'status': subscription.get('status', 'none'),
+        'tokens_per_month': plan['tokens_per_month'],
+        'scheduled_posts': plan['scheduled_posts'],
+        'workspaces': plan['workspaces'],
+        'team_members': plan['team_members'],
+        'features': plan['features'],
+        'period_start': subscription.get('period_start'),
+        'period_end': subscription.get('period_end'),
+    }
+
+
+def get_entitlements_many(org_ids):
+    """
+    Entitlements for several organizations, keyed by organization id.
+    Cache misses are loaded together in one query.
+    """
+    result = {}
+    missing = []
+    for org_id in org_ids:
+        entitlements = _local_get(('entitlements', str(org_id)))
+        if entitlements is None:
+            missing.append(org_id)
+        else:
+            result[org_id] = entitlements
+    if not missing:
+        return result
+    
+    keys = {org_id: SUBSCRIPTION_KEY.format(org_id=org_id) for org_id in missing}
+    cached = cache.get_many([*keys.values(), CATALOG_KEY])
+    catalog = cached.get(CATALOG_KEY)
+    if catalog is None:
+        catalog = _load_catalog()
+    _local_set(CATALOG_KEY, catalog)
+    
+    unloaded = [org_id for org_id, key in keys.items() if key not in cached]
+    if unloaded:
+        subscriptions = {
+            str(subscription.organization_id): subscription
+            for subscription in Subscription.objects.filter(organization_id__in=unloaded).only(
+                'organization_id', 'plan_id', 'status', 'current_period_start', 'current_period_end'
+            )
+        }
+        loaded = {
+            keys[org_id]: _subscription_data(subscriptions.get(str(org_id)))
+            for org_id in unloaded
+        }
+        cache.set_many(loaded, timeout=settings.ENTITLEMENTS_CACHE_SECONDS)
+        cached.update(loaded)
+    
+    for org_id, key in keys.items():
+        entitlements = _compose(org_id, cached[key], catalog)
+        _local_set(('entitlements', str(org_id)), entitlements)
+        result[org_id] = entitlements
+    return result
+
+
+def get_entitlements(org_id):
+    """Entitlements for one organization."""
+    return get_entitlements_many([org_id])[org_id]
+
+
+def within_limit(limit, current, adding=1):
+    """Whether `current + adding` fits under a limit, where -1 is unlimited."""
+    return limit == UNLIMITED or current + adding <= limit
+
+
+def _forget(org_ids):
+    cache.delete_many([SUBSCRIPTION_KEY.format(org_id=org_id) for org_id in org_ids])
+    with _local_lock:
+        for org_id in org_ids:
+            _local.pop(('entitlements', str(org_id)), None)
+
+
+def invalidate_entitlements(org_ids):
+    """Drop cached entitlements for organizations once the transaction commits."""
+    org_ids = set(org_ids)
+    if org_ids:
+        transaction.on_commit(lambda: _forget(org_ids))
+
+
+def _forget_catalog():
+    cache.delete(CATALOG_KEY)
+    # Every composed entry embeds plan limits
+    with _local_lock:
+        _local.clear()
+
+
+def invalidate_plan_catalog():
+    """Drop the cached plan catalog once the transaction commits."""
+    transaction.on_commit(_forget_catalog)
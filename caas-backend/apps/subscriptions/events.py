@@ -0,0 +1,117 @@
+"""
+Background processing of stored Stripe webhook events.
+
+Events are claimed with a lease (next_attempt_at pushed into the future), as
+in the scheduling outbox. Only the oldest unfinished event of each ordering
+key is ever claimed, so events for one subscription apply in the order
+Stripe created them even with several workers running.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from .models import StripeEvent
+from .webhooks import EVENT_HANDLERS
+
+logger = logging.getLogger(__name__)
+
+
+class StripeEventProcessor:
+    """Applies pending Stripe events in batches."""
+    
+    def __init__(self, batch_size=None, lease_seconds=None, max_attempts=None):
+        self.batch_size = batch_size or settings.STRIPE_EVENTS_BATCH_SIZE
+        self.lease = timedelta(seconds=lease_seconds or settings.STRIPE_EVENTS_LEASE_SECONDS)
+        self.max_attempts = max_attempts or settings.STRIPE_EVENTS_MAX_ATTEMPTS
+    
+    def claim_batch(self):
+        """Lock and lease the next due events that are first in their key."""
+        now = timezone.now()
+        # Any pending event of the same key that comes first, including ones
+        # leased or backing off, keeps this one waiting
+        earlier = StripeEvent.objects.filter(
+            ordering_key=OuterRef('ordering_key'), status='pending'
+        ).filter(
+            Q(stripe_created_at__lt=OuterRef('stripe_created_at'))
+            | Q(stripe_created_at=OuterRef('stripe_created_at'), received_at__lt=OuterRef('received_at'))
+            | Q(stripe_created_at=OuterRef('stripe_created_at'), received_at=OuterRef('received_at'), id__lt=OuterRef('id'))
+        )
+        with transaction.atomic():
+            events = list(
+                StripeEvent.objects
+                .select_for_update(skip_locked=True)
+                .filter(status='pending', next_attempt_at__lte=now)
+                .filter(~Exists(earlier))
+                .order_by('stripe_created_at', 'received_at', 'id')[:self.batch_size]
+            )
+            if not events:
+                return []
+            
+            for event in events:
+                event.attempts += 1
+                event.next_attempt_at = now + self.lease
+            StripeEvent.objects.bulk_update(events, ['attempts', 'next_attempt_at'])
+        return events
+    
+    def process_once(self):
+        """
+        Process one batch.
+        
+        Returns:
+            dict with claimed, processed and failed counts
+        """
+        events = self.claim_batch()
+        counts = {'claimed': len(events), 'processed': 0, 'failed': 0}
+        for event in events:
+            outcome = self.process(event)
+            if outcome in counts:
+                counts[outcome] += 1
+        return counts
+    
+    def process(self, event):
+        """Apply one event; its effects and status are committed together."""
+        try:
+            with transaction.atomic():
+                EVENT_HANDLERS[event.event_type](event.payload['data']['object'])
+                event.status = 'processed'
+                event.processed_at = timezone.now()
+                event.last_error = ''
+                event.save(update_fields=['status', 'processed_at', 'last_error'])
+            return 'processed'
+        except Exception as e:
+            event.last_error = str(e) or e.__class__.__name__
+            if event.attempts >= self.max_attempts:
+                # Give up so later events for the same key are not blocked forever
+                event.status = 'failed'
+                outcome = 'failed'
+            else:
+                event.status = 'pending'
+                event.next_attempt_at = timezone.now() + self._backoff(event.attempts)
+                outcome = 'retrying'
+            event.save(update_fields=['status', 'last_error', 'next_attempt_at'])
+            logger.error(
+                f"Stripe event {event.stripe_event_id} ({event.event_type}) failed "
+                f"(attempt {event.attempts}): {event.last_error}"
+            )
+            return outcome
+    
+    @staticmethod
+    def _backoff(attempts):
+        """Exponential retry delay, capped at one hour."""
+        return timedelta(seconds=min(3600, 5 * (2 ** attempts)))
+
+
+def replay_events(queryset):
+    """
+    Queue stored events to be processed again, e.g. failed ones after a fix.
+    
+    Returns:
+        number of events queued
+    """
+    return queryset.update(
+        status='pending', attempts=0, last_error='', next_attempt_at=timezone.now(), processed_at=None
+    )
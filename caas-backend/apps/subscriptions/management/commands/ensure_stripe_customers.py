@@ -0,0 +1,41 @@
+"""
+Create Stripe customers for organizations ahead of checkout.
+
+Usage:
+    python manage.py ensure_stripe_customers              # drain once and exit
+    python manage.py ensure_stripe_customers --loop       # run as a worker
+    python manage.py ensure_stripe_customers --backfill   # also queue organizations without a row
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.subscriptions.customers import StripeCustomerProvisioner, queue_missing_customers
+
+
+class Command(BaseCommand):
+    help = 'Create pending Stripe customers in the background.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None, help='Customers claimed per batch')
+        parser.add_argument('--backfill', action='store_true', help='Queue organizations that have no customer row')
+        parser.add_argument('--loop', action='store_true', help='Keep polling instead of exiting when drained')
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds to sleep when idle (with --loop)')
+    
+    def handle(self, *args, **options):
+        if options['backfill']:
+            self.stdout.write(f"Queued {queue_missing_customers()} organizations")
+        
+        provisioner = StripeCustomerProvisioner(batch_size=options['batch_size'])
+        while True:
+            counts = provisioner.provision_once()
+            if counts['claimed']:
+                self.stdout.write(
+                    f"Provisioned batch: {counts['created']} created, {counts['failed']} failed, "
+                    f"{counts['claimed'] - counts['created'] - counts['failed']} retrying"
+                )
+                continue
+            
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
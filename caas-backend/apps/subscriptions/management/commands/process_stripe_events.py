@@ -0,0 +1,37 @@
+"""
+Apply stored Stripe webhook events.
+
+Usage:
+    python manage.py process_stripe_events            # drain once and exit
+    python manage.py process_stripe_events --loop     # run as a worker
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.subscriptions.events import StripeEventProcessor
+
+
+class Command(BaseCommand):
+    help = 'Process pending Stripe webhook events in order per subscription.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None, help='Events claimed per batch')
+        parser.add_argument('--loop', action='store_true', help='Keep polling instead of exiting when drained')
+        parser.add_argument('--interval', type=float, default=2.0, help='Seconds to sleep when idle (with --loop)')
+    
+    def handle(self, *args, **options):
+        processor = StripeEventProcessor(batch_size=options['batch_size'])
+        
+        while True:
+            counts = processor.process_once()
+            if counts['claimed']:
+                self.stdout.write(
+                    f"Processed batch: {counts['processed']} processed, {counts['failed']} failed, "
+                    f"{counts['claimed'] - counts['processed'] - counts['failed']} retrying"
+                )
+                continue
+            
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,43 @@
+"""
+Re-queue stored Stripe events for processing.
+
+Usage:
+    python manage.py replay_stripe_events evt_123 evt_456       # specific events
+    python manage.py replay_stripe_events --status failed       # everything that gave up
+    python manage.py replay_stripe_events --since 2024-01-01 --type invoice.payment_succeeded
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime, parse_date
+
+from apps.subscriptions.events import replay_events
+from apps.subscriptions.models import StripeEvent
+
+
+class Command(BaseCommand):
+    help = 'Mark stored Stripe events pending so process_stripe_events applies them again.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('event_ids', nargs='*', help='Stripe event ids (evt_...)')
+        parser.add_argument('--status', choices=['processed', 'failed'], help='Only events with this status')
+        parser.add_argument('--type', dest='event_type', help='Only events of this type')
+        parser.add_argument('--since', help='Only events created by Stripe at or after this date/time')
+    
+    def handle(self, *args, **options):
+        if not (options['event_ids'] or options['status'] or options['event_type'] or options['since']):
+            raise CommandError('Pass event ids or at least one filter')
+        
+        events = StripeEvent.objects.exclude(status='pending')
+        if options['event_ids']:
+            events = events.filter(stripe_event_id__in=options['event_ids'])
+        if options['status']:
+            events = events.filter(status=options['status'])
+        if options['event_type']:
+            events = events.filter(event_type=options['event_type'])
+        if options['since']:
+            since = parse_datetime(options['since']) or parse_date(options['since'])
+            if since is None:
+                raise CommandError(f"Invalid --since: {options['since']}")
+            events = events.filter(stripe_created_at__gte=since)
+        
+        count = replay_events(events)
+        self.stdout.write(f"Queued {count} Stripe events for replay")
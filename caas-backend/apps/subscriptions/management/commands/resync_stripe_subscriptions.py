@@ -0,0 +1,62 @@
+"""
+Resync subscription status and billing periods from Stripe.
+
+Usage:
+    python manage.py resync_stripe_subscriptions                     # everything we have a Stripe id for
+    python manage.py resync_stripe_subscriptions --dry-run           # report drift only
+    python manage.py resync_stripe_subscriptions --since 2024-01-01 --workers 16
+"""
+from datetime import datetime, time as dt_time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime, parse_date
+
+from apps.subscriptions.resync import StripeSubscriptionResync
+
+
+def _parse(value, name):
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise CommandError(f"Invalid {name}: {value}")
+        parsed = datetime.combine(day, dt_time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+class Command(BaseCommand):
+    help = 'Compare subscriptions with Stripe and correct status and period drift.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help='Only subscriptions created in Stripe at or after this date/time')
+        parser.add_argument('--until', help='Only subscriptions created in Stripe before this date/time')
+        parser.add_argument('--workers', type=int, default=None, help='Parallel Stripe API calls')
+        parser.add_argument('--windows', type=int, default=None, help='Creation-time windows to split the listing into')
+        parser.add_argument('--batch-size', type=int, default=None, help='Subscriptions compared per query and bulk_update')
+        parser.add_argument('--dry-run', action='store_true', help='Report drift without writing')
+    
+    def handle(self, *args, **options):
+        since = _parse(options['since'], '--since') if options['since'] else None
+        until = _parse(options['until'], '--until') if options['until'] else None
+        
+        report = StripeSubscriptionResync(
+            workers=options['workers'],
+            windows=options['windows'],
+            batch_size=options['batch_size'],
+            dry_run=options['dry_run']
+        ).run(since=since, until=until)
+        
+        self.stdout.write(
+            f"Fetched {report['fetched']} Stripe subscriptions: {report['drifted']} drifted, "
+            f"{report['updated']} updated, {report['unknown']} not in our database"
+        )
+        for field, count in report['drift'].items():
+            if count:
+                self.stdout.write(f"  {field}: {count}")
+        for stripe_id, fields in report['sample']:
+            self.stdout.write(f"  {stripe_id}: {', '.join(fields)}")
+        for error in report['errors']:
+            self.stderr.write(f"Failed {error}")
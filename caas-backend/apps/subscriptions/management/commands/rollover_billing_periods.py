@@ -0,0 +1,30 @@
+"""
+Start new billing periods for subscriptions not renewed by Stripe.
+
+Usage:
+    python manage.py rollover_billing_periods                             # once
+    python manage.py rollover_billing_periods --loop --interval 3600      # periodically
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.subscriptions.periods import rollover_billing_periods
+
+
+class Command(BaseCommand):
+    help = 'Roll ended billing periods forward and reset token usage, in batches.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None, help='Subscriptions per UPDATE')
+        parser.add_argument('--loop', action='store_true', help='Keep running instead of exiting')
+        parser.add_argument('--interval', type=float, default=3600.0, help='Seconds between runs (with --loop)')
+    
+    def handle(self, *args, **options):
+        while True:
+            rolled = rollover_billing_periods(batch_size=options['batch_size'])
+            self.stdout.write(f"Rolled over {rolled} billing periods")
+            
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
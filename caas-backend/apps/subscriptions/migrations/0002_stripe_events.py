@@ -0,0 +1,36 @@
+# Generated by Django 5.0.1 on 2026-10-19 10:23
+
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('subscriptions', '0001_initial'),
+    ]
+    
+    operations = [
+        migrations.CreateModel(
+            name='StripeEvent',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('stripe_event_id', models.CharField(max_length=255, unique=True)),
+                ('event_type', models.CharField(max_length=100)),
+                ('ordering_key', models.CharField(max_length=255)),
+                ('payload', models.JSONField()),
+                ('stripe_created_at', models.DateTimeField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processed', 'Processed'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('attempts', models.IntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+                ('received_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'stripe_events',
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='stripe_even_status_e9066e_idx'), models.Index(fields=['ordering_key', 'status'], name='stripe_even_orderin_c6c2b4_idx')],
+            },
+        ),
+    ]
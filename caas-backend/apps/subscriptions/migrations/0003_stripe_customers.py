@@ -0,0 +1,35 @@
+# Generated by Django 5.0.1 on 2026-10-19 10:26
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0005_workspace_role_overrides'),
+        ('subscriptions', '0002_stripe_events'),
+    ]
+    
+    operations = [
+        migrations.CreateModel(
+            name='StripeCustomer',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('stripe_customer_id', models.CharField(blank=True, max_length=255, null=True, unique=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('created', 'Created'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('attempts', models.IntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('organization', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='stripe_customer', to='organizations.organization')),
+            ],
+            options={
+                'db_table': 'stripe_customers',
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='stripe_cust_status_cf1a64_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.1 on 2026-10-19 10:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0005_workspace_role_overrides'),
+        ('subscriptions', '0003_stripe_customers'),
+    ]
+    
+    operations = [
+        migrations.AddIndex(
+            model_name='subscription',
+            index=models.Index(fields=['current_period_end'], name='subscriptio_current_0ac39a_idx'),
+        ),
+    ]
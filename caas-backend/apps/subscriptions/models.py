@@ -2,6 +2,7 @@
 import uuid
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 
 
 class Plan(models.Model):
@@ -77,6 +78,10 @@ class Subscription(models.Model):
     
     class Meta:
         db_table = 'subscriptions'
+        indexes = [
+            # Billing period rollover scans for ended periods
+            models.Index(fields=['current_period_end']),
+        ]
     
     def __str__(self):
         return f"{self.organization.name} - {self.plan.name}"
@@ -84,3 +89,82 @@ class Subscription(models.Model):
     def has_tokens_available(self, required_tokens):
         """Check if subscription has enough tokens."""
         return self.tokens_remaining >= required_tokens
+
+
+class StripeEvent(models.Model):
+    """
+    A verified Stripe webhook event, stored on receipt and processed by
+    `manage.py process_stripe_events`. The unique Stripe event id makes
+    redeliveries no-ops.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processed', 'Processed'),
+        ('failed', 'Failed'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    stripe_event_id = models.CharField(max_length=255, unique=True)
+    event_type = models.CharField(max_length=100)
+    # Events sharing a key (usually the Stripe subscription id) are processed in order
+    ordering_key = models.CharField(max_length=255)
+    payload = models.JSONField()
+    stripe_created_at = models.DateTimeField()
+    
+    # Processing
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.IntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    
+    received_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'stripe_events'
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+            models.Index(fields=['ordering_key', 'status']),
+        ]
+    
+    def __str__(self):
+        return f"{self.stripe_event_id} ({self.event_type}, {self.status})"
+
+
+class StripeCustomer(models.Model):
+    """
+    An organization's Stripe customer, created in the background by
+    `manage.py ensure_stripe_customers` when the organization is created so
+    checkout never has to create one.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('created', 'Created'),
+        ('failed', 'Failed'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    organization = models.OneToOneField(
+        'organizations.Organization',
+        on_delete=models.CASCADE,
+        related_name='stripe_customer'
+    )
+    stripe_customer_id = models.CharField(max_length=255, unique=True, null=True, blank=True)
+    
+    # Provisioning
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.IntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'stripe_customers'
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.organization_id} - {self.stripe_customer_id or self.status}"
@@ -0,0 +1,109 @@
+"""
+Billing period rollover for subscriptions Stripe does not renew.
+
+Stripe-billed subscriptions move to a new period through invoice webhooks.
+Everything else (free and manually managed plans, and canceled
+subscriptions, which fall back to the free limits) is rolled forward here
+in batches of rows whose period has ended or was never set. Periods are
+monthly from an anchor (the subscription's creation time), clamped at
+month end, so an anchor on the 31st gives Feb 28/29 and then Mar 31.
+Scheduled-post quota counters are keyed by period start, so the new period
+starts a fresh counter on its own; cached entitlements, which carry the
+period, are invalidated.
+"""
+import calendar
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Subscription
+from .entitlements import invalidate_entitlements
+
+logger = logging.getLogger(__name__)
+
+
+def add_months(anchor, months):
+    """`anchor` moved by whole months, clamping the day to the month's last day."""
+    month_index = anchor.month - 1 + months
+    year, month = anchor.year + month_index // 12, month_index % 12 + 1
+    day = min(anchor.day, calendar.monthrange(year, month)[1])
+    return anchor.replace(year=year, month=month, day=day)
+
+
+def current_period(anchor, now):
+    """(start, end) of the monthly period anchored at `anchor` that contains `now`."""
+    months = (now.year - anchor.year) * 12 + now.month - anchor.month
+    if add_months(anchor, months) > now:
+        months -= 1
+    return add_months(anchor, months), add_months(anchor, months + 1)
+
+
+def _due(now):
+    return Subscription.objects.filter(
+        Q(current_period_end__lte=now) | Q(current_period_end__isnull=True)
+    ).filter(
+        Q(stripe_subscription_id__isnull=True) | Q(stripe_subscription_id='') | Q(status='canceled')
+    )
+
+
+def rollover_batch(batch_size=None, now=None):
+    """
+    Move one batch of subscriptions to the period containing `now` and reset
+    token usage, with one bulk UPDATE. Subscriptions several periods behind
+    (or without a period yet) go straight to the current one.
+    
+    Returns:
+        number of subscriptions rolled over
+    """
+    batch_size = batch_size or settings.BILLING_ROLLOVER_BATCH_SIZE
+    now = now or timezone.now()
+    free_tokens = settings.SUBSCRIPTION_PLANS['free']['tokens_per_month']
+    with transaction.atomic():
+        subscriptions = list(
+            _due(now)
+            .select_for_update(skip_locked=True, of=('self',))
+            .select_related('plan')
+            .order_by('current_period_end')
+            .only('id', 'organization_id', 'status', 'created_at', 'plan__tokens_per_month')[:batch_size]
+        )
+        if not subscriptions:
+            return 0
+        
+        for subscription in subscriptions:
+            start, end = current_period(subscription.created_at, now)
+            subscription.current_period_start = start
+            subscription.current_period_end = end
+            subscription.tokens_used_this_period = 0
+            subscription.tokens_remaining = (
+                free_tokens if subscription.status == 'canceled' else subscription.plan.tokens_per_month
+            )
+            subscription.updated_at = now
+        Subscription.objects.bulk_update(subscriptions, [
+            'current_period_start', 'current_period_end', 'tokens_used_this_period',
+            'tokens_remaining', 'updated_at'
+        ])
+        # bulk_update sends no signals
+        invalidate_entitlements(subscription.organization_id for subscription in subscriptions)
+    return len(subscriptions)
+
+
+def rollover_billing_periods(batch_size=None, now=None):
+    """
+    Roll over every subscription whose period has ended.
+    
+    Returns:
+        number of subscriptions rolled over
+    """
+    now = now or timezone.now()
+    total = 0
+    while True:
+        rolled = rollover_batch(batch_size, now)
+        if not rolled:
+            break
+        total += rolled
+    if total:
+        logger.info(f"Rolled over {total} subscription billing periods")
+    return total
@@ -0,0 +1,164 @@
+"""
+Resynchronization of subscriptions from Stripe.
+
+Recovers from missed webhooks without replaying events: Stripe's
+subscription list is split into creation-time windows that a small thread
+pool pages through in parallel, and each finished window is compared with
+our rows and corrected with bulk_update on the main thread (worker threads
+never touch the database). Set STRIPE_API_BASE to run against stripe-mock.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Min
+from django.utils import timezone
+
+from .entitlements import invalidate_entitlements
+from .models import Subscription
+from .stripe_service import StripeService
+
+logger = logging.getLogger(__name__)
+
+SYNCED_FIELDS = ['status', 'current_period_start', 'current_period_end', 'cancel_at_period_end']
+
+# Stripe statuses we do not model
+STATUS_MAP = {
+    'unpaid': 'past_due',
+    'incomplete': 'past_due',
+    'incomplete_expired': 'canceled',
+    'paused': 'canceled',
+}
+
+SAMPLE_SIZE = 20
+
+
+def _timestamp(value):
+    if value is None:
+        return None
+    return datetime.fromtimestamp(value, tz=dt_timezone.utc)
+
+
+def _snapshot(stripe_subscription):
+    """The fields we keep, in our representation."""
+    status = stripe_subscription['status']
+    return {
+        'status': STATUS_MAP.get(status, status),
+        'current_period_start': _timestamp(stripe_subscription.get('current_period_start')),
+        'current_period_end': _timestamp(stripe_subscription.get('current_period_end')),
+        'cancel_at_period_end': bool(stripe_subscription.get('cancel_at_period_end')),
+    }
+
+
+class StripeSubscriptionResync:
+    """Compares Stripe subscriptions with ours and applies corrections."""
+    
+    def __init__(self, workers=None, windows=None, batch_size=None, dry_run=False):
+        self.workers = workers or settings.STRIPE_RESYNC_WORKERS
+        self.windows = windows or settings.STRIPE_RESYNC_WINDOWS
+        self.batch_size = batch_size or settings.STRIPE_RESYNC_BATCH_SIZE
+        self.dry_run = dry_run
+    
+    def run(self, since=None, until=None):
+        """
+        Resync subscriptions created in Stripe between since and until,
+        by default covering every subscription we have a Stripe id for.
+        
+        Returns:
+            dict with fetched, unknown, drifted and updated counts, drift per
+            field, a sample of drifted ids and any failed windows
+        """
+        report = {
+            'fetched': 0,
+            'unknown': 0,
+            'drifted': 0,
+            'updated': 0,
+            'drift': dict.fromkeys(SYNCED_FIELDS, 0),
+            'sample': [],
+            'errors': [],
+        }
+        if since is None:
+            earliest = Subscription.objects.filter(
+                stripe_subscription_id__isnull=False
+            ).exclude(stripe_subscription_id='').aggregate(earliest=Min('created_at'))['earliest']
+            if earliest is None:
+                return report
+            # Stripe creates the subscription before our row exists
+            since = earliest - timedelta(days=1)
+        until = until or timezone.now() + timedelta(minutes=1)
+        
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = [
+                pool.submit(self._fetch_window, start, end)
+                for start, end in self._split(since, until)
+            ]
+            for future in as_completed(futures):
+                snapshots, error = future.result()
+                if error:
+                    report['errors'].append(error)
+                self._apply(snapshots, report)
+        
+        logger.info(
+            f"Stripe subscription resync: {report['fetched']} fetched, {report['drifted']} drifted, "
+            f"{report['updated']} updated, {report['unknown']} unknown, {len(report['errors'])} failed windows"
+        )
+        return report
+    
+    def _split(self, since, until):
+        """Equal creation-time windows as Unix timestamps, [start, end)."""
+        start, end = int(since.timestamp()), int(until.timestamp()) + 1
+        step = max(1, -(-(end - start) // self.windows))
+        return [(low, min(low + step, end)) for low in range(start, end, step)]
+    
+    def _fetch_window(self, start, end):
+        """Every subscription in one window, as {stripe id: snapshot}; runs in a worker thread."""
+        snapshots = {}
+        starting_after = None
+        while True:
+            result = StripeService.list_subscriptions(start, end, starting_after=starting_after)
+            if not result['success']:
+                return snapshots, f"window {start}-{end}: {result['error']}"
+            for stripe_subscription in result['subscriptions']:
+                snapshots[stripe_subscription['id']] = _snapshot(stripe_subscription)
+            if not result['has_more'] or not result['subscriptions']:
+                return snapshots, None
+            starting_after = result['subscriptions'][-1]['id']
+    
+    def _apply(self, snapshots, report):
+        """Compare one window with our rows and bulk_update the drifted ones."""
+        report['fetched'] += len(snapshots)
+        stripe_ids = list(snapshots)
+        for i in range(0, len(stripe_ids), self.batch_size):
+            chunk = stripe_ids[i:i + self.batch_size]
+            subscriptions = list(
+                Subscription.objects.filter(stripe_subscription_id__in=chunk)
+                .only('id', 'organization_id', 'stripe_subscription_id', *SYNCED_FIELDS)
+            )
+            report['unknown'] += len(chunk) - len(subscriptions)
+            
+            now = timezone.now()
+            changed = []
+            for subscription in subscriptions:
+                snapshot = snapshots[subscription.stripe_subscription_id]
+                fields = [
+                    field for field in SYNCED_FIELDS
+                    if snapshot[field] != getattr(subscription, field)
+                ]
+                if not fields:
+                    continue
+                for field in fields:
+                    report['drift'][field] += 1
+                    setattr(subscription, field, snapshot[field])
+                subscription.updated_at = now
+                changed.append(subscription)
+                if len(report['sample']) < SAMPLE_SIZE:
+                    report['sample'].append((subscription.stripe_subscription_id, fields))
+            
+            report['drifted'] += len(changed)
+            if changed and not self.dry_run:
+                Subscription.objects.bulk_update(changed, [*SYNCED_FIELDS, 'updated_at'])
+                # bulk_update sends no signals
+                invalidate_entitlements(subscription.organization_id for subscription in changed)
+                report['updated'] += len(changed)
@@ -1,6 +1,7 @@
 """Subscription serializers."""
 from rest_framework import serializers
 from .models import Plan, Subscription
+from .entitlements import get_plan_catalog
 
 
 class PlanSerializer(serializers.ModelSerializer):
@@ -14,7 +15,7 @@ class PlanSerializer(serializers.ModelSerializer):
 
 class SubscriptionSerializer(serializers.ModelSerializer):
     """Serializer for subscriptions."""
-    plan_details = PlanSerializer(source='plan', read_only=True)
+    plan_details = serializers.SerializerMethodField()
     
     class Meta:
         model = Subscription
@@ -22,3 +23,10 @@ class SubscriptionSerializer(serializers.ModelSerializer):
                   'tokens_used_this_period', 'tokens_remaining', 
                   'current_period_end', 'cancel_at_period_end']
         read_only_fields = ['id', 'status', 'tokens_used_this_period', 'tokens_remaining']
+    
+    def get_plan_details(self, obj):
+        # From the cached catalog, so listing subscriptions never joins plans
+        plan = get_plan_catalog().get(str(obj.plan_id))
+        if plan is None:
+            return None
+        return {field: plan[field] for field in PlanSerializer.Meta.fields}
@@ -0,0 +1,29 @@
+"""
+Signal handlers for subscriptions app.
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.organizations.models import Organization
+from .models import Plan, Subscription, StripeCustomer
+from .entitlements import invalidate_entitlements, invalidate_plan_catalog
+
+
+@receiver(post_save, sender=Subscription)
+@receiver(post_delete, sender=Subscription)
+def invalidate_subscription_entitlements(sender, instance, **kwargs):
+    """Webhook handlers and admin edits all save through the model."""
+    invalidate_entitlements([instance.organization_id])
+
+
+@receiver(post_save, sender=Plan)
+@receiver(post_delete, sender=Plan)
+def invalidate_catalog(sender, instance, **kwargs):
+    invalidate_plan_catalog()
+
+
+@receiver(post_save, sender=Organization)
+def queue_stripe_customer(sender, instance, created, **kwargs):
+    """Have the Stripe customer ready before the first checkout."""
+    if created:
+        StripeCustomer.objects.create(organization=instance)
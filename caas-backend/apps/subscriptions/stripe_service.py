@@ -6,6 +6,9 @@ import logging
 from django.conf import settings
 
 stripe.api_key = settings.STRIPE_SECRET_KEY
+if settings.STRIPE_API_BASE:
+    # e.g. a local stripe-mock for development and tests
+    stripe.api_base = settings.STRIPE_API_BASE
 logger = logging.getLogger(__name__)
 
 
@@ -13,12 +16,22 @@ class StripeService:
     """Service for Stripe payment operations."""
     
     @staticmethod
-    def create_customer(email, name):
-        """Create a Stripe customer."""
+    def create_customer(email, name, organization_id=None):
+        """
+        Create a Stripe customer. With an organization id the request is
+        idempotent, so retries and concurrent callers get the same customer.
+        """
+        options = {}
+        if organization_id is not None:
+            options = {
+                'metadata': {'organization_id': str(organization_id)},
+                'idempotency_key': f"customer-{organization_id}",
+            }
         try:
             customer = stripe.Customer.create(
                 email=email,
-                name=name
+                name=name,
+                **options
             )
             return {'success': True, 'customer_id': customer.id}
         except stripe.error.StripeError as e:
@@ -61,6 +74,26 @@ class StripeService:
             logger.error(f"Subscription cancellation failed: {e}")
             return {'success': False, 'error': str(e)}
     
+    @staticmethod
+    def list_subscriptions(created_gte, created_lt, starting_after=None, limit=100):
+        """
+        One page of subscriptions (any status) created in [created_gte, created_lt),
+        as Unix timestamps.
+        """
+        params = {
+            'status': 'all',
+            'created': {'gte': created_gte, 'lt': created_lt},
+            'limit': limit,
+        }
+        if starting_after:
+            params['starting_after'] = starting_after
+        try:
+            page = stripe.Subscription.list(**params)
+            return {'success': True, 'subscriptions': page.data, 'has_more': page.has_more}
+        except stripe.error.StripeError as e:
+            logger.error(f"Subscription listing failed: {e}")
+            return {'success': False, 'error': str(e)}
+    
     @staticmethod
     def verify_webhook_signature(payload, sig_header):
         """Verify Stripe webhook signature."""
@@ -1,4 +1,6 @@
 """Subscription views."""
+from decimal import Decimal
+
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -8,7 +10,11 @@ from django.conf import settings
 from .models import Plan, Subscription
 from .serializers import PlanSerializer, SubscriptionSerializer
 from .stripe_service import StripeService
+from .entitlements import get_entitlements, get_plan_catalog
+from .customers import get_customer_id
 from apps.organizations.models import Organization
+from apps.organizations.access import get_access
+from apps.organizations.permissions import HasOrganizationPermission
 
 
 class PlanViewSet(viewsets.ReadOnlyModelViewSet):
@@ -16,40 +22,62 @@ class PlanViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Plan.objects.filter(is_active=True)
     serializer_class = PlanSerializer
     permission_classes = [IsAuthenticated]
+    
+    def list(self, request, *args, **kwargs):
+        plans = sorted(
+            (plan for plan in get_plan_catalog().values() if plan['is_active']),
+            key=lambda plan: Decimal(plan['price_monthly'])
+        )
+        return Response([
+            {field: plan[field] for field in PlanSerializer.Meta.fields} for plan in plans
+        ])
 
 
 class SubscriptionViewSet(viewsets.ModelViewSet):
     """ViewSet for subscription management."""
     serializer_class = SubscriptionSerializer
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAuthenticated, HasOrganizationPermission]
+    permission_resource = 'subscription'
+    action_permissions = {
+        'update': 'subscription.manage',
+        'partial_update': 'subscription.manage',
+        'destroy': 'subscription.manage',
+    }
     
     def get_queryset(self):
-        org_ids = self.request.user.organization_memberships.values_list('organization_id', flat=True)
-        return Subscription.objects.filter(organization_id__in=org_ids)
+        return Subscription.objects.filter(organization_id__in=get_access(self.request).org_ids())
+    
+    def perform_create(self, serializer):
+        get_access(self.request).require('subscription.manage', serializer.validated_data['organization'].id)
+        serializer.save()
+    
+    @action(detail=False, methods=['get'])
+    def entitlements(self, request):
+        """
+        Plan tier, limits, features and status for an organization.
+        GET /api/v1/subscriptions/entitlements/?organization={id}
+        """
+        org_id = request.query_params.get('organization')
+        get_access(request).require('subscription.view', org_id)
+        return Response(get_entitlements(org_id))
     
     @action(detail=False, methods=['post'])
     def create_checkout_session(self, request):
         """Create Stripe checkout session for upgrading."""
         org_id = request.data.get('organization_id')
         plan_id = request.data.get('plan_id')
+        get_access(request).require('subscription.manage', org_id)
         
         try:
-            org = Organization.objects.get(id=org_id)
+            org = Organization.objects.select_related('owner').get(id=org_id)
             plan = Plan.objects.get(id=plan_id)
             
-            # Create Stripe customer if needed
-            subscription = Subscription.objects.filter(organization=org).first()
-            if not subscription or not subscription.stripe_customer_id:
-                customer_result = StripeService.create_customer(
-                    email=org.owner.email,
-                    name=org.name
-                )
-                if not customer_result['success']:
-                    return Response({'error': customer_result['error']}, 
-                                    status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-                customer_id = customer_result['customer_id']
-            else:
-                customer_id = subscription.stripe_customer_id
+            # Normally created in the background when the organization was created
+            customer_result = get_customer_id(org)
+            if not customer_result['success']:
+                return Response({'error': customer_result['error']},
+                                status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            customer_id = customer_result['customer_id']
             
             # Create checkout session
             success_url = f"{settings.FRONTEND_EDITOR_URL}/subscription/success"
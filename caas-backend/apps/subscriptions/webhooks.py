@@ -1,15 +1,17 @@
 """
 Stripe webhook handlers.
 """
+import json
 import logging
+from datetime import datetime
+from datetime import timezone as dt_timezone
+
 from django.views.decorators.csrf import csrf_exempt
 from django.http import HttpResponse
 from django.views.decorators.http import require_POST
-from django.utils import timezone
 
-from .models import Subscription, Plan
+from .models import Subscription, Plan, StripeEvent
 from .stripe_service import StripeService
-from apps.organizations.models import Organization
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +22,9 @@ def stripe_webhook(request):
     """
     Handle Stripe webhooks.
     POST /api/v1/subscriptions/webhook/
+    
+    Events are only verified and stored here; `manage.py process_stripe_events`
+    applies them. Redelivered events hit the unique event id and are ignored.
     """
     payload = request.body
     sig_header = request.META.get('HTTP_STRIPE_SIGNATURE')
@@ -30,35 +35,34 @@ def stripe_webhook(request):
         logger.warning(f"Webhook verification failed: {result['error']}")
         return HttpResponse(status=400)
     
-    event = result['event']
+    event = json.loads(payload)
     event_type = event['type']
-    
-    logger.info(f"Processing Stripe webhook: {event_type}")
-    
-    try:
-        if event_type == 'checkout.session.completed':
-            handle_checkout_completed(event['data']['object'])
-        
-        elif event_type == 'customer.subscription.created':
-            handle_subscription_created(event['data']['object'])
-        
-        elif event_type == 'customer.subscription.updated':
-            handle_subscription_updated(event['data']['object'])
-        
-        elif event_type == 'customer.subscription.deleted':
-            handle_subscription_deleted(event['data']['object'])
-        
-        elif event_type == 'invoice.payment_succeeded':
-            handle_payment_succeeded(event['data']['object'])
-        
-        elif event_type == 'invoice.payment_failed':
-            handle_payment_failed(event['data']['object'])
-        
+    if event_type not in EVENT_HANDLERS:
         return HttpResponse(status=200)
     
-    except Exception as e:
-        logger.error(f"Webhook processing error: {e}")
-        return HttpResponse(status=500)
+    StripeEvent.objects.bulk_create([
+        StripeEvent(
+            stripe_event_id=event['id'],
+            event_type=event_type,
+            ordering_key=ordering_key(event),
+            payload=event,
+            stripe_created_at=datetime.fromtimestamp(event['created'], tz=dt_timezone.utc)
+        )
+    ], ignore_conflicts=True)
+    
+    logger.info(f"Queued Stripe webhook {event['id']}: {event_type}")
+    return HttpResponse(status=200)
+
+
+def ordering_key(event):
+    """
+    Key that serializes processing: the Stripe subscription the event is
+    about, else its customer, else the event itself.
+    """
+    obj = event['data']['object']
+    if event['type'].startswith('customer.subscription.'):
+        return obj['id']
+    return obj.get('subscription') or obj.get('customer') or event['id']
 
 
 def handle_checkout_completed(session):
@@ -80,11 +84,11 @@ def handle_subscription_created(stripe_subscription):
     try:
         subscription = Subscription.objects.get(stripe_subscription_id=subscription_id)
         subscription.status = status
-        subscription.current_period_start = timezone.datetime.fromtimestamp(
-            stripe_subscription['current_period_start'], tz=timezone.utc
+        subscription.current_period_start = datetime.fromtimestamp(
+            stripe_subscription['current_period_start'], tz=dt_timezone.utc
         )
-        subscription.current_period_end = timezone.datetime.fromtimestamp(
-            stripe_subscription['current_period_end'], tz=timezone.utc
+        subscription.current_period_end = datetime.fromtimestamp(
+            stripe_subscription['current_period_end'], tz=dt_timezone.utc
         )
         subscription.tokens_remaining = subscription.plan.tokens_per_month
         subscription.save()
@@ -154,3 +158,13 @@ def handle_payment_failed(invoice):
             logger.warning(f"Payment failed for subscription {subscription_id}")
         except Subscription.DoesNotExist:
             logger.warning(f"Subscription {subscription_id} not found")
+
+
+EVENT_HANDLERS = {
+    'checkout.session.completed': handle_checkout_completed,
+    'customer.subscription.created': handle_subscription_created,
+    'customer.subscription.updated': handle_subscription_updated,
+    'customer.subscription.deleted': handle_subscription_deleted,
+    'invoice.payment_succeeded': handle_payment_succeeded,
+    'invoice.payment_failed': handle_payment_failed,
+}
@@ -0,0 +1,119 @@
+"""
+JWT authentication without a users query per request.
+
+The user is resolved from a compact snapshot (the fields authentication and
+most views need) cached in Redis and in a small bounded in-process LRU, and
+only read from the database on a miss. request.user is a real User built
+from the snapshot with every other field deferred, so views that need, say,
+the bio still load it on access. User saves drop the snapshot on commit
+(see signals.py); other processes see the change once their short
+in-process entries expire.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import User
+from .revocation import is_revoked
+from .tokens import TOKEN_VERSION_CLAIM
+
+SNAPSHOT_KEY = 'users:snapshot:{user_id}'
+SNAPSHOT_FIELDS = ['id', 'email', 'username', 'is_active', 'is_staff', 'is_superuser', 'token_version']
+
+_local = OrderedDict()
+_local_lock = threading.Lock()
+
+
+def _local_get(user_id):
+    with _local_lock:
+        entry = _local.get(user_id)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del _local[user_id]
+            return None
+        _local.move_to_end(user_id)
+        return entry[1]
+
+
+def _local_set(user_id, snapshot):
+    with _local_lock:
+        _local[user_id] = (time.monotonic() + settings.USER_SNAPSHOT_LOCAL_CACHE_SECONDS, snapshot)
+        _local.move_to_end(user_id)
+        while len(_local) > settings.USER_SNAPSHOT_LOCAL_MAX_ENTRIES:
+            _local.popitem(last=False)
+
+
+def get_user_snapshot(user_id):
+    """Snapshot dict of SNAPSHOT_FIELDS for a user id, or None if there is no such user."""
+    user_id = str(user_id)
+    snapshot = _local_get(user_id)
+    if snapshot is not None:
+        return snapshot
+    
+    key = SNAPSHOT_KEY.format(user_id=user_id)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = User.objects.filter(id=user_id).values(*SNAPSHOT_FIELDS).first()
+        if snapshot is None:
+            return None
+        cache.set(key, snapshot, timeout=settings.USER_SNAPSHOT_CACHE_SECONDS)
+    _local_set(user_id, snapshot)
+    return snapshot
+
+
+def user_from_snapshot(snapshot):
+    """A User instance with the snapshot fields loaded and the rest deferred."""
+    field_names = [field.attname for field in User._meta.concrete_fields if field.attname in snapshot]
+    return User.from_db('default', field_names, [snapshot[name] for name in field_names])
+
+
+def _forget(user_ids):
+    cache.delete_many([SNAPSHOT_KEY.format(user_id=user_id) for user_id in user_ids])
+    with _local_lock:
+        for user_id in user_ids:
+            _local.pop(user_id, None)
+
+
+def invalidate_user_snapshots(user_ids):
+    """Drop cached snapshots once the transaction commits."""
+    user_ids = {str(user_id) for user_id in user_ids}
+    if user_ids:
+        transaction.on_commit(lambda: _forget(user_ids))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication reading the user from the snapshot cache."""
+    
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+        if is_revoked(validated_token[api_settings.JTI_CLAIM]):
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+        return validated_token
+    
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        
+        snapshot = get_user_snapshot(user_id)
+        if snapshot is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        
+        if not snapshot['is_active']:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        
+        # Tokens issued before versioning carry no claim and count as version 0
+        if validated_token.get(TOKEN_VERSION_CLAIM, 0) != snapshot['token_version']:
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+        
+        return user_from_snapshot(snapshot)
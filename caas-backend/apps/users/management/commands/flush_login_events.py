@@ -0,0 +1,32 @@
+"""
+Write buffered logins (last_login, last_login_ip) to the users table.
+
+Usage:
+    python manage.py flush_login_events                       # once
+    python manage.py flush_login_events --loop --interval 60  # as a worker
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.users.logins import flush_login_events
+
+
+class Command(BaseCommand):
+    help = 'Flush buffered login events with one write per user.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None, help='Users per UPDATE')
+        parser.add_argument('--loop', action='store_true', help='Flush periodically instead of once')
+        parser.add_argument('--interval', type=float, default=None, help='Seconds between flushes (with --loop)')
+    
+    def handle(self, *args, **options):
+        interval = options['interval'] or settings.LOGIN_EVENTS_FLUSH_SECONDS
+        while True:
+            flushed = flush_login_events(batch_size=options['batch_size'])
+            if flushed or not options['loop']:
+                self.stdout.write(f"Recorded logins for {flushed} users")
+            if not options['loop']:
+                break
+            time.sleep(interval)
@@ -3,7 +3,9 @@ User models for authentication and profile management.
 """
 import uuid
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import OpClass
 from django.db import models
+from django.db.models.functions import Upper
 
 
 class User(AbstractUser):
@@ -30,6 +32,9 @@ class User(AbstractUser):
     updated_at = models.DateTimeField(auto_now=True)
     last_login_ip = models.GenericIPAddressField(blank=True, null=True)
     
+    # Bumped to invalidate every token issued before (e.g. on password change)
+    token_version = models.PositiveIntegerField(default=0)
+    
     # Override username requirement - use email as primary identifier
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username', 'first_name', 'last_name']
@@ -40,6 +45,10 @@ class User(AbstractUser):
         indexes = [
             models.Index(fields=['email']),
             models.Index(fields=['created_at']),
+            # Case-insensitive prefix search (istartswith) in the member directory
+            models.Index(OpClass(Upper('email'), name='text_pattern_ops'), name='users_email_upper_prefix_idx'),
+            models.Index(OpClass(Upper('first_name'), name='text_pattern_ops'), name='users_first_upper_prefix_idx'),
+            models.Index(OpClass(Upper('last_name'), name='text_pattern_ops'), name='users_last_upper_prefix_idx'),
         ]
     
     def __str__(self):
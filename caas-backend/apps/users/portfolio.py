@@ -0,0 +1,101 @@
+"""
+Cached public portfolio pages.
+
+A portfolio (profile plus the owner's latest public content) is built once
+and cached by slug together with its ETag and Last-Modified, so the
+anonymous endpoint is a single cache read and answers conditional requests
+with 304. Changes to the user, the profile or any of the user's content
+delete the entry on commit (see signals.py) and stamp the slug with the
+change time. The stamp is a floor for Last-Modified, which would otherwise
+move backwards when the newest public item is unpublished or deleted and
+leave If-Modified-Since clients with a stale 304. Missing portfolios are
+cached only briefly.
+"""
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Max
+
+from apps.content.models import Content
+from .models import UserProfile
+from .serializers import PortfolioContentSerializer
+
+PORTFOLIO_KEY = 'users:portfolio:{slug}'
+CHANGED_KEY = 'users:portfolio:changed:{slug}'
+
+
+def _build(slug):
+    changed = cache.get(CHANGED_KEY.format(slug=slug), 0)
+    profile = UserProfile.objects.select_related('user').filter(
+        portfolio_slug=slug, public_portfolio=True, user__is_active=True
+    ).first()
+    if profile is None:
+        return {'data': None}
+    
+    user = profile.user
+    contents = Content.objects.filter(created_by=user, is_public=True).order_by('-created_at')
+    items = PortfolioContentSerializer(contents[:settings.PORTFOLIO_MAX_ITEMS], many=True).data
+    content_modified = contents.aggregate(last=Max('updated_at'))['last']
+    
+    data = {
+        'slug': profile.portfolio_slug,
+        'name': user.get_full_name() or user.username,
+        'avatar_url': user.avatar_url,
+        'bio': profile.portfolio_bio,
+        'theme': profile.portfolio_theme,
+        'content': items,
+    }
+    last_modified = max(filter(None, [profile.updated_at, user.updated_at, content_modified]))
+    return {
+        'data': data,
+        'etag': '"{}"'.format(hashlib.md5(json.dumps(data, sort_keys=True).encode()).hexdigest()),
+        'last_modified': max(int(last_modified.timestamp()), changed),
+    }
+
+
+def get_portfolio(slug):
+    """
+    Cached portfolio for a slug.
+    
+    Returns:
+        dict with data (None if there is no public portfolio), etag and last_modified
+    """
+    key = PORTFOLIO_KEY.format(slug=slug)
+    entry = cache.get(key)
+    if entry is None:
+        entry = _build(slug)
+        timeout = settings.PORTFOLIO_CACHE_SECONDS if entry['data'] else settings.PORTFOLIO_MISSING_CACHE_SECONDS
+        cache.set(key, entry, timeout=timeout)
+    return entry
+
+
+def _forget(user_ids, slugs):
+    slugs = set(slugs)
+    if user_ids:
+        slugs.update(
+            UserProfile.objects.filter(user_id__in=user_ids, portfolio_slug__isnull=False)
+            .values_list('portfolio_slug', flat=True)
+        )
+    slugs = {slug for slug in slugs if slug}
+    if not slugs:
+        return
+    
+    # Change stamps only move forward and outlive the entries they guard
+    now = int(time.time())
+    stamps = cache.get_many([CHANGED_KEY.format(slug=slug) for slug in slugs])
+    cache.set_many({
+        CHANGED_KEY.format(slug=slug): max(now, stamps.get(CHANGED_KEY.format(slug=slug), 0))
+        for slug in slugs
+    }, timeout=None)
+    cache.delete_many([PORTFOLIO_KEY.format(slug=slug) for slug in slugs])
+
+
+def invalidate_portfolios(user_ids=(), slugs=()):
+    """Drop cached portfolios of users, or under specific slugs, once the transaction commits."""
+    user_ids, slugs = set(user_ids), set(slugs)
+    if user_ids or slugs:
+        transaction.on_commit(lambda: _forget(user_ids, slugs))
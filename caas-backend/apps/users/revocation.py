@@ -0,0 +1,124 @@
+"""
+Revocation of JWTs by jti, stored in Redis.
+
+A revoked token gets a `users:revoked:<jti>` key that expires with the
+token, and an entry in a sorted set scored by expiry. Each process keeps a
+Bloom filter of the set, rebuilt every few seconds, so checking a token
+that was never revoked (nearly every request) needs no round trip; only
+filter hits are confirmed against the key. Revocations made in another
+process are seen once the local filter is next rebuilt.
+
+Refresh tokens used up by rotation only get the key: the refresh endpoint
+claims it with an atomic add, and nothing else checks them, so they stay
+out of the set and the filters rebuilt from it.
+"""
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django_redis import get_redis_connection
+from rest_framework_simplejwt.settings import api_settings
+
+REVOKED_KEY = 'users:revoked:{jti}'
+REVOKED_SET = 'users:revoked_jtis'
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings."""
+    
+    def __init__(self, capacity, error_rate=0.01):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+    
+    def _positions(self, value):
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little')
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+    
+    def add(self, value):
+        for position in self._positions(value):
+            self.bits[position // 8] |= 1 << (position % 8)
+    
+    def __contains__(self, value):
+        return all(self.bits[position // 8] & (1 << (position % 8)) for position in self._positions(value))
+
+
+_filter = None
+_filter_built_at = 0.0
+_filter_lock = threading.Lock()
+
+
+def _redis():
+    return get_redis_connection('default')
+
+
+def _rebuild_filter(now):
+    connection = _redis()
+    key = cache.make_key(REVOKED_SET)
+    connection.zremrangebyscore(key, '-inf', now)
+    jtis = connection.zrangebyscore(key, now, '+inf')
+    bloom = BloomFilter(
+        max(2 * len(jtis), settings.TOKEN_REVOCATION_FILTER_MIN_CAPACITY),
+        settings.TOKEN_REVOCATION_FILTER_ERROR_RATE
+    )
+    for jti in jtis:
+        bloom.add(jti.decode() if isinstance(jti, bytes) else jti)
+    return bloom
+
+
+def _current_filter():
+    global _filter, _filter_built_at
+    if _filter is not None and time.monotonic() - _filter_built_at < settings.TOKEN_REVOCATION_FILTER_REFRESH_SECONDS:
+        return _filter
+    with _filter_lock:
+        if _filter is None or time.monotonic() - _filter_built_at >= settings.TOKEN_REVOCATION_FILTER_REFRESH_SECONDS:
+            _filter = _rebuild_filter(int(time.time()))
+            _filter_built_at = time.monotonic()
+    return _filter
+
+
+def _claim(token):
+    ttl = int(token['exp']) - int(time.time())
+    return ttl <= 0 or cache.add(REVOKED_KEY.format(jti=token[api_settings.JTI_CLAIM]), 1, timeout=ttl)
+
+
+def consume_refresh_token(token):
+    """
+    Mark a refresh token as rotated, so it cannot be rotated again.
+    
+    Returns:
+        False if it was already rotated or revoked, True otherwise
+    """
+    return _claim(token)
+
+
+def revoke_token(token):
+    """
+    Revoke a token until it expires, so is_revoked reports it.
+    
+    Returns:
+        False if it was already revoked, True otherwise
+    """
+    jti = token[api_settings.JTI_CLAIM]
+    exp = int(token['exp'])
+    if exp <= int(time.time()):
+        return True
+    
+    if not _claim(token):
+        return False
+    _redis().zadd(cache.make_key(REVOKED_SET), {jti: exp})
+    with _filter_lock:
+        if _filter is not None:
+            _filter.add(jti)
+    return True
+
+
+def is_revoked(jti):
+    """Whether a jti has been revoked; usually answered from the local filter alone."""
+    if jti not in _current_filter():
+        return False
+    return cache.get(REVOKED_KEY.format(jti=jti)) is not None
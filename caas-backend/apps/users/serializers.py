@@ -3,6 +3,7 @@ Serializers for user authentication and profile management.
 """
 from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
+from apps.content.models import Content
 from .models import User, UserProfile
 
 
@@ -71,3 +72,11 @@ class PasswordChangeSerializer(serializers.Serializer):
         if not user.check_password(value):
             raise serializers.ValidationError("Old password is incorrect.")
         return value
+
+
+class PortfolioContentSerializer(serializers.ModelSerializer):
+    """Public content item on a portfolio page."""
+    
+    class Meta:
+        model = Content
+        fields = ['id', 'platform', 'tone', 'generated_text', 'created_at']
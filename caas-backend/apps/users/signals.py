@@ -1,9 +1,11 @@
 """
 Signal handlers for user app.
 """
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
+from .authentication import invalidate_user_snapshots
 from .models import User, UserProfile
+from .portfolio import invalidate_portfolios
 
 
 @receiver(post_save, sender=User)
@@ -16,3 +18,34 @@ def create_user_profile(sender, instance, created, **kwargs):
             user=instance,
             portfolio_slug=instance.username  # Initialize with username
         )
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_snapshot(sender, instance, **kwargs):
+    """Drop the cached authentication snapshot and portfolio of a changed user."""
+    invalidate_user_snapshots([instance.pk])
+    invalidate_portfolios(user_ids=[instance.pk])
+
+
+@receiver(pre_save, sender=UserProfile)
+def remember_portfolio_slug(sender, instance, **kwargs):
+    """Keep the stored slug so a renamed portfolio's old page is dropped too."""
+    instance._stored_portfolio_slug = UserProfile.objects.filter(
+        pk=instance.pk
+    ).values_list('portfolio_slug', flat=True).first()
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_profile_portfolio(sender, instance, **kwargs):
+    invalidate_portfolios(
+        slugs=[instance.portfolio_slug, getattr(instance, '_stored_portfolio_slug', None)]
+    )
+
+
+@receiver(post_save, sender='content.Content')
+@receiver(post_delete, sender='content.Content')
+def invalidate_content_portfolio(sender, instance, **kwargs):
+    """Content changes can add to or remove from the author's portfolio."""
+    invalidate_portfolios(user_ids=[instance.created_by_id])
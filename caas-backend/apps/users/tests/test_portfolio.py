@@ -0,0 +1,79 @@
+"""
+Conditional requests against the cached public portfolio.
+"""
+import uuid
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from django.utils.http import http_date
+
+from apps.content.models import Content
+from apps.organizations.models import Organization
+from apps.users.models import UserProfile
+
+User = get_user_model()
+
+
+@pytest.fixture
+def portfolio(api_client):
+    """A public portfolio with two public posts, last changed an hour and two hours ago."""
+    suffix = uuid.uuid4().hex[:12]
+    user = User.objects.create_user(email=f"{suffix}@example.com", username=suffix, password='x')
+    organization = Organization.objects.create(name=f"Org {suffix}", owner=user)
+    UserProfile.objects.filter(user=user).update(public_portfolio=True)
+    posts = [
+        Content.objects.create(
+            organization=organization, created_by=user, platform='twitter',
+            prompt='prompt', generated_text=f"post {i}", tone='casual', is_public=True
+        )
+        for i in range(2)
+    ]
+    an_hour_ago = timezone.now() - timedelta(hours=1)
+    # Backdated with update(), so no signal stamps the change
+    User.objects.filter(pk=user.pk).update(updated_at=an_hour_ago - timedelta(hours=1))
+    UserProfile.objects.filter(user=user).update(updated_at=an_hour_ago - timedelta(hours=1))
+    Content.objects.filter(pk=posts[0].pk).update(updated_at=an_hour_ago - timedelta(hours=1))
+    Content.objects.filter(pk=posts[1].pk).update(updated_at=an_hour_ago)
+    return api_client, f"/api/v1/auth/portfolio/{suffix}/", posts
+
+
+@pytest.mark.django_db
+def test_unchanged_portfolio_is_not_modified(portfolio):
+    client, url, _ = portfolio
+    response = client.get(url)
+    assert response.status_code == 200
+    
+    response = client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+    assert response.status_code == 304
+
+
+@pytest.mark.django_db
+def test_unpublishing_the_newest_post_modifies_the_portfolio(portfolio, django_capture_on_commit_callbacks):
+    client, url, posts = portfolio
+    response = client.get(url)
+    last_modified = response['Last-Modified']
+    assert len(response.data['content']) == 2
+    
+    with django_capture_on_commit_callbacks(execute=True):
+        newest = Content.objects.get(pk=posts[1].pk)
+        newest.is_public = False
+        newest.save()
+    
+    response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert response.status_code == 200
+    assert [item['id'] for item in response.data['content']] == [str(posts[0].pk)]
+    assert response['Last-Modified'] != last_modified
+
+
+@pytest.mark.django_db
+def test_missing_portfolio_is_cached_briefly(api_client, settings):
+    settings.PORTFOLIO_MISSING_CACHE_SECONDS = 0
+    suffix = uuid.uuid4().hex[:12]
+    url = f"/api/v1/auth/portfolio/{suffix}/"
+    assert api_client.get(url).status_code == 404
+    
+    user = User.objects.create_user(email=f"{suffix}@example.com", username=suffix, password='x')
+    UserProfile.objects.filter(user=user).update(public_portfolio=True)
+    assert api_client.get(url).status_code == 200
@@ -0,0 +1,55 @@
+"""
+JWT tokens carrying the user's token version.
+
+Tokens whose `tv` claim no longer matches `User.token_version` are rejected
+by CachedJWTAuthentication, so bumping the version (on password change)
+invalidates every token issued before. Access tokens inherit the claim from
+the refresh token they are minted from.
+
+Rotated refresh tokens are marked used in Redis (see revocation.py) instead
+of simplejwt's database blacklist.
+"""
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .logins import record_login
+from .revocation import consume_refresh_token, is_revoked
+
+TOKEN_VERSION_CLAIM = 'tv'
+
+
+class UserRefreshToken(RefreshToken):
+    """Refresh token with the user's current token version."""
+    
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[TOKEN_VERSION_CLAIM] = user.token_version
+        return token
+
+
+class UserTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Login serializer issuing versioned tokens and recording the login."""
+    token_class = UserRefreshToken
+    
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        record_login(self.user, self.context['request'])
+        return data
+
+
+class UserTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refresh serializer that rejects revoked tokens and revokes rotated ones."""
+    
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            # Claiming first means a token can only be rotated once, even concurrently
+            if not consume_refresh_token(refresh):
+                raise InvalidToken(_("Token is revoked"))
+        elif is_revoked(refresh[api_settings.JTI_CLAIM]):
+            raise InvalidToken(_("Token is revoked"))
+        return super().validate(attrs)
@@ -18,4 +18,7 @@ urlpatterns = [
     
     # Password
     path('password/change/', views.PasswordChangeView.as_view(), name='password-change'),
+    
+    # Public portfolio
+    path('portfolio/<slug:slug>/', views.PortfolioView.as_view(), name='portfolio'),
 ]
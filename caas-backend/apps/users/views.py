@@ -6,13 +6,20 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from rest_framework_simplejwt.tokens import RefreshToken
+from django.conf import settings
 from django.contrib.auth import update_session_auth_hash
+from django.db.models import F
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 
 from .models import User, UserProfile
 from .serializers import (
     UserSerializer, UserRegistrationSerializer,
     UserProfileSerializer, PasswordChangeSerializer
 )
+from .portfolio import get_portfolio
+from .revocation import revoke_token
+from .tokens import UserRefreshToken
 
 
 class RegisterView(generics.CreateAPIView):
@@ -30,7 +37,7 @@ class RegisterView(generics.CreateAPIView):
         user = serializer.save()
         
         # Generate JWT tokens
-        refresh = RefreshToken.for_user(user)
+        refresh = UserRefreshToken.for_user(user)
         
         return Response({
             'user': UserSerializer(user).data,
@@ -50,7 +57,8 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get_object(self):
-        return self.request.user
+        # request.user only has the authentication snapshot loaded
+        return User.objects.select_related('profile').get(pk=self.request.user.pk)
 
 
 class UserProfileDetailView(generics.RetrieveUpdateAPIView):
@@ -75,17 +83,28 @@ class PasswordChangeView(APIView):
     def post(self, request):
         serializer = PasswordChangeSerializer(data=request.data, context={'request': request})
         if serializer.is_valid():
-            user = request.user
+            user = User.objects.get(pk=request.user.pk)
             user.set_password(serializer.validated_data['new_password'])
+            # Revoke every token issued with the old password
+            user.token_version = F('token_version') + 1
             user.save()
+            user.refresh_from_db(fields=['token_version'])
             update_session_auth_hash(request, user)
-            return Response({'message': 'Password updated successfully.'}, status=status.HTTP_200_OK)
+            
+            refresh = UserRefreshToken.for_user(user)
+            return Response({
+                'message': 'Password updated successfully.',
+                'tokens': {
+                    'refresh': str(refresh),
+                    'access': str(refresh.access_token),
+                }
+            }, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
 class LogoutView(APIView):
     """
-    Logout user by blacklisting refresh token.
+    Logout user by revoking the refresh token and the access token in use.
     POST /api/v1/auth/logout/
     """
     permission_classes = [permissions.IsAuthenticated]
@@ -94,7 +113,36 @@ class LogoutView(APIView):
         try:
             refresh_token = request.data.get('refresh_token')
             token = RefreshToken(refresh_token)
-            token.blacklist()
+            revoke_token(token)
+            revoke_token(request.auth)
             return Response({'message': 'Logout successful.'}, status=status.HTTP_200_OK)
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class PortfolioView(APIView):
+    """
+    Public portfolio: profile and latest public content.
+    GET /api/v1/auth/portfolio/<slug>/
+    
+    Served from cache with ETag and Last-Modified; conditional requests
+    get 304 Not Modified.
+    """
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+    
+    def get(self, request, slug):
+        portfolio = get_portfolio(slug)
+        if portfolio['data'] is None:
+            return Response({'error': 'Portfolio not found'}, status=status.HTTP_404_NOT_FOUND)
+        
+        response = get_conditional_response(
+            request._request,
+            etag=portfolio['etag'],
+            last_modified=portfolio['last_modified'],
+            response=Response(portfolio['data'])
+        )
+        response['ETag'] = portfolio['etag']
+        response['Last-Modified'] = http_date(portfolio['last_modified'])
+        response['Cache-Control'] = f"public, max-age={settings.PORTFOLIO_HTTP_MAX_AGE}"
+        return response
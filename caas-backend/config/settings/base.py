@@ -120,7 +120,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Django REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.users.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -142,14 +142,38 @@ SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=env.int('JWT_ACCESS_TOKEN_LIFETIME', default=15)),
     'REFRESH_TOKEN_LIFETIME': timedelta(minutes=env.int('JWT_REFRESH_TOKEN_LIFETIME', default=10080)),
     'ROTATE_REFRESH_TOKENS': True,
-    'BLACKLIST_AFTER_ROTATION': True,
-    'UPDATE_LAST_LOGIN': True,
+    # Logged-out tokens are revoked, and rotated ones marked used, in Redis (apps/users/revocation.py)
+    'BLACKLIST_AFTER_ROTATION': False,
+    # Logins are buffered and written by `manage.py flush_login_events`
+    'UPDATE_LAST_LOGIN': False,
     'ALGORITHM': 'HS256',
     'SIGNING_KEY': env('JWT_SECRET_KEY', default=SECRET_KEY),
     'AUTH_HEADER_TYPES': ('Bearer',),
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
+    'TOKEN_OBTAIN_SERIALIZER': 'apps.users.tokens.UserTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'apps.users.tokens.UserTokenRefreshSerializer',
 }
 
+# Revoked token ids are mirrored into a per-process Bloom filter, rebuilt this often
+TOKEN_REVOCATION_FILTER_REFRESH_SECONDS = env.int('TOKEN_REVOCATION_FILTER_REFRESH_SECONDS', default=5)
+TOKEN_REVOCATION_FILTER_MIN_CAPACITY = env.int('TOKEN_REVOCATION_FILTER_MIN_CAPACITY', default=10000)
+TOKEN_REVOCATION_FILTER_ERROR_RATE = env.float('TOKEN_REVOCATION_FILTER_ERROR_RATE', default=0.01)
+
+# Buffered last-login tracking (`manage.py flush_login_events`)
+LOGIN_EVENTS_FLUSH_SECONDS = env.int('LOGIN_EVENTS_FLUSH_SECONDS', default=60)
+LOGIN_EVENTS_BATCH_SIZE = env.int('LOGIN_EVENTS_BATCH_SIZE', default=1000)
+
+# Public portfolio pages are cached until the user, profile or their content changes
+PORTFOLIO_CACHE_SECONDS = env.int('PORTFOLIO_CACHE_SECONDS', default=3600)
+PORTFOLIO_MISSING_CACHE_SECONDS = env.int('PORTFOLIO_MISSING_CACHE_SECONDS', default=60)
+PORTFOLIO_HTTP_MAX_AGE = env.int('PORTFOLIO_HTTP_MAX_AGE', default=60)
+PORTFOLIO_MAX_ITEMS = env.int('PORTFOLIO_MAX_ITEMS', default=50)
+
+# Authentication reads a compact user snapshot cached in Redis and, bounded, in process memory
+USER_SNAPSHOT_CACHE_SECONDS = env.int('USER_SNAPSHOT_CACHE_SECONDS', default=900)
+USER_SNAPSHOT_LOCAL_CACHE_SECONDS = env.int('USER_SNAPSHOT_LOCAL_CACHE_SECONDS', default=10)
+USER_SNAPSHOT_LOCAL_MAX_ENTRIES = env.int('USER_SNAPSHOT_LOCAL_MAX_ENTRIES', default=10000)
+
 # DRF Spectacular (API Documentation)
 SPECTACULAR_SETTINGS = {
     'TITLE': 'CaaS Platform API',
@@ -177,12 +201,32 @@ CACHES = {
 STRIPE_SECRET_KEY = env('STRIPE_SECRET_KEY')
 STRIPE_PUBLISHABLE_KEY = env('STRIPE_PUBLISHABLE_KEY')
 STRIPE_WEBHOOK_SECRET = env('STRIPE_WEBHOOK_SECRET')
+# Point the Stripe client elsewhere, e.g. http://localhost:12111 for stripe-mock
+STRIPE_API_BASE = env('STRIPE_API_BASE', default='')
 STRIPE_PRICE_IDS = {
     'free': env('STRIPE_PRICE_ID_FREE', default=''),
     'pro': env('STRIPE_PRICE_ID_PRO', default=''),
     'team': env('STRIPE_PRICE_ID_TEAM', default=''),
 }
 
+# Stripe webhook events (applied by `manage.py process_stripe_events`)
+STRIPE_EVENTS_BATCH_SIZE = env.int('STRIPE_EVENTS_BATCH_SIZE', default=50)
+STRIPE_EVENTS_LEASE_SECONDS = env.int('STRIPE_EVENTS_LEASE_SECONDS', default=60)
+STRIPE_EVENTS_MAX_ATTEMPTS = env.int('STRIPE_EVENTS_MAX_ATTEMPTS', default=8)
+
+# Stripe customers are created ahead of checkout (`manage.py ensure_stripe_customers`)
+STRIPE_CUSTOMERS_BATCH_SIZE = env.int('STRIPE_CUSTOMERS_BATCH_SIZE', default=50)
+STRIPE_CUSTOMERS_LEASE_SECONDS = env.int('STRIPE_CUSTOMERS_LEASE_SECONDS', default=60)
+STRIPE_CUSTOMERS_MAX_ATTEMPTS = env.int('STRIPE_CUSTOMERS_MAX_ATTEMPTS', default=8)
+
+# Resync from Stripe after missed webhooks (`manage.py resync_stripe_subscriptions`)
+STRIPE_RESYNC_WORKERS = env.int('STRIPE_RESYNC_WORKERS', default=8)
+STRIPE_RESYNC_WINDOWS = env.int('STRIPE_RESYNC_WINDOWS', default=32)
+STRIPE_RESYNC_BATCH_SIZE = env.int('STRIPE_RESYNC_BATCH_SIZE', default=500)
+
+# Periods of subscriptions not billed by Stripe (`manage.py rollover_billing_periods`)
+BILLING_ROLLOVER_BATCH_SIZE = env.int('BILLING_ROLLOVER_BATCH_SIZE', default=500)
+
 # AI Provider Configuration
 OPENAI_API_KEY = env('OPENAI_API_KEY')
 OPENAI_MODEL = env('OPENAI_MODEL', default='gpt-4-turbo-preview')
@@ -193,11 +237,64 @@ GEMINI_MODEL = env('GEMINI_MODEL', default='gemini-1.5-pro')
 # Node.js Scheduler Service
 SCHEDULER_SERVICE_URL = env('SCHEDULER_SERVICE_URL', default='http://localhost:3001')
 SCHEDULER_SERVICE_TOKEN = env('SCHEDULER_SERVICE_TOKEN')
+SCHEDULER_HTTP_TIMEOUT = env.float('SCHEDULER_HTTP_TIMEOUT', default=10)
+SCHEDULER_HTTP_POOL_SIZE = env.int('SCHEDULER_HTTP_POOL_SIZE', default=20)
+SCHEDULER_HTTP_MAX_RETRIES = env.int('SCHEDULER_HTTP_MAX_RETRIES', default=3)
+SCHEDULER_HTTP_BACKOFF_BASE = env.float('SCHEDULER_HTTP_BACKOFF_BASE', default=0.2)  # seconds
+SCHEDULER_HTTP_BACKOFF_MAX = env.float('SCHEDULER_HTTP_BACKOFF_MAX', default=2.0)  # seconds
+SCHEDULER_CIRCUIT_FAILURE_THRESHOLD = env.int('SCHEDULER_CIRCUIT_FAILURE_THRESHOLD', default=5)
+SCHEDULER_CIRCUIT_RESET_SECONDS = env.int('SCHEDULER_CIRCUIT_RESET_SECONDS', default=30)
+SCHEDULER_TOKEN_REFRESH_MARGIN_SECONDS = env.int('SCHEDULER_TOKEN_REFRESH_MARGIN_SECONDS', default=60)
+
+# Scheduling outbox (drained by `manage.py dispatch_schedule_outbox`)
+SCHEDULER_OUTBOX_BATCH_SIZE = env.int('SCHEDULER_OUTBOX_BATCH_SIZE', default=100)
+SCHEDULER_OUTBOX_LEASE_SECONDS = env.int('SCHEDULER_OUTBOX_LEASE_SECONDS', default=60)
+SCHEDULER_OUTBOX_MAX_ATTEMPTS = env.int('SCHEDULER_OUTBOX_MAX_ATTEMPTS', default=8)
+# Posts are handed to the scheduler only once due within this window
+SCHEDULER_DISPATCH_WINDOW_MINUTES = env.int('SCHEDULER_DISPATCH_WINDOW_MINUTES', default=15)
+
+# Reconciliation sweeper (`manage.py reconcile_scheduled_posts`)
+SCHEDULER_RECONCILE_GRACE_MINUTES = env.int('SCHEDULER_RECONCILE_GRACE_MINUTES', default=15)
+SCHEDULER_RECONCILE_BATCH_SIZE = env.int('SCHEDULER_RECONCILE_BATCH_SIZE', default=200)
+SCHEDULER_RECONCILE_CONCURRENCY = env.int('SCHEDULER_RECONCILE_CONCURRENCY', default=8)
+
+# Calendar responses are also invalidated on every schedule change
+SCHEDULING_CALENDAR_CACHE_SECONDS = env.int('SCHEDULING_CALENDAR_CACHE_SECONDS', default=3600)
+
+# Publish rate limits per platform, per minute: across all organizations and
+# per organization (each organization publishes with its own platform account)
+SCHEDULING_PLATFORM_RATE_LIMITS = {
+    'twitter': {'per_minute': 50, 'per_account_per_minute': 5},
+    'linkedin': {'per_minute': 30, 'per_account_per_minute': 3},
+    'instagram': {'per_minute': 25, 'per_account_per_minute': 2},
+}
+SCHEDULING_SLOT_JITTER_SECONDS = env.int('SCHEDULING_SLOT_JITTER_SECONDS', default=45)
+SCHEDULING_SLOT_SEARCH_MINUTES = env.int('SCHEDULING_SLOT_SEARCH_MINUTES', default=120)
+
+# Recurring schedules are expanded this far ahead (`manage.py expand_recurring_schedules`)
+SCHEDULING_RECURRENCE_HORIZON_HOURS = env.int('SCHEDULING_RECURRENCE_HORIZON_HOURS', default=72)
+SCHEDULING_RECURRENCE_BATCH_SIZE = env.int('SCHEDULING_RECURRENCE_BATCH_SIZE', default=100)
+
+# Organization summaries and member roles are also invalidated on every change
+ORGANIZATION_SUMMARY_CACHE_SECONDS = env.int('ORGANIZATION_SUMMARY_CACHE_SECONDS', default=3600)
+ORGANIZATION_ROLES_CACHE_SECONDS = env.int('ORGANIZATION_ROLES_CACHE_SECONDS', default=3600)
+
+# Bulk invites; emails are sent by `manage.py send_invitations`
+ORGANIZATION_INVITE_MAX_ROWS = env.int('ORGANIZATION_INVITE_MAX_ROWS', default=1000)
+ORGANIZATION_INVITATION_EXPIRY_DAYS = env.int('ORGANIZATION_INVITATION_EXPIRY_DAYS', default=14)
+ORGANIZATION_INVITATION_EMAIL_BATCH_SIZE = env.int('ORGANIZATION_INVITATION_EMAIL_BATCH_SIZE', default=100)
+ORGANIZATION_INVITATION_EMAIL_LEASE_SECONDS = env.int('ORGANIZATION_INVITATION_EMAIL_LEASE_SECONDS', default=300)
+ORGANIZATION_INVITATION_EMAIL_MAX_ATTEMPTS = env.int('ORGANIZATION_INVITATION_EMAIL_MAX_ATTEMPTS', default=5)
 
 # Frontend URLs
 FRONTEND_EDITOR_URL = env('FRONTEND_EDITOR_URL', default='http://localhost:5173')
 FRONTEND_MARKETING_URL = env('FRONTEND_MARKETING_URL', default='http://localhost:3000')
 
+# Entitlements are cached in Redis and briefly in process memory
+ENTITLEMENTS_CACHE_SECONDS = env.int('ENTITLEMENTS_CACHE_SECONDS', default=900)
+ENTITLEMENTS_LOCAL_CACHE_SECONDS = env.int('ENTITLEMENTS_LOCAL_CACHE_SECONDS', default=10)
+ENTITLEMENTS_LOCAL_MAX_ENTRIES = env.int('ENTITLEMENTS_LOCAL_MAX_ENTRIES', default=10000)
+
 # Subscription Plans Configuration
 SUBSCRIPTION_PLANS = {
     'free': {
@@ -1,13 +1,69 @@
 /**
  * Job processor for scheduled social media posts.
  */
-import { Job } from 'bullmq';
-import { ScheduleJobData, JobResult } from '../types';
+import { Job, DelayedError } from 'bullmq';
+import { ScheduleJobData, JobResult, DjangoCallbackPayload } from '../types';
 import { TwitterPlatformAdapter } from '../services/platforms/twitter.platform';
 import { LinkedInPlatformAdapter } from '../services/platforms/linkedin.platform';
 import { InstagramPlatformAdapter } from '../services/platforms/instagram.platform';
 import { DjangoApiClient } from '../services/django-client';
 
+// Jobs this close to scheduled_at are published right away
+const EARLY_TOLERANCE_MS = 1000;
+
+// Callbacks are buffered and posted to Django's batch endpoint
+const CALLBACK_BATCH_SIZE = Math.min(parseInt(process.env.CALLBACK_BATCH_SIZE || '100'), 1000); // Django accepts 1000
+const CALLBACK_FLUSH_INTERVAL = parseInt(process.env.CALLBACK_FLUSH_INTERVAL || '1000'); // milliseconds
+const CALLBACK_BUFFER_MAX = parseInt(process.env.CALLBACK_BUFFER_MAX || '10000');
+
+const pendingCallbacks: DjangoCallbackPayload[] = [];
+let flushTimer: NodeJS.Timeout | null = null;
+let flushing: Promise<void> | null = null;
+
+function queueCallback(payload: DjangoCallbackPayload): void {
+    pendingCallbacks.push(payload);
+    if (pendingCallbacks.length >= CALLBACK_BATCH_SIZE) {
+        void flushCallbacks();
+    } else if (!flushTimer) {
+        flushTimer = setTimeout(() => void flushCallbacks(), CALLBACK_FLUSH_INTERVAL);
+    }
+}
+
+async function flushOnce(): Promise<void> {
+    while (pendingCallbacks.length > 0) {
+        const batch = pendingCallbacks.splice(0, CALLBACK_BATCH_SIZE);
+        if (!(await DjangoApiClient.sendCallbacks(batch))) {
+            // Retry with the next flush; past the cap the oldest are left to reconciliation
+            pendingCallbacks.unshift(...batch);
+            const dropped = pendingCallbacks.length - CALLBACK_BUFFER_MAX;
+            if (dropped > 0) {
+                pendingCallbacks.splice(0, dropped);
+                console.error(`❌ Dropped ${dropped} buffered callbacks`);
+            }
+            if (!flushTimer) {
+                flushTimer = setTimeout(() => void flushCallbacks(), CALLBACK_FLUSH_INTERVAL);
+            }
+            return;
+        }
+    }
+}
+
+/**
+ * Post buffered callbacks to Django. Concurrent calls share one flush.
+ */
+export async function flushCallbacks(): Promise<void> {
+    if (flushTimer) {
+        clearTimeout(flushTimer);
+        flushTimer = null;
+    }
+    if (!flushing) {
+        flushing = flushOnce().finally(() => {
+            flushing = null;
+        });
+    }
+    return flushing;
+}
+
 // Platform adapters
 const platforms = {
     twitter: new TwitterPlatformAdapter(),
@@ -20,26 +76,25 @@ const platforms = {
  * This function is called by BullMQ worker for each job.
  */
 export async function processScheduledPost(
-    job: Job<ScheduleJobData, JobResult>
+    job: Job<ScheduleJobData, JobResult>,
+    token?: string
 ): Promise<JobResult> {
     const { content_id, platform, scheduled_at, access_token } = job.data;
 
     console.log(`\n📤 Processing job ${job.id} for ${platform}`);
-    console.log(`   Content: ${content_id}`);
+    console.log(`   Content: ${content_id} (v${job.data.content_version ?? '?'})`);
     console.log(`   Scheduled: ${scheduled_at}`);
 
-    try {
-        // Check if it's time to publish (handle early execution)
-        const scheduledTime = new Date(scheduled_at).getTime();
-        const now = Date.now();
-        const timeUntilScheduled = scheduledTime - now;
-
-        // Wait if scheduled time is in the future
-        if (timeUntilScheduled > 0) {
-            console.log(`⏳ Waiting ${Math.round(timeUntilScheduled / 1000)}s before publishing...`);
-            await new Promise(resolve => setTimeout(resolve, timeUntilScheduled));
-        }
+    // Picked up early (promoted manually, or clock skew with Django): put it back in the delayed
+    // set instead of holding a worker slot until scheduled_at
+    const scheduledTime = new Date(scheduled_at).getTime();
+    if (scheduledTime - Date.now() > EARLY_TOLERANCE_MS && token) {
+        console.log(`⏳ Job ${job.id} is early, re-delaying until ${scheduled_at}`);
+        await job.moveToDelayed(scheduledTime, token);
+        throw new DelayedError();
+    }
 
+    try {
         // Get platform adapter
         const adapter = platforms[platform as keyof typeof platforms];
         if (!adapter) {
@@ -54,9 +109,11 @@ export async function processScheduledPost(
             }
         }
 
-        // Fetch content from Django (in production, might pass content_text directly)
-        // For now, assuming content_text is in job data or needs to be fetched
-        const contentText = job.data.content_text || 'Sample post content'; // TODO: Fetch from Django
+        // Publish exactly the snapshot captured by Django at schedule time
+        const contentText = job.data.content_text;
+        if (!contentText) {
+            throw new Error('Job has no content snapshot');
+        }
 
         // Publish the post
         await job.updateProgress(50);
@@ -64,8 +121,8 @@ export async function processScheduledPost(
 
         await job.updateProgress(100);
 
-        // Send callback to Django
-        await DjangoApiClient.sendCallback({
+        // Queue callback to Django
+        queueCallback({
             job_id: job.id!,
             content_id,
             status: result.success ? 'published' : 'failed',
@@ -78,8 +135,8 @@ export async function processScheduledPost(
     } catch (error: any) {
         console.error(`❌ Job ${job.id} failed:`, error.message);
 
-        // Send failure callback to Django
-        await DjangoApiClient.sendCallback({
+        // Queue failure callback to Django
+        queueCallback({
             job_id: job.id!,
             content_id,
             status: 'failed',
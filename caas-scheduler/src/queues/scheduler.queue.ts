@@ -4,7 +4,7 @@
 import { Queue, Worker, Job, QueueEvents } from 'bullmq';
 import redisConnection from '../config/redis';
 import { ScheduleJobData, JobResult } from '../types';
-import { processScheduledPost } from './processor';
+import { processScheduledPost, flushCallbacks } from './processor';
 
 const QUEUE_NAME = 'social-posts';
 
@@ -18,8 +18,9 @@ export const schedulerQueue = new Queue<ScheduleJobData>(QUEUE_NAME, {
             delay: parseInt(process.env.JOB_RETRY_DELAY || '60000'), // 1 minute
         },
         removeOnComplete: {
-            age: 24 * 3600, // Keep completed jobs for 24 hours
-            count: 1000, // Keep last 1000 completed jobs
+            // Keep completed jobs by age only, long enough for the Django
+            // reconciliation sweep to read the result of a lost callback
+            age: parseInt(process.env.JOB_KEEP_COMPLETED_SECONDS || '604800'), // 7 days
         },
         removeOnFail: {
             age: 7 * 24 * 3600, // Keep failed jobs for 7 days
@@ -93,6 +94,8 @@ export async function getQueueHealth() {
 export async function shutdownQueue() {
     console.log('🛑 Shutting down scheduler queue...');
     await worker.close();
+    // Deliver callbacks of the jobs that just finished
+    await flushCallbacks();
     await schedulerQueue.close();
     await queueEvents.close();
     await redisConnection.quit();
@@ -3,7 +3,7 @@
  */
 import { Router, Request, Response } from 'express';
 import schedulerQueue, { getQueueHealth } from '../queues/scheduler.queue';
-import { ScheduleJobData } from '../types';
+import { ScheduleJobData, BulkScheduleRequest, BulkScheduleResult, ContentSnapshotUpdate } from '../types';
 import { authenticateJWT } from '../middleware/auth.middleware';
 
 const router = Router();
@@ -44,6 +44,61 @@ router.post('/schedule', authenticateJWT, async (req: Request, res: Response) =>
     }
 });
 
+/**
+ * POST /api/v1/schedule/bulk
+ * Schedule many posts in one request. Results are returned in request order.
+ */
+router.post('/schedule/bulk', authenticateJWT, async (req: Request, res: Response) => {
+    try {
+        const { jobs }: BulkScheduleRequest = req.body;
+
+        if (!Array.isArray(jobs) || jobs.length === 0) {
+            res.status(400).json({ error: 'jobs must be a non-empty array' });
+            return;
+        }
+
+        const results: BulkScheduleResult[] = new Array(jobs.length);
+        const valid: { index: number; jobData: ScheduleJobData; scheduledTime: number }[] = [];
+
+        jobs.forEach((jobData, index) => {
+            const scheduledTime = new Date(jobData?.scheduled_at).getTime();
+            if (!jobData?.content_id || !jobData.platform || Number.isNaN(scheduledTime)) {
+                results[index] = {
+                    scheduled_post_id: jobData?.scheduled_post_id,
+                    status: 'failed',
+                    error: 'Missing required fields',
+                };
+                return;
+            }
+            valid.push({ index, jobData, scheduledTime });
+        });
+
+        const now = Date.now();
+        const added = await schedulerQueue.addBulk(valid.map(({ jobData, scheduledTime }) => ({
+            name: 'schedule-post',
+            data: jobData,
+            opts: {
+                delay: Math.max(0, scheduledTime - now),
+                jobId: jobData.job_key || jobData.scheduled_post_id || `${jobData.content_id}-${scheduledTime}`,
+            },
+        })));
+
+        added.forEach((job, i) => {
+            const { index, jobData } = valid[i];
+            results[index] = {
+                scheduled_post_id: jobData.scheduled_post_id,
+                job_id: job.id,
+                status: 'scheduled',
+            };
+        });
+
+        res.status(201).json({ results });
+    } catch (error: any) {
+        console.error('Bulk schedule error:', error);
+        res.status(500).json({ error: error.message });
+    }
+});
+
 /**
  * GET /api/v1/schedule/:jobId
  * Get job status.
@@ -76,6 +131,55 @@ router.get('/schedule/:jobId', authenticateJWT, async (req: Request, res: Respon
     }
 });
 
+/**
+ * PUT /api/v1/schedule/:jobId
+ * Replace the content snapshot of a job that has not run yet.
+ */
+router.put('/schedule/:jobId', authenticateJWT, async (req: Request, res: Response) => {
+    try {
+        const { jobId } = req.params;
+        const snapshot: ContentSnapshotUpdate = req.body;
+
+        if (typeof snapshot?.content_text !== 'string') {
+            res.status(400).json({ error: 'content_text is required' });
+            return;
+        }
+
+        const job = await schedulerQueue.getJob(jobId);
+
+        if (!job) {
+            res.status(404).json({ error: 'Job not found' });
+            return;
+        }
+
+        const state = await job.getState();
+
+        // Only jobs that have not started can be updated
+        if (state !== 'waiting' && state !== 'delayed') {
+            res.status(409).json({
+                error: `Cannot update job in state: ${state}`,
+                current_state: state
+            });
+            return;
+        }
+
+        await job.updateData({
+            ...job.data,
+            content_text: snapshot.content_text,
+            content_version: snapshot.content_version,
+            content_hash: snapshot.content_hash,
+        });
+
+        res.json({
+            message: 'Job updated successfully',
+            job_id: jobId,
+            content_version: snapshot.content_version,
+        });
+    } catch (error: any) {
+        res.status(500).json({ error: error.message });
+    }
+});
+
 /**
  * DELETE /api/v1/schedule/:jobId
  * Cancel a scheduled job.
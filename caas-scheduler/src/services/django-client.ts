@@ -9,13 +9,14 @@ const SERVICE_TOKEN = process.env.SERVICE_TOKEN || '';
 
 export class DjangoApiClient {
     /**
-     * Send callback to Django when job completes.
+     * Send a batch of job status callbacks to Django in one request.
+     * Resolves to false if the request failed, so the caller can retry.
      */
-    static async sendCallback(payload: DjangoCallbackPayload): Promise<void> {
+    static async sendCallbacks(payloads: DjangoCallbackPayload[]): Promise<boolean> {
         try {
             await axios.post(
-                `${DJANGO_API_URL}/api/v1/scheduling/callback/`,
-                payload,
+                `${DJANGO_API_URL}/api/v1/scheduling/callback/batch/`,
+                { updates: payloads },
                 {
                     headers: {
                         'Content-Type': 'application/json',
@@ -25,11 +26,13 @@ export class DjangoApiClient {
                 }
             );
 
-            console.log(`✅ Django callback sent for job ${payload.job_id}`);
+            console.log(`✅ Django callbacks sent for ${payloads.length} jobs`);
+            return true;
         } catch (error: any) {
-            console.error('❌ Django callback failed:', error.message);
-            // Don't throw - this is a non-critical operation
-            // The job has already completed, callback failure shouldn't fail the job
+            console.error(`❌ Django callback batch of ${payloads.length} failed:`, error.message);
+            // Don't throw - the jobs have already completed, and Django's
+            // reconciliation sweep recovers callbacks that never arrive
+            return false;
         }
     }
 
@@ -9,7 +9,28 @@ export interface ScheduleJobData {
     user_id: string;
     org_id: string;
     access_token?: string;  // Platform-specific OAuth token
-    content_text?: string;
+    content_text?: string;  // Snapshot of the text to publish
+    content_version?: number;
+    content_hash?: string;
+    scheduled_post_id?: string;  // Django ScheduledPost UUID
+    job_key?: string;  // Job id to use, unique per schedule request from Django
+}
+
+export interface ContentSnapshotUpdate {
+    content_text: string;
+    content_version?: number;
+    content_hash?: string;
+}
+
+export interface BulkScheduleRequest {
+    jobs: ScheduleJobData[];
+}
+
+export interface BulkScheduleResult {
+    scheduled_post_id?: string;
+    job_id?: string;
+    status: 'scheduled' | 'failed';
+    error?: string;
 }
 
 export interface JobResult {